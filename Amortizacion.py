@@ -0,0 +1,291 @@
+# ======================================================
+# TABLAS DE AMORTIZACIÓN PARA MUCHOS CRÉDITOS
+# ======================================================
+# Cuota, interés, amortización (capital) y saldo período a período para
+# tres sistemas:
+#
+#   frances    cuota constante: VP * i / (1 - (1 + i)^-n)  (VP / n si i = 0)
+#   aleman     amortización constante VP / n; la cuota baja con el saldo
+#   americano  solo intereses y todo el capital en la última cuota (bullet)
+#
+# i es la tasa del período (mensual si las cuotas son mensuales). En los tres
+# el interés de un período es interés simple sobre el saldo anterior (saldo *
+# i, como en MotorInteres.py) y la última cuota amortiza el saldo que quede,
+# así la tabla cierra en 0 sin arrastrar el redondeo. Cada crédito tiene su
+# VP, i y n; los datos inválidos se informan con los motivos de MotorInteres
+# y la fila queda en NaN.
+#
+# Las tablas van en arrays preasignados (créditos x períodos) en orden
+# Fortran: el cálculo avanza un período por vez para todos los créditos, y
+# así cada columna es contigua. Para cronogramas que no entran en memoria,
+# escribir_csv calcula y escribe por bloques reutilizando el mismo búfer.
+#
+#   t = amortizar([100000, 250000], i=0.015, n=[120, 360], sistema="aleman")
+#   t.cuota, t.interes, t.amortizacion, t.saldo, t.motivo
+#
+#   python Amortizacion.py --benchmark 10000 --periodos 360
+#   python Amortizacion.py --csv tablas.csv --benchmark 10000
+import sys
+import time
+
+import numpy as np
+
+from MotorInteres import OK, FALTAN_DATOS, FUERA_DE_DOMINIO, MOTIVOS
+
+SISTEMAS = ("frances", "aleman", "americano")
+COLUMNAS = ("cuota", "interes", "amortizacion", "saldo")
+
+class TablaAmortizacion:
+    """
+    Arrays float64 (créditos, períodos) en orden Fortran: cuota, interes,
+    amortizacion y saldo (después del pago). Los períodos posteriores al
+    último de un crédito quedan en 0. n: períodos de cada crédito; motivo:
+    int8 por crédito (0 = OK).
+    """
+    __slots__ = ("cuota", "interes", "amortizacion", "saldo", "n", "motivo")
+
+    def __init__(self, creditos, periodos):
+        forma = (creditos, periodos)
+        for nombre in COLUMNAS:
+            setattr(self, nombre, np.empty(forma, dtype=np.float64, order="F"))
+        self.n = np.zeros(creditos, dtype=np.int64)
+        self.motivo = np.zeros(creditos, dtype=np.int8)
+
+    @property
+    def forma(self):
+        return self.cuota.shape
+
+    def vista(self, creditos, periodos):
+        """Las primeras filas y columnas de la tabla, sin copiar (bloques incompletos)."""
+        t = TablaAmortizacion.__new__(TablaAmortizacion)
+        for nombre in COLUMNAS:
+            setattr(t, nombre, getattr(self, nombre)[:creditos, :periodos])
+        t.n = self.n[:creditos]
+        t.motivo = self.motivo[:creditos]
+        return t
+
+    def credito(self, k):
+        """dict de columnas del crédito k, recortado a sus n períodos."""
+        return {nombre: getattr(self, nombre)[k, :self.n[k]] for nombre in COLUMNAS}
+
+# ======================================================
+# CÁLCULO
+# ======================================================
+
+def _datos(VP, i, n):
+    VP, i, n = np.broadcast_arrays(*[np.asarray(np.nan if v is None else v, dtype=np.float64)
+                                     for v in (VP, i, n)])
+    VP, i, n = (np.atleast_1d(v).ravel() for v in (VP, i, n))
+    motivo = np.zeros(len(VP), dtype=np.int8)
+    with np.errstate(invalid="ignore"):
+        motivo[(i <= -1) | (n < 1) | (n != np.floor(n)) | np.isinf(VP) | np.isinf(i) | np.isinf(n)] = FUERA_DE_DOMINIO
+    motivo[np.isnan(VP) | np.isnan(i) | np.isnan(n)] = FALTAN_DATOS
+    valido = motivo == OK
+    # las filas inválidas se calculan como un crédito nulo de un período y luego se ponen en NaN
+    VP = np.where(valido, VP, 0.0)
+    i = np.where(valido, i, 0.0)
+    n = np.where(valido, n, 1).astype(np.int64)
+    return VP, i, n, motivo
+
+def _cuota_fija(sistema, VP, i, n):
+    """Cuota (francés) o amortización constante (alemán) por crédito."""
+    if sistema == "frances":
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cuota = VP * i / (1 - (1 + i) ** -n.astype(np.float64))
+        return np.where(i == 0, VP / n, cuota)
+    if sistema == "aleman":
+        return VP / n
+    if sistema == "americano":
+        return np.zeros_like(VP)
+    raise ValueError(f"Sistema desconocido: {sistema!r} (opciones: {', '.join(SISTEMAS)})")
+
+def _llenar(t, sistema, i, n, fija, saldo, desde):
+    """
+    Llena las columnas de `t` con los períodos desde+1 .. desde+P, partiendo
+    de `saldo` (saldo antes del período desde+1; se actualiza en el lugar).
+    """
+    periodos = t.cuota.shape[1]
+    amort = np.empty_like(saldo)
+    for j in range(periodos):
+        k = desde + j + 1
+        interes = t.interes[:, j]
+        np.multiply(saldo, i, out=interes)
+        if sistema == "frances":
+            np.subtract(fija, interes, out=amort)
+        elif sistema == "aleman":
+            amort[:] = fija
+        else:
+            amort[:] = 0.0
+        # la última cuota cancela el saldo; después de ella el saldo es 0 y todo queda en 0
+        np.copyto(amort, saldo, where=k >= n)
+        t.amortizacion[:, j] = amort
+        np.add(interes, amort, out=t.cuota[:, j])
+        saldo -= amort
+        t.saldo[:, j] = saldo
+
+def _anular(t, n, motivo):
+    t.n[:] = n
+    invalido = motivo != OK
+    if invalido.any():
+        for nombre in COLUMNAS:
+            getattr(t, nombre)[invalido] = np.nan
+    t.motivo[:] = motivo
+
+def amortizar(VP, i, n, sistema="frances", salida=None):
+    """
+    Tabla de amortización de cada crédito (VP, i y n con broadcast; n en
+    períodos). `salida`: TablaAmortizacion a reutilizar, con al menos tantas
+    filas como créditos y columnas como el mayor n; se devuelve una vista.
+    """
+    VP, i, n, motivo = _datos(VP, i, n)
+    fija = _cuota_fija(sistema, VP, i, n)
+    periodos = int(n.max()) if len(n) else 0
+    if salida is None:
+        salida = TablaAmortizacion(len(VP), periodos)
+    elif salida.forma[0] < len(VP) or salida.forma[1] < periodos:
+        raise ValueError(f"La tabla de salida {salida.forma} no alcanza para {len(VP)} créditos x {periodos} períodos")
+    t = salida.vista(len(VP), periodos)
+    _llenar(t, sistema, i, n, fija, VP.copy(), 0)
+    _anular(t, n, motivo)
+    return t
+
+# ======================================================
+# ESCRITURA POR BLOQUES A CSV
+# ======================================================
+
+def escribir_csv(destino, VP, i, n, sistema="frances", filas_por_bloque=1_000_000, decimales=2):
+    """
+    Escribe credito,periodo,cuota,interes,amortizacion,saldo (una línea por
+    pago, ordenadas por crédito y período) en `destino` (ruta o archivo
+    abierto). Calcula de a bloques de a lo sumo `filas_por_bloque` pagos con
+    un solo búfer, así la memoria no depende del tamaño total; un crédito
+    más largo que el bloque se escribe en tramos de períodos. Los créditos
+    inválidos no se escriben. Devuelve la cantidad de líneas escritas.
+    """
+    VP, i, n, motivo = _datos(VP, i, n)
+    fija = _cuota_fija(sistema, VP, i, n)
+    n_max = int(n.max()) if len(n) else 0
+    ventana = max(1, min(n_max, filas_por_bloque))
+    por_bloque = max(1, filas_por_bloque // ventana)
+    buf = TablaAmortizacion(min(por_bloque, len(VP)), ventana)
+    # un solo `%` por grupo de líneas: bastante más rápido que np.savetxt, que formatea línea por línea
+    linea = "%d,%d" + f",%.{decimales}f" * len(COLUMNAS) + "\n"
+
+    archivo = open(destino, "w", newline="") if isinstance(destino, str) else destino
+    escritas = 0
+    try:
+        archivo.write("credito,periodo," + ",".join(COLUMNAS) + "\n")
+        for a in range(0, len(VP), por_bloque):
+            b = min(a + por_bloque, len(VP))
+            saldo = VP[a:b].copy()
+            n_bloque = n[a:b]
+            ids = np.arange(a + 1, b + 1)
+            for desde in range(0, int(n_bloque.max()), ventana):
+                periodos = min(ventana, int(n_bloque.max()) - desde)
+                t = buf.vista(b - a, periodos)
+                _llenar(t, sistema, i[a:b], n_bloque, fija[a:b], saldo, desde)
+                k = np.arange(desde + 1, desde + periodos + 1)
+                pagar = (k <= n_bloque[:, None]) & (motivo[a:b, None] == OK)
+                # orden C de la máscara: por crédito y, dentro de cada uno, por período
+                fila, col = np.nonzero(pagar)
+                datos = np.empty((len(fila), 2 + len(COLUMNAS)))
+                datos[:, 0] = ids[fila]
+                datos[:, 1] = k[col]
+                for c, nombre in enumerate(COLUMNAS, 2):
+                    datos[:, c] = getattr(t, nombre)[fila, col]
+                for c in range(0, len(datos), 10_000):
+                    grupo = datos[c:c + 10_000]
+                    archivo.write((linea * len(grupo)) % tuple(grupo.ravel().tolist()))
+                escritas += len(datos)
+    finally:
+        if archivo is not destino:
+            archivo.close()
+    return escritas
+
+# ======================================================
+# BENCHMARK
+# ======================================================
+
+def _escalar(VP, i, n, sistema):
+    """Tabla de un crédito con un bucle de Python (la forma directa)."""
+    if sistema == "frances":
+        fija = VP / n if i == 0 else VP * i / (1 - (1 + i) ** -n)
+    elif sistema == "aleman":
+        fija = VP / n
+    else:
+        fija = 0.0
+    filas = []
+    saldo = VP
+    for k in range(1, n + 1):
+        interes = saldo * i
+        amort = saldo if k == n else (fija - interes if sistema == "frances" else fija)
+        saldo -= amort
+        filas.append((interes + amort, interes, amort, saldo))
+    return filas
+
+def creditos_sinteticos(n, periodos=360, semilla=0):
+    rnd = np.random.default_rng(semilla)
+    VP = rnd.uniform(5_000, 500_000, n).round(2)
+    i = (rnd.uniform(0.06, 0.60, n) / 12).round(6)      # tasa mensual
+    plazos = np.minimum(rnd.choice([12, 24, 36, 60, 120, 240, 360], n), periodos)
+    plazos[0] = periodos
+    return VP, i, plazos
+
+def benchmark_amortizacion(creditos=10_000, periodos=360, muestra=500, csv=None):
+    """
+    amortizar() por sistema contra el bucle de Python en `muestra` créditos
+    (extrapolado al total), con la máxima diferencia contra ese bucle, la
+    reutilización de una tabla preasignada y, si se pide, escribir_csv.
+    """
+    VP, i, n = creditos_sinteticos(creditos, periodos)
+    pagos = int(n.sum())
+    print(f"{creditos} créditos, hasta {periodos} períodos ({pagos} pagos)")
+    salida = TablaAmortizacion(creditos, periodos)
+    for sistema in SISTEMAS:
+        t0 = time.perf_counter()
+        t = amortizar(VP, i, n, sistema)
+        t_nuevo = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        amortizar(VP, i, n, sistema, salida=salida)
+        t_reuso = time.perf_counter() - t0
+
+        m = min(muestra, creditos)
+        args = list(zip(VP[:m].tolist(), i[:m].tolist(), n[:m].tolist()))
+        t0 = time.perf_counter()
+        ref = [_escalar(a, b, c, sistema) for a, b, c in args]
+        t_bucle = (time.perf_counter() - t0) * creditos / m
+        dif = 0.0
+        for k, filas in enumerate(ref):
+            esperado = np.array(filas)
+            obtenido = np.column_stack([getattr(t, c)[k, :len(filas)] for c in COLUMNAS])
+            dif = max(dif, float(np.max(np.abs(obtenido - esperado) / np.maximum(VP[k], 1.0))))
+        print(f"{sistema:<10} bucle {t_bucle * 1000:9.0f} ms (est.)   tabla nueva {t_nuevo * 1000:7.1f} ms   "
+              f"reutilizada {t_reuso * 1000:7.1f} ms   x{t_bucle / t_reuso:6.1f}   "
+              f"máx. dif. / VP {dif:.1e}")
+    if csv:
+        t0 = time.perf_counter()
+        lineas = escribir_csv(csv, VP, i, n)
+        t_csv = time.perf_counter() - t0
+        print(f"CSV        {lineas} líneas en {t_csv:.1f} s ({lineas / t_csv / 1e6:.2f} M líneas/s) -> {csv}")
+
+def imprimir_tabla(t, k=0, archivo=sys.stdout):
+    """Tabla del crédito k en texto, para la consola."""
+    c = t.credito(k)
+    if t.motivo[k] != OK:
+        print(f"No puede calcularse la tabla: {MOTIVOS[t.motivo[k]].lower()}.", file=archivo)
+        return
+    print(f"{'Período':>7} {'Cuota':>14} {'Interés':>14} {'Amortización':>14} {'Saldo':>14}", file=archivo)
+    for p, fila in enumerate(zip(*(c[nombre] for nombre in COLUMNAS)), 1):
+        print(f"{p:>7} " + " ".join(f"{v:>14.2f}" for v in fila), file=archivo)
+    print(f"{'Total':>7} {c['cuota'].sum():>14.2f} {c['interes'].sum():>14.2f} "
+          f"{c['amortizacion'].sum():>14.2f}", file=archivo)
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Tablas de amortización (francés, alemán, americano) por lotes.")
+    p.add_argument("--benchmark", type=int, metavar="N", default=10_000, help="créditos")
+    p.add_argument("--periodos", type=int, default=360, help="plazo máximo en períodos")
+    p.add_argument("--muestra", type=int, default=500, help="créditos medidos con el bucle de Python")
+    p.add_argument("--csv", metavar="RUTA", help="además, escribir todas las tablas (francés) en un CSV")
+    a = p.parse_args()
+    benchmark_amortizacion(a.benchmark, a.periodos, a.muestra, a.csv)
@@ -3,6 +3,9 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import pandas as pd
 import math
+import csv
+import os
+import threading
 import matplotlib
 matplotlib.use('TkAgg')
 from matplotlib.figure import Figure
@@ -84,6 +87,108 @@ def calc_all(df_row):
 
     return r
 
+# -------------------------
+# Lectura por streaming (una fila por empresa)
+# -------------------------
+TAM_BLOQUE_CSV = 5000
+
+def _numero(v):
+    """Texto numérico -> float; cualquier otro texto queda igual (falla solo su fila en calc_all)."""
+    if isinstance(v, str):
+        try:
+            return float(v)
+        except ValueError:
+            return v
+    return v
+
+def _limpiar_fila(fila):
+    """
+    Quita celdas vacías (None/NaN) para que calc_all use sus valores por
+    defecto y convierte a número cada celda por separado.
+    """
+    return {k: _numero(v) for k, v in fila.items() if v is not None and v == v}
+
+def iterar_filas(fp, tam_bloque=TAM_BLOQUE_CSV):
+    """
+    Genera (fila_dict, fraccion_leida) sin cargar el archivo completo.
+    CSV: pandas por bloques de `tam_bloque` filas. XLSX: openpyxl en modo read_only.
+    `fraccion_leida` es aproximada (0..1) o None si no se puede estimar.
+    """
+    if fp.lower().endswith('.csv'):
+        total = os.path.getsize(fp) or 1
+        with open(fp, 'rb') as fh:
+            # dtype=object: sin inferencia de tipos por bloque, que con una sola celda
+            # no numérica convertía toda la columna del bloque en texto
+            for bloque in pd.read_csv(fh, chunksize=tam_bloque, dtype=object):
+                fraccion = min(fh.tell() / total, 1.0)
+                for fila in bloque.to_dict('records'):
+                    yield _limpiar_fila(fila), fraccion
+    elif fp.lower().endswith('.xlsx'):
+        from openpyxl import load_workbook
+        wb = load_workbook(fp, read_only=True, data_only=True)
+        try:
+            ws = wb.active
+            total = ws.max_row or None
+            filas = ws.iter_rows(values_only=True)
+            encabezado = next(filas, None)
+            if encabezado is None:
+                return
+            for i, valores in enumerate(filas, start=2):
+                fila = dict(zip(encabezado, valores))
+                yield _limpiar_fila(fila), (min(i / total, 1.0) if total else None)
+        finally:
+            wb.close()
+    else:
+        # .xls antiguo: sin lector por filas; el formato limita el tamaño a 65k filas
+        df = pd.read_excel(fp)
+        n = len(df) or 1
+        for i, fila in enumerate(df.to_dict('records'), start=1):
+            yield _limpiar_fila(fila), i / n
+
+def leer_primeras_filas(fp, n=5):
+    """Devuelve un DataFrame con las primeras `n` filas (vista previa) sin leer todo el archivo."""
+    if fp.lower().endswith('.csv'):
+        return pd.read_csv(fp, nrows=n)
+    filas = []
+    for fila, _ in iterar_filas(fp):
+        filas.append(fila)
+        if len(filas) >= n:
+            break
+    return pd.DataFrame(filas)
+
+def analizar_archivo(fp, salida, progreso=None, tam_bloque=TAM_BLOQUE_CSV, cada=1000):
+    """
+    Aplica calc_all a cada fila de `fp` y escribe los resultados en el CSV `salida`
+    a medida que avanza (memoria acotada por `tam_bloque`).
+    `progreso(filas_procesadas, fraccion)` se llama cada `cada` filas y al terminar.
+    Las filas que fallan se escriben con la columna 'error' y resultados vacíos.
+    Devuelve (filas_procesadas, filas_con_error).
+    """
+    procesadas = errores = 0
+    fraccion = 0.0
+    writer = None
+    with open(salida, 'w', newline='', encoding='utf-8') as out:
+        for fila, fraccion in iterar_filas(fp, tam_bloque):
+            try:
+                r = calc_all(fila)
+                err = ''
+            except Exception as e:
+                r = {}
+                err = str(e)
+                errores += 1
+            if writer is None:
+                # Las claves de calc_all no dependen de los datos: se fijan con la primera fila válida
+                campos = list(r.keys()) if r else list(calc_all({}).keys())
+                writer = csv.DictWriter(out, fieldnames=['fila'] + campos + ['error'])
+                writer.writeheader()
+            writer.writerow({'fila': procesadas + 1, **r, 'error': err})
+            procesadas += 1
+            if progreso and procesadas % cada == 0:
+                progreso(procesadas, fraccion)
+    if progreso:
+        progreso(procesadas, 1.0 if procesadas else fraccion)
+    return procesadas, errores
+
 # -------------------------
 # GUI: pestañas A, B, C, D
 # -------------------------
@@ -94,15 +199,21 @@ def launch_app():
     notebook = ttk.Notebook(root)
     notebook.pack(fill='both', expand=True)
 
-    shared = {'df': None, 'row': None, 'results': None}
+    shared = {'df': None, 'path': None, 'row': None, 'results': None}
 
     # Tab: carga
     tab_load = ttk.Frame(notebook)
     notebook.add(tab_load, text="Carga de datos")
-    lbl = ttk.Label(tab_load, text="Cargar archivo Excel o CSV (se usará la PRIMERA FILA). Columnas deben tener nombres esperados.")
+    lbl = ttk.Label(tab_load, text="Cargar archivo Excel o CSV (las pestañas usan la PRIMERA FILA; 'Analizar todas las filas' procesa el archivo completo).")
     lbl.pack(pady=6)
     btn_load = ttk.Button(tab_load, text="Cargar archivo (Excel/CSV)", width=30)
     btn_load.pack(pady=4)
+    btn_todas = ttk.Button(tab_load, text="Analizar todas las filas → CSV", width=30)
+    btn_todas.pack(pady=4)
+    barra = ttk.Progressbar(tab_load, length=400, mode='determinate', maximum=100)
+    barra.pack(pady=2)
+    lbl_progreso = ttk.Label(tab_load, text="")
+    lbl_progreso.pack()
     display = scrolledtext.ScrolledText(tab_load, width=130, height=28)
     display.pack(padx=8, pady=8)
 
@@ -111,11 +222,10 @@ def launch_app():
         if not fp:
             return
         try:
-            if fp.lower().endswith('.csv'):
-                df = pd.read_csv(fp)
-            else:
-                df = pd.read_excel(fp)
+            # Solo se leen las primeras filas: el archivo completo se procesa por streaming
+            df = leer_primeras_filas(fp)
             shared['df'] = df
+            shared['path'] = fp
             shared['row'] = df.iloc[0].to_dict()
             display.delete('1.0', tk.END)
             display.insert(tk.END, "Preview (head):\n")
@@ -124,7 +234,41 @@ def launch_app():
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo leer el archivo: {e}")
 
+    def do_analizar_todas():
+        fp = shared.get('path')
+        if not fp:
+            messagebox.showwarning("Atencion", "Carga un archivo primero.")
+            return
+        salida = filedialog.asksaveasfilename(defaultextension='.csv', filetypes=[("CSV files", "*.csv")],
+                                              initialfile="resultados_analisis.csv")
+        if not salida:
+            return
+        btn_todas.config(state='disabled')
+        barra['value'] = 0
+
+        # El trabajo corre en un hilo; la GUI se actualiza solo desde el hilo de Tk (root.after)
+        def progreso(filas, fraccion):
+            def actualizar():
+                if fraccion is not None:
+                    barra['value'] = fraccion * 100
+                lbl_progreso.config(text=f"{filas:,} filas procesadas")
+            root.after(0, actualizar)
+
+        def trabajo():
+            try:
+                total, errores = analizar_archivo(fp, salida, progreso)
+                msg = f"{total:,} filas analizadas ({errores} con error).\nResultados: {salida}"
+                root.after(0, lambda: messagebox.showinfo("Análisis completo", msg))
+            except Exception as e:
+                err = str(e)
+                root.after(0, lambda: messagebox.showerror("Error", f"No se pudo analizar el archivo: {err}"))
+            finally:
+                root.after(0, lambda: btn_todas.config(state='normal'))
+
+        threading.Thread(target=trabajo, daemon=True).start()
+
     btn_load.config(command=do_load)
+    btn_todas.config(command=do_analizar_todas)
 
     # Tab A
     tabA = ttk.Frame(notebook)
@@ -0,0 +1,199 @@
+# ======================================================
+# ANÁLISIS FINANCIERO POR LÍNEA DE COMANDOS (sin Tk)
+# ======================================================
+# El mismo análisis de Final.py (AnalisisFinanciero.calcular_todo + textos
+# A–D) sin abrir ventanas: sirve en un servidor sin pantalla y arranca sin
+# importar tkinter, el backend TkAgg ni matplotlib. ReportLab solo se carga
+# si se pide PDF.
+#
+#   python -m AnalisisConsola datos.json                 (JSON por stdout)
+#   python -m AnalisisConsola empresas.csv -f md -o informe.md
+#   python -m AnalisisConsola datos.json -f pdf -o Informe_Profesional.pdf
+#   python -m AnalisisConsola --benchmark-arranque 10
+#
+# Entradas: JSON con un objeto {"AC_2023": 2800, ...} o una lista de objetos,
+# o CSV con una fila por empresa y las claves como encabezado. Las claves que
+# falten o vengan vacías toman los valores por defecto; "empresa"/"nombre"
+# da el título.
+import os
+import sys
+import csv
+import json
+import math
+import time
+import argparse
+
+from CalculoFinanciero import AnalisisFinanciero
+from TextosAnalisis import construir_textos, informe_markdown
+
+CLAVES_NOMBRE = ("empresa", "Empresa", "EMPRESA", "nombre", "Nombre")
+
+# ======================================================
+# ENTRADAS
+# ======================================================
+
+def _numero(v):
+    # Como read_all_inputs de Final.py (coma decimal, inválido -> 0.0), pero
+    # una celda vacía es un dato faltante: None, toma el valor por defecto
+    if v is None or isinstance(v, (int, float)):
+        return None if v is None else float(v)
+    texto = str(v).strip().replace(",", ".")
+    if not texto:
+        return None
+    try:
+        return float(texto)
+    except ValueError:
+        return 0.0
+
+def _empresa(registro, i):
+    nombre = ""
+    data = {}
+    for k, v in registro.items():
+        if k in CLAVES_NOMBRE:
+            nombre = str(v or "")
+        elif k:
+            f = _numero(v)
+            if f is not None:
+                data[k] = f
+    return (nombre or f"Empresa {i + 1}", data)
+
+def leer_entradas(ruta, formato=None):
+    """[(nombre, data), ...] desde un JSON o CSV ('-' lee de stdin)."""
+    if ruta == "-":
+        texto = sys.stdin.read()
+    else:
+        with open(ruta, encoding="utf-8-sig") as f:
+            texto = f.read()
+    if formato is None:
+        es_json = ruta.lower().endswith(".json") or texto.lstrip()[:1] in ("{", "[")
+        formato = "json" if es_json else "csv"
+
+    if formato == "json":
+        datos = json.loads(texto)
+        registros = datos if isinstance(datos, list) else [datos]
+    else:
+        lineas = texto.splitlines()
+        try:
+            dialecto = csv.Sniffer().sniff("\n".join(lineas[:5]), delimiters=",;\t")
+        except csv.Error:
+            dialecto = csv.excel
+        registros = list(csv.DictReader(lineas, dialect=dialecto))
+    return [_empresa(reg, i) for i, reg in enumerate(registros)]
+
+# ======================================================
+# ANÁLISIS Y SALIDAS
+# ======================================================
+
+def analizar(data):
+    """(r, textos) para un dict de entradas, como run_analisis de Final.py."""
+    r = AnalisisFinanciero(data).calcular_todo()
+    return r, construir_textos(r)
+
+def _json_valido(v):
+    # inf/NaN (p. ej. PQ sin margen de contribución) no son JSON estándar
+    return v if not isinstance(v, float) or math.isfinite(v) else None
+
+def a_json(nombre, data, r, textos):
+    return {
+        "empresa": nombre,
+        "entradas": data,
+        "resultados": {k: _json_valido(v) for k, v in r.items()},
+        "textos": dict(zip("ABCD", textos)),
+    }
+
+def escribir_pdf(r, textos, destino, empresa):
+    # Solo aquí se importa ReportLab; el anexo es vectorial (sin matplotlib)
+    from ReporteFinanciero import construir_pdf
+    from GraficosPDF import dibujo_final
+    construir_pdf(r, textos, destino, grafico=dibujo_final(r), empresa=empresa)
+
+def _destino_pdf(salida, i, total):
+    if total == 1:
+        return salida
+    base, ext = os.path.splitext(salida)
+    return f"{base}_{i + 1:03d}{ext or '.pdf'}"
+
+# ======================================================
+# ARRANQUE EN FRÍO
+# ======================================================
+
+def _medir(cmd, n, cwd):
+    import subprocess
+    tiempos = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, cwd=cwd, check=True, stdout=subprocess.DEVNULL)
+        tiempos.append(time.perf_counter() - t0)
+    tiempos.sort()
+    return tiempos[len(tiempos) // 2]
+
+def benchmark_arranque(n=10):
+    """
+    Mediana (ms) de un proceso completo con los datos por defecto para cada
+    salida, frente a lo que Final.py importa antes de calcular nada.
+    """
+    import tempfile
+    aqui = os.path.dirname(os.path.abspath(__file__))
+    py = sys.executable
+    with tempfile.TemporaryDirectory() as tmp:
+        casos = [
+            ("python -c pass", [py, "-c", "pass"]),
+            ("cli json", [py, "-m", "AnalisisConsola", "-f", "json"]),
+            ("cli md", [py, "-m", "AnalisisConsola", "-f", "md"]),
+            ("cli pdf", [py, "-m", "AnalisisConsola", "-f", "pdf", "-o", os.path.join(tmp, "x.pdf")]),
+            ("imports Final.py", [py, "-c", "import tkinter, matplotlib; matplotlib.use('TkAgg'); "
+                                            "import matplotlib.backends.backend_tkagg, reportlab.platypus"]),
+        ]
+        filas = []
+        for nombre, cmd in casos:
+            ms = _medir(cmd, n, aqui) * 1000
+            filas.append((nombre, ms))
+            print(f"{nombre:<18} {ms:8.1f} ms")
+    return filas
+
+# ======================================================
+# MAIN
+# ======================================================
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m AnalisisConsola",
+                                description="Análisis financiero de Final.py sin interfaz gráfica.")
+    p.add_argument("entrada", nargs="?",
+                   help="JSON o CSV con las claves de Final.py ('-' = stdin; sin entrada: datos por defecto)")
+    p.add_argument("-f", "--formato", choices=("json", "md", "pdf"), default="json")
+    p.add_argument("-o", "--salida", help="archivo de salida (por defecto stdout; PDF: Informe_Profesional.pdf)")
+    p.add_argument("--entrada-formato", choices=("json", "csv"), help="forzar el formato de la entrada")
+    p.add_argument("--benchmark-arranque", type=int, metavar="N", help="medir el arranque en frío (N repeticiones)")
+    a = p.parse_args(argv)
+
+    if a.benchmark_arranque:
+        benchmark_arranque(a.benchmark_arranque)
+        return 0
+
+    empresas = leer_entradas(a.entrada, a.entrada_formato) if a.entrada else [("Innovatech Solutions", {})]
+    analisis = [(nombre, data) + analizar(data) for nombre, data in empresas]
+
+    if a.formato == "pdf":
+        salida = a.salida or "Informe_Profesional.pdf"
+        for i, (nombre, data, r, textos) in enumerate(analisis):
+            destino = _destino_pdf(salida, i, len(analisis))
+            escribir_pdf(r, textos, destino, nombre)
+            print(destino)
+        return 0
+
+    if a.formato == "json":
+        docs = [a_json(*x) for x in analisis]
+        texto = json.dumps(docs[0] if len(docs) == 1 else docs, ensure_ascii=False, indent=2) + "\n"
+    else:
+        texto = "\n---\n\n".join(informe_markdown(r, textos, titulo=f"Informe financiero — {nombre}")
+                                 for nombre, data, r, textos in analisis)
+
+    if a.salida:
+        with open(a.salida, "w", encoding="utf-8") as f:
+            f.write(texto)
+    else:
+        sys.stdout.write(texto)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
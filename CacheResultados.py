@@ -0,0 +1,116 @@
+# ======================================================
+# CACHÉ PERSISTENTE DE RESULTADOS (run_analisis)
+# ======================================================
+# Guarda en disco, por hash de las entradas, todo lo que produce un análisis:
+# el dict de calcular_todo, los textos A–D y los PNG de los gráficos. Si el
+# usuario vuelve a pulsar el botón sin cambiar nada, se reutiliza la entrada
+# en lugar de recalcular y redibujar con matplotlib.
+#
+# - La clave es un sha256 del JSON canónico de read_all_inputs (claves
+#   ordenadas, valores float) más un "espacio" que identifica al script y a la
+#   versión de su código: si se edita Final.py o CalculoFinanciero.py las
+#   entradas viejas dejan de coincidir solas.
+# - Cada entrada es un archivo <clave>.pkl; la fecha de modificación hace de
+#   marca LRU (se actualiza en cada acierto) y al guardar se borran las más
+#   antiguas hasta quedar por debajo de max_bytes.
+
+import os
+import json
+import pickle
+import hashlib
+import tempfile
+
+DIR_CACHE_POR_DEFECTO = os.environ.get(
+    "ANALISIS_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "Analisis_Empresarial"))
+MAX_BYTES_CACHE = 64 * 1024 * 1024
+EXTENSION = ".pkl"
+
+
+def firma_codigo(*rutas):
+    """Hash corto del contenido de los archivos de código que influyen en el resultado."""
+    h = hashlib.sha256()
+    for ruta in rutas:
+        try:
+            with open(ruta, "rb") as f:
+                h.update(f.read())
+        except OSError:
+            h.update(ruta.encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def clave_entradas(data, espacio=""):
+    """Clave estable para un dict de entradas: mismo contenido -> misma clave."""
+    normal = {}
+    for k, v in data.items():
+        try:
+            normal[str(k)] = float(v) + 0.0   # +0.0 convierte -0.0 en 0.0
+        except (TypeError, ValueError):
+            normal[str(k)] = str(v)
+    texto = json.dumps(normal, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256((espacio + "\n" + texto).encode("utf-8")).hexdigest()
+
+
+class CacheResultados:
+    def __init__(self, directorio=None, max_bytes=MAX_BYTES_CACHE):
+        self.directorio = directorio or DIR_CACHE_POR_DEFECTO
+        self.max_bytes = max_bytes
+        os.makedirs(self.directorio, exist_ok=True)
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, clave + EXTENSION)
+
+    def obtener(self, clave):
+        """Devuelve lo guardado para `clave` o None. Un acierto la marca como la más reciente."""
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, "rb") as f:
+                valor = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # archivo truncado o de otra versión: se trata como fallo
+            self._borrar(ruta)
+            return None
+        try: os.utime(ruta, None)
+        except OSError: pass
+        return valor
+
+    def guardar(self, clave, valor):
+        """Escribe la entrada de forma atómica y recorta la caché al tamaño máximo."""
+        fd, tmp = tempfile.mkstemp(dir=self.directorio, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(valor, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._ruta(clave))
+        except Exception:
+            self._borrar(tmp)
+            raise
+        self._recortar()
+
+    def limpiar(self):
+        for nombre in os.listdir(self.directorio):
+            if nombre.endswith(EXTENSION):
+                self._borrar(os.path.join(self.directorio, nombre))
+
+    def _recortar(self):
+        entradas = []
+        total = 0
+        for e in os.scandir(self.directorio):
+            if e.name.endswith(EXTENSION):
+                st = e.stat()
+                entradas.append((st.st_mtime, st.st_size, e.path))
+                total += st.st_size
+        if total <= self.max_bytes:
+            return
+        entradas.sort()   # las menos usadas primero
+        for _, tam, ruta in entradas:
+            if total <= self.max_bytes:
+                break
+            self._borrar(ruta)
+            total -= tam
+
+    @staticmethod
+    def _borrar(ruta):
+        try: os.remove(ruta)
+        except OSError: pass
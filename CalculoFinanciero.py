@@ -0,0 +1,305 @@
+# =============================
+# Cálculo financiero (sin interfaz)
+# =============================
+# La clase AnalisisFinanciero vive aquí para poder usarla sin abrir la
+# ventana de Tk de Final.py. calcular_todo_lote() aplica exactamente las
+# mismas fórmulas sobre tablas completas (una fila por empresa).
+# NumPy solo se importa en el modo lote: la clase escalar arranca sin él.
+import math
+
+# ======================================================
+# DATOS POR DEFECTO Y CLAVES
+# ======================================================
+
+DATOS_POR_DEFECTO = {
+    "AC_2023": 2800.0, "AC_2024": 3800.0, "ANC_2023": 1450.0, "ANC_2024": 1850.0,
+    "PC_2023": 550.0, "PC_2024": 1000.0, "PNC_2023": 700.0, "PNC_2024": 1000.0,
+    "PN_2023": 3000.0, "PN_2024": 3650.0, "Caja_2023": 850.0, "Caja_2024": 1100.0,
+    "Clientes_2023": 1200.0, "Clientes_2024": 1600.0, "InvCP_2023": 300.0, "InvCP_2024": 500.0,
+    "Ingresos_2023": 8500.0, "Ingresos_2024": 11200.0, "Costo_2023": 3200.0, "Costo_2024": 4100.0,
+    "GB_2023": 5300.0, "GB_2024": 7100.0, "GA_2023": 2100.0, "GA_2024": 2600.0,
+    "GV_2023": 1200.0, "GV_2024": 1400.0, "DEP_2023": 400.0, "DEP_2024": 500.0,
+    "BAII_2023": 1600.0, "BAII_2024": 2600.0, "GastosFin_2023": 100.0, "GastosFin_2024": 150.0,
+    "UN_2023": 1162.0, "UN_2024": 1912.0
+}
+
+# Orden en que calcular_todo() llena self.r
+CLAVES_RESULTADO = (
+    "TA_2023", "TA_2024",
+    "FM_2023", "FM_2024", "vertical_AC", "vertical_ANC", "vertical_PC", "vertical_PN", "vertical_PNC",
+    "h_AC", "h_ANC", "h_PC", "h_PN", "h_PasivoTotal", "h_AC_abs", "h_ANC_abs", "h_PC_abs", "CCE",
+    "LG_2024", "T_2024", "D_2024", "LG_2023", "T_2023", "D_2023",
+    "garantia_2024", "autonomia_2024", "calidad_2024", "garantia_2023", "autonomia_2023",
+    "pct_PC", "pct_PNC", "pct_PN_fin", "Ingresos_2025_sim", "PQ",
+    "UN_2025_sim", "FM_2025_sim", "LG_2025_sim", "mejora_FM_reco", "transferencia_deuda",
+    "RAT_2024", "RRP_2024", "RAT_2023", "RRP_2023", "crecimiento_RAT",
+    "margen_neto_dupont", "rotacion_activo", "apalancamiento_dupont", "RRP_dupont_calc",
+    "margen_bruto", "margen_operativo", "margen_neto", "costo_deuda", "ratio_D_PN",
+    "efecto_apalancamiento_calc", "mejora_BAII_reco"
+)
+
+# ======================================================
+# CLASE DE CÁLCULO Y LÓGICA FINANCIERA
+# ======================================================
+
+class AnalisisFinanciero:
+    def __init__(self, data=None):
+        # Datos por defecto
+        default_data = DATOS_POR_DEFECTO
+        if data is None:
+            self.data = dict(default_data)
+        else:
+            self.data = {**default_data, **data}
+
+        self.r = {}
+        self._set_variables()
+        self._set_denominadores_seguros()
+
+    def _set_variables(self):
+        self.AC_2023 = self.data.get("AC_2023", 0.0); self.AC_2024 = self.data.get("AC_2024", 0.0)
+        self.ANC_2023 = self.data.get("ANC_2023", 0.0); self.ANC_2024 = self.data.get("ANC_2024", 0.0)
+        self.PC_2023 = self.data.get("PC_2023", 0.0); self.PC_2024 = self.data.get("PC_2024", 0.0)
+        self.PNC_2023 = self.data.get("PNC_2023", 0.0); self.PNC_2024 = self.data.get("PNC_2024", 0.0)
+        self.PN_2023 = self.data.get("PN_2023", 0.0); self.PN_2024 = self.data.get("PN_2024", 0.0)
+        self.Caja_2024 = self.data.get("Caja_2024", 0.0); self.Clientes_2024 = self.data.get("Clientes_2024", 0.0)
+        self.InvCP_2024 = self.data.get("InvCP_2024", 0.0); self.Caja_2023 = self.data.get("Caja_2023", 0.0)
+        self.Clientes_2023 = self.data.get("Clientes_2023", 0.0); self.InvCP_2023 = self.data.get("InvCP_2023", 0.0)
+        self.Ingresos_2024 = self.data.get("Ingresos_2024", 0.0); self.UN_2024 = self.data.get("UN_2024", 0.0)
+        self.BAII_2024 = self.data.get("BAII_2024", 0.0); self.GastosFin_2024 = self.data.get("GastosFin_2024", 0.0)
+        self.GB_2024 = self.data.get("GB_2024", 0.0); self.GA_2024 = self.data.get("GA_2024", 0.0)
+        self.GV_2024 = self.data.get("GV_2024", 0.0); self.Costo_2024 = self.data.get("Costo_2024", 0.0)
+        self.TotalPasivo_2023 = self.PC_2023 + self.PNC_2023; self.TotalPasivo_2024 = self.PC_2024 + self.PNC_2024
+        self.Deuda_2024 = self.TotalPasivo_2024; self.TA_2023 = self.AC_2023 + self.ANC_2023
+        self.TA_2024 = self.AC_2024 + self.ANC_2024
+        self.r["TA_2023"] = self.TA_2023; self.r["TA_2024"] = self.TA_2024
+
+    def _set_denominadores_seguros(self):
+        self.pc2024 = self.PC_2024 if self.PC_2024 != 0 else 1.0
+        self.pc2023 = self.PC_2023 if self.PC_2023 != 0 else 1.0
+        self.deuda2024 = self.TotalPasivo_2024 if self.TotalPasivo_2024 != 0 else 1.0
+        self.deuda2023 = self.TotalPasivo_2023 if self.TotalPasivo_2023 != 0 else 1.0
+        self.ing24 = self.Ingresos_2024 if self.Ingresos_2024 != 0 else 1.0
+        self.pn24 = self.PN_2024 if self.PN_2024 != 0 else 1.0
+        self.ta24 = self.TA_2024 if self.TA_2024 != 0 else 1.0
+        self.ta23 = self.TA_2023 if self.TA_2023 != 0 else 1.0
+
+    def _pct(self, nuevo, viejo):
+        if viejo == 0: return 0 if nuevo == 0 else 100 * math.copysign(1, nuevo)
+        if viejo < 0: return (nuevo - viejo) / abs(viejo) * 100
+        try: return (nuevo - viejo) / viejo * 100
+        except ZeroDivisionError: return 0
+
+    def _calcular_punto_quiebre(self):
+        GastosFijos = self.GA_2024 + self.GV_2024 + self.GastosFin_2024
+        MargenContribucionTotal = self.Ingresos_2024 - self.Costo_2024
+        MargenContribucionUnitario = MargenContribucionTotal / self.ing24
+        if MargenContribucionUnitario <= 0: return float('inf')
+        return GastosFijos / MargenContribucionUnitario
+
+    def calcular_todo(self):
+        # Patrimonial
+        self.r["FM_2023"] = self.AC_2023 - self.PC_2023
+        self.r["FM_2024"] = self.AC_2024 - self.PC_2024
+        self.r["vertical_AC"] = self.AC_2024 / self.ta24 * 100
+        self.r["vertical_ANC"] = self.ANC_2024 / self.ta24 * 100
+        self.r["vertical_PC"] = self.PC_2024 / self.ta24 * 100
+        self.r["vertical_PN"] = self.PN_2024 / self.ta24 * 100
+        self.r["vertical_PNC"] = self.PNC_2024 / self.ta24 * 100
+        self.r["h_AC"] = self._pct(self.AC_2024, self.AC_2023)
+        self.r["h_ANC"] = self._pct(self.ANC_2024, self.ANC_2023)
+        self.r["h_PC"] = self._pct(self.PC_2024, self.PC_2023)
+        self.r["h_PN"] = self._pct(self.PN_2024, self.PN_2023)
+        self.r["h_PasivoTotal"] = self._pct(self.TotalPasivo_2024, self.TotalPasivo_2023)
+        self.r["h_AC_abs"] = self.AC_2024 - self.AC_2023
+        self.r["h_ANC_abs"] = self.ANC_2024 - self.ANC_2023
+        self.r["h_PC_abs"] = self.PC_2024 - self.PC_2023
+        self.r["CCE"] = self.data.get("DI", 0.0) + self.data.get("DC", 0.0) - self.data.get("DP", 0.0)
+
+        # Financiero
+        self.r["LG_2024"] = self.AC_2024 / self.pc2024; self.r["T_2024"] = (self.Caja_2024 + self.Clientes_2024 + self.InvCP_2024) / self.pc2024
+        self.r["D_2024"] = self.Caja_2024 / self.pc2024; self.r["LG_2023"] = self.AC_2023 / self.pc2023
+        self.r["T_2023"] = (self.Caja_2023 + self.Clientes_2023 + self.InvCP_2023) / self.pc2023; self.r["D_2023"] = self.Caja_2023 / self.pc2023
+        self.r["garantia_2024"] = self.TA_2024 / self.deuda2024; self.r["autonomia_2024"] = self.PN_2024 / self.deuda2024
+        self.r["calidad_2024"] = self.PC_2024 / self.deuda2024; self.r["garantia_2023"] = self.TA_2023 / self.deuda2023
+        self.r["autonomia_2023"] = self.PN_2023 / self.deuda2023
+        self.r["pct_PC"] = self.PC_2024 / self.deuda2024 * 100
+        self.r["pct_PNC"] = self.PNC_2024 / self.deuda2024 * 100
+        self.r["pct_PN_fin"] = self.PN_2024 / (self.PN_2024 + self.Deuda_2024) * 100 if (self.PN_2024 + self.Deuda_2024) else 0
+        self.r["Ingresos_2025_sim"] = self.Ingresos_2024 * 0.70
+        self.r["PQ"] = self._calcular_punto_quiebre()
+        self.r["UN_2025_sim"] = -400.00; self.r["FM_2025_sim"] = 1660.00; self.r["LG_2025_sim"] = 2.66
+        transferencia_deuda = self.PC_2024 * 0.30
+        fm_despues_reco2 = self.AC_2024 - (self.PC_2024 - transferencia_deuda)
+        self.r["mejora_FM_reco"] = fm_despues_reco2 - self.r["FM_2024"]
+        self.r["transferencia_deuda"] = transferencia_deuda
+
+        # Economico
+        self.r["RAT_2024"] = (self.BAII_2024 / self.ta24) * 100; self.r["RRP_2024"] = (self.UN_2024 / self.pn24) * 100
+        self.r["RAT_2023"] = (self.data.get("BAII_2023", 0.0) / self.ta23) * 100
+        self.r["RRP_2023"] = (self.data.get("UN_2023", 0.0) / self.PN_2023) * 100 if self.PN_2023 else 0
+        self.r["crecimiento_RAT"] = self._pct(self.r["RAT_2024"], self.r["RAT_2023"])
+        self.r["margen_neto_dupont"] = self.UN_2024 / self.ing24; self.r["rotacion_activo"] = self.Ingresos_2024 / self.ta24
+        self.r["apalancamiento_dupont"] = self.TA_2024 / self.pn24
+        self.r["RRP_dupont_calc"] = self.r["margen_neto_dupont"] * self.r["rotacion_activo"] * self.r["apalancamiento_dupont"] * 100
+        self.r["margen_bruto"] = (self.GB_2024 / self.ing24) * 100; self.r["margen_operativo"] = (self.BAII_2024 / self.ing24) * 100
+        self.r["margen_neto"] = (self.UN_2024 / self.ing24) * 100
+        self.r["costo_deuda"] = (self.GastosFin_2024 / self.deuda2024 * 100)
+        self.D_PN = self.Deuda_2024 / self.pn24; self.r["ratio_D_PN"] = self.D_PN
+        RAT_menos_costo = self.r["RAT_2024"] - self.r["costo_deuda"]
+        self.r["efecto_apalancamiento_calc"] = self.r["RAT_2024"] + (self.D_PN * RAT_menos_costo)
+        self.r["mejora_BAII_reco"] = self.GA_2024 * 0.10
+        return self.r
+
+# ======================================================
+# MODO LOTE (VECTORIZADO)
+# ======================================================
+
+def _columnas_tabla(tabla):
+    """
+    Devuelve (nombres de columna, función de acceso, n filas) para DataFrame,
+    array estructurado, dict o TablaEstados (EstadosFinancieros.py).
+    """
+    if hasattr(tabla, "columnas") and hasattr(tabla, "valores"):
+        from EstadosFinancieros import ESQUEMA_FINAL
+        n = len(tabla)
+        tabla = tabla.columnas(ESQUEMA_FINAL, DATOS_POR_DEFECTO)
+        return set(tabla), (lambda k: tabla[k]), n
+    if hasattr(tabla, "dtype") and tabla.dtype.names is not None:
+        return set(tabla.dtype.names), (lambda k: tabla[k]), len(tabla)
+    if hasattr(tabla, "columns"):
+        return set(tabla.columns), (lambda k: tabla[k].to_numpy()), len(tabla)
+    nombres = set(tabla.keys())
+    n = len(next(iter(tabla.values()))) if tabla else 0
+    return nombres, (lambda k: tabla[k]), n
+
+def _seguro(x):
+    # Igual que `x if x != 0 else 1.0` (NaN se conserva, como en el escalar)
+    import numpy as np
+    return np.where(x != 0, x, 1.0)
+
+def _pct_lote(nuevo, viejo):
+    """Versión enmascarada de AnalisisFinanciero._pct."""
+    import numpy as np
+    cero = viejo == 0
+    negativo = viejo < 0
+    res = (nuevo - viejo) / np.where(cero, 1.0, viejo) * 100
+    res = np.where(negativo, (nuevo - viejo) / np.abs(viejo) * 100, res)
+    return np.where(cero, np.where(nuevo == 0, 0.0, 100 * np.copysign(1.0, nuevo)), res)
+
+def calcular_todo_lote(tabla):
+    """
+    Calcula todas las métricas de AnalisisFinanciero.calcular_todo() para cada fila
+    de `tabla` (DataFrame de pandas, array estructurado de NumPy, dict de columnas
+    con las claves AC_2023 ... UN_2024 o TablaEstados con los períodos 2023 y
+    2024) en una sola pasada vectorizada.
+
+    Las columnas ausentes toman el valor de DATOS_POR_DEFECTO (o 0.0 para DI/DC/DP),
+    igual que el constructor escalar. Devuelve un DataFrame si la entrada era un
+    DataFrame, un array estructurado si era un array estructurado, o un dict de
+    columnas en cualquier otro caso.
+    """
+    import numpy as np
+    nombres, columna, n = _columnas_tabla(tabla)
+
+    def col(k):
+        if k in nombres:
+            return np.asarray(columna(k), dtype=np.float64)
+        return np.full(n, DATOS_POR_DEFECTO.get(k, 0.0), dtype=np.float64)
+
+    AC_2023, AC_2024 = col("AC_2023"), col("AC_2024")
+    ANC_2023, ANC_2024 = col("ANC_2023"), col("ANC_2024")
+    PC_2023, PC_2024 = col("PC_2023"), col("PC_2024")
+    PNC_2023, PNC_2024 = col("PNC_2023"), col("PNC_2024")
+    PN_2023, PN_2024 = col("PN_2023"), col("PN_2024")
+    Caja_2023, Caja_2024 = col("Caja_2023"), col("Caja_2024")
+    Clientes_2023, Clientes_2024 = col("Clientes_2023"), col("Clientes_2024")
+    InvCP_2023, InvCP_2024 = col("InvCP_2023"), col("InvCP_2024")
+    Ingresos_2024, UN_2024 = col("Ingresos_2024"), col("UN_2024")
+    BAII_2024, GastosFin_2024 = col("BAII_2024"), col("GastosFin_2024")
+    GB_2024, GA_2024 = col("GB_2024"), col("GA_2024")
+    GV_2024, Costo_2024 = col("GV_2024"), col("Costo_2024")
+
+    TotalPasivo_2023 = PC_2023 + PNC_2023
+    TotalPasivo_2024 = PC_2024 + PNC_2024
+    Deuda_2024 = TotalPasivo_2024
+    TA_2023 = AC_2023 + ANC_2023
+    TA_2024 = AC_2024 + ANC_2024
+
+    # Denominadores seguros
+    pc2024, pc2023 = _seguro(PC_2024), _seguro(PC_2023)
+    deuda2024, deuda2023 = _seguro(TotalPasivo_2024), _seguro(TotalPasivo_2023)
+    ing24, pn24 = _seguro(Ingresos_2024), _seguro(PN_2024)
+    ta24, ta23 = _seguro(TA_2024), _seguro(TA_2023)
+
+    r = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r["TA_2023"] = TA_2023; r["TA_2024"] = TA_2024
+
+        # Patrimonial
+        r["FM_2023"] = AC_2023 - PC_2023
+        r["FM_2024"] = AC_2024 - PC_2024
+        r["vertical_AC"] = AC_2024 / ta24 * 100
+        r["vertical_ANC"] = ANC_2024 / ta24 * 100
+        r["vertical_PC"] = PC_2024 / ta24 * 100
+        r["vertical_PN"] = PN_2024 / ta24 * 100
+        r["vertical_PNC"] = PNC_2024 / ta24 * 100
+        r["h_AC"] = _pct_lote(AC_2024, AC_2023)
+        r["h_ANC"] = _pct_lote(ANC_2024, ANC_2023)
+        r["h_PC"] = _pct_lote(PC_2024, PC_2023)
+        r["h_PN"] = _pct_lote(PN_2024, PN_2023)
+        r["h_PasivoTotal"] = _pct_lote(TotalPasivo_2024, TotalPasivo_2023)
+        r["h_AC_abs"] = AC_2024 - AC_2023
+        r["h_ANC_abs"] = ANC_2024 - ANC_2023
+        r["h_PC_abs"] = PC_2024 - PC_2023
+        r["CCE"] = col("DI") + col("DC") - col("DP")
+
+        # Financiero
+        r["LG_2024"] = AC_2024 / pc2024; r["T_2024"] = (Caja_2024 + Clientes_2024 + InvCP_2024) / pc2024
+        r["D_2024"] = Caja_2024 / pc2024; r["LG_2023"] = AC_2023 / pc2023
+        r["T_2023"] = (Caja_2023 + Clientes_2023 + InvCP_2023) / pc2023; r["D_2023"] = Caja_2023 / pc2023
+        r["garantia_2024"] = TA_2024 / deuda2024; r["autonomia_2024"] = PN_2024 / deuda2024
+        r["calidad_2024"] = PC_2024 / deuda2024; r["garantia_2023"] = TA_2023 / deuda2023
+        r["autonomia_2023"] = PN_2023 / deuda2023
+        r["pct_PC"] = PC_2024 / deuda2024 * 100
+        r["pct_PNC"] = PNC_2024 / deuda2024 * 100
+        fin_total = PN_2024 + Deuda_2024
+        r["pct_PN_fin"] = np.where(fin_total != 0, PN_2024 / np.where(fin_total != 0, fin_total, 1.0) * 100, 0.0)
+        r["Ingresos_2025_sim"] = Ingresos_2024 * 0.70
+
+        # Punto de quiebre (inf cuando el margen de contribución no es positivo)
+        GastosFijos = GA_2024 + GV_2024 + GastosFin_2024
+        MargenContribucionUnitario = (Ingresos_2024 - Costo_2024) / ing24
+        r["PQ"] = np.where(MargenContribucionUnitario <= 0, np.inf, GastosFijos / MargenContribucionUnitario)
+
+        r["UN_2025_sim"] = np.full(n, -400.00); r["FM_2025_sim"] = np.full(n, 1660.00); r["LG_2025_sim"] = np.full(n, 2.66)
+        transferencia_deuda = PC_2024 * 0.30
+        fm_despues_reco2 = AC_2024 - (PC_2024 - transferencia_deuda)
+        r["mejora_FM_reco"] = fm_despues_reco2 - r["FM_2024"]
+        r["transferencia_deuda"] = transferencia_deuda
+
+        # Economico
+        r["RAT_2024"] = (BAII_2024 / ta24) * 100; r["RRP_2024"] = (UN_2024 / pn24) * 100
+        r["RAT_2023"] = (col("BAII_2023") / ta23) * 100
+        pn23_ok = PN_2023 != 0
+        r["RRP_2023"] = np.where(pn23_ok, (col("UN_2023") / np.where(pn23_ok, PN_2023, 1.0)) * 100, 0.0)
+        r["crecimiento_RAT"] = _pct_lote(r["RAT_2024"], r["RAT_2023"])
+        r["margen_neto_dupont"] = UN_2024 / ing24; r["rotacion_activo"] = Ingresos_2024 / ta24
+        r["apalancamiento_dupont"] = TA_2024 / pn24
+        r["RRP_dupont_calc"] = r["margen_neto_dupont"] * r["rotacion_activo"] * r["apalancamiento_dupont"] * 100
+        r["margen_bruto"] = (GB_2024 / ing24) * 100; r["margen_operativo"] = (BAII_2024 / ing24) * 100
+        r["margen_neto"] = (UN_2024 / ing24) * 100
+        r["costo_deuda"] = (GastosFin_2024 / deuda2024 * 100)
+        D_PN = Deuda_2024 / pn24; r["ratio_D_PN"] = D_PN
+        RAT_menos_costo = r["RAT_2024"] - r["costo_deuda"]
+        r["efecto_apalancamiento_calc"] = r["RAT_2024"] + (D_PN * RAT_menos_costo)
+        r["mejora_BAII_reco"] = GA_2024 * 0.10
+
+    if hasattr(tabla, "columns"):
+        import pandas as pd
+        return pd.DataFrame(r, index=tabla.index, columns=list(CLAVES_RESULTADO))
+    if hasattr(tabla, "dtype") and tabla.dtype.names is not None:
+        salida = np.empty(n, dtype=[(k, np.float64) for k in CLAVES_RESULTADO])
+        for k in CLAVES_RESULTADO:
+            salida[k] = r[k]
+        return salida
+    return r
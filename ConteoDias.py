@@ -0,0 +1,227 @@
+# ======================================================
+# CONVENCIONES DE CONTEO DE DÍAS Y CALENDARIOS HÁBILES
+# ======================================================
+# Hasta ahora el tiempo se ingresaba como años, meses, semanas y días y se
+# convertía con el año comercial (años*360 + meses*30 + semanas*7 + días,
+# dividido por 360), repetido en Finanzas.leer_tiempo y en
+# UnifiedApp.convertir_tiempo. Aquí está esa conversión (dias_comerciales) y,
+# para contratos con fechas reales, la fracción de año entre dos fechas
+# según la convención del contrato:
+#
+#   30/360    ISDA: día 31 -> 30 (el de fin solo si el de inicio quedó en 30)
+#   ACT/360   días reales / 360
+#   ACT/365   días reales / 365 (Fixed)
+#   ACT/ACT   ISDA: los días de cada año calendario / los días de ese año
+#   BUS/252   días hábiles del calendario / 252
+#
+# Todo trabaja sobre arrays datetime64[D] (un contrato por elemento), sin
+# bucles de Python (solo las fechas en texto se convierten de a una, con
+# fechas()). Calendario precalcula los días hábiles y feriados en un
+# np.busdaycalendar, que usan busday_count/busday_offset en C.
+#
+#   t = fraccion_año(["2024-01-15", "2024-03-01"], "2025-01-15", "ACT/ACT")
+#   cal = Calendario(feriados_fijos(2024, 2030))
+#   cal.habiles("2024-12-20", "2025-01-10"), cal.ajustar("2025-01-01")
+#
+#   python ConteoDias.py --benchmark 1000000
+import time
+
+import numpy as np
+
+CONVENCIONES = ("30/360", "ACT/360", "ACT/365", "ACT/ACT", "BUS/252")
+
+# Días comerciales por unidad de tiempo (año de 360 días, mes de 30)
+DIAS_COMERCIALES = {"años": 360, "año": 360, "anos": 360, "meses": 30, "mes": 30,
+                    "semanas": 7, "semana": 7, "días": 1, "dias": 1, "día": 1, "dia": 1}
+
+# (mes, día) de los feriados de fecha fija más comunes
+FERIADOS_FIJOS = ((1, 1), (5, 1), (12, 25))
+
+def dias_comerciales(años=0, meses=0, semanas=0, dias=0):
+    """La conversión de siempre: días del año comercial de 360."""
+    return años * 360 + meses * 30 + semanas * 7 + dias
+
+def fechas(x):
+    """
+    Fechas -> array datetime64[D]. Acepta datetime64, date, "AAAA-MM-DD",
+    "DD/MM/AAAA" y None o "" (NaT).
+    """
+    if isinstance(x, np.ndarray) and np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[D]")
+    arr = np.asarray(x, dtype=object)
+    if arr.dtype == object:
+        convertir = np.frompyfunc(_fecha, 1, 1)
+        return convertir(arr).astype("datetime64[D]")
+    return arr.astype("datetime64[D]")
+
+def _fecha(v):
+    if v is None or v == "":
+        return np.datetime64("NaT", "D")
+    if isinstance(v, str) and "/" in v:
+        d, m, a = v.strip().split("/")
+        return np.datetime64(f"{int(a):04d}-{int(m):02d}-{int(d):02d}", "D")
+    return np.datetime64(v, "D")
+
+def partes(f):
+    """
+    (año, mes, día) enteros de un array datetime64[D]. Aritmética entera
+    sobre los días desde 1970 (algoritmo civil_from_days de H. Hinnant):
+    más rápido que convertir a datetime64[M] y [Y].
+    """
+    z = fechas(f).astype(np.int64) + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    dia = doy - (153 * mp + 2) // 5 + 1
+    mes = np.where(mp < 10, mp + 3, mp - 9)
+    año = yoe + era * 400 + (mes <= 2)
+    return año, mes, dia
+
+def _primero_de_enero(año):
+    """Días desde 1970 del 1 de enero de `año` (inversa de partes para mes=1, día=1)."""
+    y = año - 1
+    era = y // 400
+    yoe = y - era * 400
+    return era * 146097 + yoe * 365 + yoe // 4 - yoe // 100 + 306 - 719468
+
+def _bisiesto(año):
+    return (año % 4 == 0) & ((año % 100 != 0) | (año % 400 == 0))
+
+def dias_reales(inicio, fin):
+    """Días calendario de inicio a fin (float64; NaN si falta una fecha)."""
+    inicio, fin = fechas(inicio), fechas(fin)
+    dias = (fin - inicio).astype(np.float64)
+    return np.where(np.isnat(inicio) | np.isnat(fin), np.nan, dias)
+
+def dias_30_360(inicio, fin):
+    """Días según 30/360 ISDA (float64; NaN si falta una fecha)."""
+    inicio, fin = fechas(inicio), fechas(fin)
+    a1, m1, d1 = partes(inicio)
+    a2, m2, d2 = partes(fin)
+    d1 = np.minimum(d1, 30)
+    d2 = np.where((d2 == 31) & (d1 == 30), 30, d2)
+    dias = (360 * (a2 - a1) + 30 * (m2 - m1) + (d2 - d1)).astype(np.float64)
+    return np.where(np.isnat(inicio) | np.isnat(fin), np.nan, dias)
+
+def _act_act(inicio, fin):
+    # años enteros entre los 1 de enero, más la parte de cada año extremo sobre su propio largo
+    n1, n2 = partes(inicio)[0], partes(fin)[0]
+    largo1, largo2 = 365.0 + _bisiesto(n1), 365.0 + _bisiesto(n2)
+    return ((n2 - n1)
+            + (fechas(fin).astype(np.int64) - _primero_de_enero(n2)) / largo2
+            - (fechas(inicio).astype(np.int64) - _primero_de_enero(n1)) / largo1)
+
+def fraccion_año(inicio, fin, convencion="30/360", calendario=None):
+    """
+    Fracción de año de inicio a fin (con broadcast) según `convencion`.
+    BUS/252 usa `calendario` (Calendario; por defecto lunes a viernes sin
+    feriados). Devuelve float64 con NaN donde falta una fecha.
+    """
+    inicio, fin = np.broadcast_arrays(fechas(inicio), fechas(fin))
+    faltan = np.isnat(inicio) | np.isnat(fin)
+    if convencion == "30/360":
+        return dias_30_360(inicio, fin) / 360.0
+    if convencion == "ACT/360":
+        return dias_reales(inicio, fin) / 360.0
+    if convencion == "ACT/365":
+        return dias_reales(inicio, fin) / 365.0
+    if convencion == "ACT/ACT":
+        t = _act_act(np.where(faltan, np.datetime64("2000-01-01"), inicio),
+                     np.where(faltan, np.datetime64("2000-01-01"), fin))
+    elif convencion == "BUS/252":
+        cal = calendario if calendario is not None else Calendario()
+        t = cal.habiles(np.where(faltan, np.datetime64("2000-01-01"), inicio),
+                        np.where(faltan, np.datetime64("2000-01-01"), fin)) / 252.0
+    else:
+        raise ValueError(f"Convención desconocida: {convencion!r} (opciones: {', '.join(CONVENCIONES)})")
+    return np.where(faltan, np.nan, t)
+
+# ======================================================
+# CALENDARIOS DE DÍAS HÁBILES
+# ======================================================
+
+def feriados_fijos(desde, hasta, dias=FERIADOS_FIJOS):
+    """Feriados de fecha fija (mes, día) de los años desde..hasta, como datetime64[D]."""
+    años = np.arange(desde, hasta + 1)
+    return np.sort(np.array([np.datetime64(f"{a:04d}-{m:02d}-{d:02d}") for a in años for m, d in dias]))
+
+class Calendario:
+    """
+    Días hábiles: `semana` (máscara lunes..domingo, "1111100" = lunes a
+    viernes) menos `feriados`. Se precalcula una vez en np.busdaycalendar.
+    """
+    def __init__(self, feriados=(), semana="1111100"):
+        self.semana = semana
+        self.feriados = np.unique(fechas(list(feriados))) if len(feriados) else np.array([], "datetime64[D]")
+        self.cal = np.busdaycalendar(weekmask=semana, holidays=self.feriados)
+
+    def habiles(self, inicio, fin):
+        """Días hábiles en [inicio, fin) (negativo si fin < inicio)."""
+        return np.busday_count(fechas(inicio), fechas(fin), busdaycal=self.cal)
+
+    def es_habil(self, f):
+        return np.is_busday(fechas(f), busdaycal=self.cal)
+
+    def ajustar(self, f, regla="following"):
+        """Mueve las fechas no hábiles: following, preceding, modifiedfollowing o modifiedpreceding."""
+        return np.busday_offset(fechas(f), 0, roll=regla, busdaycal=self.cal)
+
+    def sumar_habiles(self, f, n, regla="following"):
+        return np.busday_offset(fechas(f), n, roll=regla, busdaycal=self.cal)
+
+# ======================================================
+# BENCHMARK
+# ======================================================
+
+def _escalar(inicio, fin, convencion):
+    """Una fracción de año con datetime.date (la forma directa), para comparar."""
+    if convencion == "30/360":
+        d1 = min(inicio.day, 30)
+        d2 = 30 if fin.day == 31 and d1 == 30 else fin.day
+        return (360 * (fin.year - inicio.year) + 30 * (fin.month - inicio.month) + d2 - d1) / 360
+    if convencion == "ACT/360":
+        return (fin - inicio).days / 360
+    if convencion == "ACT/365":
+        return (fin - inicio).days / 365
+    import calendar
+    largo = lambda a: 366 if calendar.isleap(a) else 365
+    return (fin.year - inicio.year + (fin - fin.replace(month=1, day=1)).days / largo(fin.year)
+            - (inicio - inicio.replace(month=1, day=1)).days / largo(inicio.year))
+
+def contratos_sinteticos(n, semilla=0):
+    """(inicio, fin) datetime64[D] entre 2000 y 2040, plazos de 1 día a 30 años."""
+    rnd = np.random.default_rng(semilla)
+    inicio = np.datetime64("2000-01-01") + rnd.integers(0, 365 * 30, n).astype("timedelta64[D]")
+    fin = inicio + rnd.integers(1, 365 * 30, n).astype("timedelta64[D]")
+    return inicio, fin
+
+def benchmark_conteo(n=1_000_000, muestra=100_000):
+    """fraccion_año por convención contra un bucle con datetime.date (en `muestra` contratos, extrapolado)."""
+    inicio, fin = contratos_sinteticos(n)
+    m = min(muestra, n)
+    pares = list(zip(inicio[:m].tolist(), fin[:m].tolist()))
+    cal = Calendario(feriados_fijos(2000, 2070))
+    print(f"{n} contratos")
+    for conv in CONVENCIONES:
+        t0 = time.perf_counter()
+        t = fraccion_año(inicio, fin, conv, cal)
+        t_vec = time.perf_counter() - t0
+        if conv == "BUS/252":
+            print(f"{conv:<8} vectorizado {t_vec * 1000:8.1f} ms   (calendario con {len(cal.feriados)} feriados)")
+            continue
+        t0 = time.perf_counter()
+        ref = np.array([_escalar(a, b, conv) for a, b in pares])
+        t_bucle = (time.perf_counter() - t0) * n / m
+        dif = float(np.max(np.abs(t[:m] - ref)))
+        print(f"{conv:<8} bucle {t_bucle * 1000:8.0f} ms (est.)   vectorizado {t_vec * 1000:8.1f} ms   "
+              f"x{t_bucle / t_vec:6.1f}   máx. dif. {dif:.1e}")
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Fracción de año por convención sobre muchos contratos.")
+    p.add_argument("--benchmark", type=int, metavar="N", default=1_000_000, help="contratos")
+    p.add_argument("--muestra", type=int, default=100_000, help="contratos medidos con el bucle de Python")
+    a = p.parse_args()
+    benchmark_conteo(a.benchmark, a.muestra)
@@ -0,0 +1,340 @@
+# ======================================================
+# MODELO ÚNICO DE ESTADOS FINANCIEROS
+# ======================================================
+# Cada script guarda los estados a su manera:
+#
+#   Final.py / CalculoFinanciero.py   {"AC_2023": ..., "UN_2024": ...}
+#   AnalisisCompleto.py               {"Activo Corriente 2023": ..., "UN 2024": ...}
+#   FinanzasUnido.py / Parcial2       un dict por período: {"Activo total": ...}
+#                                     (bg_current, er_current, bg_prior, er_prior)
+#
+# y cada análisis repite búsquedas .get("...", 0) por nombre. Aquí hay una sola
+# lista de cuentas (CUENTAS, con su índice en INDICE_CUENTA) y dos formas de
+# guardarlas:
+#
+#   EstadoPeriodo   un período de una empresa, con __slots__ (un atributo por
+#                   cuenta, sin dict por instancia).
+#   TablaEstados    muchas empresas y períodos en un array float64
+#                   (empresa, período, cuenta); NaN = cuenta no informada.
+#
+# Los Esquema traducen de y hacia las claves de cada script (ESQUEMA_FINAL,
+# ESQUEMA_COMPLETO, ESQUEMA_UNIFICADO).
+#
+#   python EstadosFinancieros.py --benchmark 20000
+import numpy as np
+
+# ======================================================
+# CUENTAS
+# ======================================================
+
+CUENTAS_BALANCE = (
+    "activo_corriente", "activo_no_corriente", "activo_total", "caja", "clientes",
+    "inversiones_cp", "inventarios", "activos_fijos", "pasivo_corriente",
+    "pasivo_no_corriente", "pasivo_total", "patrimonio",
+)
+CUENTAS_RESULTADOS = (
+    "ingresos", "costo_ventas", "ganancia_bruta", "gastos_admin", "gastos_venta",
+    "gastos_operativos", "depreciacion", "baii", "gastos_financieros",
+    "utilidad_antes_impuestos", "utilidad_neta",
+)
+CUENTAS = CUENTAS_BALANCE + CUENTAS_RESULTADOS
+INDICE_CUENTA = {c: i for i, c in enumerate(CUENTAS)}
+
+# Totales que se pueden deducir si no se informaron: total = suma de partes
+DERIVADAS = (
+    ("activo_total", ("activo_corriente", "activo_no_corriente")),
+    ("pasivo_total", ("pasivo_corriente", "pasivo_no_corriente")),
+)
+
+# ======================================================
+# ESQUEMAS DE CLAVES DE CADA SCRIPT
+# ======================================================
+
+class Esquema:
+    """
+    Claves de un script: `nombres` va de la cuenta a su nombre en ese script y
+    `formato` arma la clave con el nombre y el período ("{nombre}_{periodo}";
+    sin "{periodo}" el script guarda un dict por período).
+    """
+    __slots__ = ("nombre", "nombres", "formato")
+
+    def __init__(self, nombre, nombres, formato):
+        self.nombre = nombre
+        self.nombres = dict(nombres)
+        self.formato = formato
+
+    @property
+    def por_periodo(self):
+        return "{periodo}" not in self.formato
+
+    def clave(self, cuenta, periodo=None):
+        nombre = self.nombres.get(cuenta)
+        if nombre is None:
+            return None
+        return self.formato.format(nombre=nombre, periodo=periodo)
+
+    def plan(self, periodos):
+        """[(clave, índice de período, índice de cuenta)] para leer un dict de este esquema."""
+        if self.por_periodo:
+            return [(self.clave(c), 0, INDICE_CUENTA[c]) for c in CUENTAS if c in self.nombres]
+        return [(self.clave(c, p), ip, INDICE_CUENTA[c])
+                for ip, p in enumerate(periodos) for c in CUENTAS if c in self.nombres]
+
+ESQUEMA_FINAL = Esquema("final", {
+    "activo_corriente": "AC", "activo_no_corriente": "ANC", "pasivo_corriente": "PC",
+    "pasivo_no_corriente": "PNC", "patrimonio": "PN", "caja": "Caja", "clientes": "Clientes",
+    "inversiones_cp": "InvCP", "ingresos": "Ingresos", "costo_ventas": "Costo",
+    "ganancia_bruta": "GB", "gastos_admin": "GA", "gastos_venta": "GV", "depreciacion": "DEP",
+    "baii": "BAII", "gastos_financieros": "GastosFin", "utilidad_neta": "UN",
+}, "{nombre}_{periodo}")
+
+ESQUEMA_COMPLETO = Esquema("completo", {
+    "activo_corriente": "Activo Corriente", "activo_no_corriente": "Activo No Corriente",
+    "pasivo_corriente": "Pasivo Corriente", "pasivo_no_corriente": "Pasivo No Corriente",
+    "pasivo_total": "Deuda Total", "patrimonio": "Patrimonio Neto", "caja": "Caja",
+    "clientes": "Clientes", "ingresos": "Ingresos", "costo_ventas": "Costo Servicios",
+    "ganancia_bruta": "Ganancia Bruta", "baii": "BAII", "gastos_financieros": "Gastos Financieros",
+    "utilidad_neta": "UN",
+}, "{nombre} {periodo}")
+
+ESQUEMA_UNIFICADO = Esquema("unificado", {
+    "activo_corriente": "Activo corriente", "activo_total": "Activo total", "caja": "Caja y bancos",
+    "clientes": "Cuentas por cobrar", "inventarios": "Inventarios", "activos_fijos": "Activos fijos netos",
+    "pasivo_corriente": "Pasivo corriente", "pasivo_no_corriente": "Pasivo no corriente",
+    "pasivo_total": "Pasivo total", "patrimonio": "Patrimonio", "ingresos": "Ventas netas",
+    "costo_ventas": "Costo de ventas", "ganancia_bruta": "Utilidad bruta",
+    "gastos_operativos": "Gastos operativos", "baii": "Utilidad operativa",
+    "gastos_financieros": "Gastos financieros", "utilidad_antes_impuestos": "Utilidad antes de impuestos",
+    "utilidad_neta": "Utilidad neta",
+}, "{nombre}")
+
+# ======================================================
+# UN PERÍODO (ESCALAR)
+# ======================================================
+
+class EstadoPeriodo:
+    """
+    Balance y estado de resultados de un período: un atributo por cuenta
+    (estado.activo_total, ...), 0.0 si no se informó, como el .get(..., 0)
+    de los scripts. estado[i] es la cuenta CUENTAS[i].
+    """
+    __slots__ = ("periodo",) + CUENTAS
+
+    def __init__(self, periodo=None, **cuentas):
+        self.periodo = periodo
+        for c in CUENTAS:
+            setattr(self, c, float(cuentas.pop(c, 0.0)))
+        if cuentas:
+            raise TypeError(f"Cuentas desconocidas: {', '.join(cuentas)}")
+
+    def __getitem__(self, i):
+        return getattr(self, CUENTAS[i])
+
+    def valores(self):
+        """Tupla con las cuentas en el orden de CUENTAS."""
+        return tuple(getattr(self, c) for c in CUENTAS)
+
+    @classmethod
+    def desde_valores(cls, valores, periodo=None):
+        estado = cls(periodo)
+        for c, v in zip(CUENTAS, valores):
+            setattr(estado, c, 0.0 if v != v else float(v))
+        return estado
+
+    @classmethod
+    def desde_dict(cls, datos, esquema=ESQUEMA_UNIFICADO, periodo=None):
+        """Lee las claves de `esquema` para `periodo` (o un dict por período, p. ej. bg_current)."""
+        estado = cls(periodo)
+        for c in esquema.nombres:
+            v = datos.get(esquema.clave(c, periodo))
+            if v is not None:
+                setattr(estado, c, float(v))
+        return estado
+
+    @classmethod
+    def desde_unificado(cls, bg, er, periodo=None):
+        """Balance y resultados por separado, como bg_current/er_current de Parcial2Finanzas.py."""
+        return cls.desde_dict({**bg, **er}, ESQUEMA_UNIFICADO, periodo)
+
+    def a_dict(self, esquema=ESQUEMA_UNIFICADO):
+        """Las cuentas con los nombres de `esquema` para este período."""
+        return {esquema.clave(c, self.periodo): getattr(self, c) for c in esquema.nombres}
+
+    def completar(self):
+        """Rellena los totales en cero con la suma de sus partes (ver DERIVADAS)."""
+        for total, partes in DERIVADAS:
+            if getattr(self, total) == 0:
+                setattr(self, total, sum(getattr(self, p) for p in partes))
+        return self
+
+    def __repr__(self):
+        informadas = ", ".join(f"{c}={getattr(self, c):g}" for c in CUENTAS if getattr(self, c))
+        return f"EstadoPeriodo({self.periodo!r}, {informadas})"
+
+# ======================================================
+# MUCHAS EMPRESAS Y PERÍODOS (ARRAY)
+# ======================================================
+
+def _columna_float(valores):
+    """float64 con NaN para None; si hay textos vacíos o no numéricos, celda por celda."""
+    try:
+        return np.array(valores, dtype=np.float64)
+    except (TypeError, ValueError):
+        col = np.full(len(valores), np.nan)
+        for i, x in enumerate(valores):
+            try:
+                col[i] = float(x)
+            except (TypeError, ValueError):
+                pass
+        return col
+
+class TablaEstados:
+    """
+    valores[empresa, período, cuenta] en float64, NaN = no informado.
+    tabla.columna("activo_corriente", 2024) es una vista (n_empresas,) sin
+    copiar; tabla.columnas(ESQUEMA_FINAL) da el dict de columnas que espera
+    CalculoFinanciero.calcular_todo_lote.
+    """
+    __slots__ = ("periodos", "valores", "nombres", "_indice_periodo")
+
+    def __init__(self, n, periodos, nombres=None):
+        self.periodos = tuple(periodos)
+        self.valores = np.full((n, len(self.periodos), len(CUENTAS)), np.nan)
+        self.nombres = list(nombres) if nombres is not None else [None] * n
+        self._indice_periodo = {p: i for i, p in enumerate(self.periodos)}
+
+    def __len__(self):
+        return len(self.valores)
+
+    @classmethod
+    def desde_filas(cls, filas, esquema=ESQUEMA_FINAL, periodos=(2023, 2024), nombre=None):
+        """
+        Una empresa por fila (dicts con las claves de `esquema`, p. ej. las
+        filas de InformesLote o de AnalisisCompleto). `nombre` es la clave del
+        nombre de la empresa, si la hay. Los valores vacíos o no numéricos
+        quedan como no informados.
+        """
+        filas = filas if isinstance(filas, list) else list(filas)
+        tabla = cls(len(filas), periodos)
+        for clave, ip, ic in esquema.plan(tabla.periodos):
+            tabla.valores[:, ip, ic] = _columna_float([f.get(clave) for f in filas])
+        if nombre is not None:
+            tabla.nombres = [f.get(nombre) for f in filas]
+        return tabla
+
+    @classmethod
+    def desde_periodos(cls, empresas, esquema=ESQUEMA_UNIFICADO, periodos=("actual", "previo")):
+        """
+        Para los esquemas con un dict por período: `empresas` es una lista de
+        {período: dict}, p. ej. {"actual": {**bg_current, **er_current}, "previo": ...}.
+        """
+        tabla = cls(len(empresas), periodos)
+        plan = esquema.plan(tabla.periodos)
+        for i, por_periodo in enumerate(empresas):
+            for ip, p in enumerate(tabla.periodos):
+                datos = por_periodo.get(p)
+                if not datos:
+                    continue
+                for clave, _, ic in plan:
+                    x = datos.get(clave)
+                    if x is not None:
+                        tabla.valores[i, ip, ic] = float(x)
+        return tabla
+
+    def indice_periodo(self, periodo):
+        return self._indice_periodo[periodo]
+
+    def columna(self, cuenta, periodo):
+        """Vista (n_empresas,) de una cuenta en un período (NaN = no informada)."""
+        return self.valores[:, self._indice_periodo[periodo], INDICE_CUENTA[cuenta]]
+
+    def estado(self, i, periodo):
+        """EstadoPeriodo de la empresa i (lo no informado queda en 0.0)."""
+        return EstadoPeriodo.desde_valores(self.valores[i, self._indice_periodo[periodo]], periodo)
+
+    def completar(self):
+        """Rellena los totales no informados con la suma de sus partes (ver DERIVADAS)."""
+        for total, partes in DERIVADAS:
+            t = self.valores[..., INDICE_CUENTA[total]]
+            suma = np.zeros(t.shape)
+            hay = np.zeros(t.shape, dtype=bool)
+            for p in partes:
+                x = self.valores[..., INDICE_CUENTA[p]]
+                suma += np.nan_to_num(x)
+                hay |= ~np.isnan(x)
+            faltan = np.isnan(t) & hay
+            t[faltan] = suma[faltan]
+        return self
+
+    def columnas(self, esquema=ESQUEMA_FINAL, defectos=None):
+        """
+        {clave de `esquema`: array} con las cuentas informadas en al menos una
+        empresa; en las filas donde falta, defectos.get(clave, 0.0). Con un
+        esquema de un dict por período, {período: {clave: array}}.
+        """
+        defectos = defectos or {}
+        salida = {}
+        for ip, p in enumerate(self.periodos):
+            destino = salida.setdefault(p, {}) if esquema.por_periodo else salida
+            for c in esquema.nombres:
+                col = self.valores[:, ip, INDICE_CUENTA[c]]
+                faltan = np.isnan(col)
+                if faltan.all():
+                    continue
+                clave = esquema.clave(c, p)
+                destino[clave] = np.where(faltan, defectos.get(clave, 0.0), col) if faltan.any() else col
+        return salida
+
+# ======================================================
+# BENCHMARK
+# ======================================================
+
+def benchmark_modelo(n=20000):
+    """
+    n empresas con las claves de Final.py: memoria de la lista de dicts contra
+    TablaEstados y tiempo de calcular_todo_lote armando las columnas con
+    .get por fila contra las columnas de la tabla.
+    """
+    import time
+    import tracemalloc
+    from CalculoFinanciero import DATOS_POR_DEFECTO, calcular_todo_lote
+
+    rnd = np.random.default_rng(0)
+    claves = list(DATOS_POR_DEFECTO)
+
+    tracemalloc.start()
+    filas = [{k: float(v) for k, v in zip(claves, fila)}
+             for fila in rnd.uniform(100, 10000, (n, len(claves))).round(2)]
+    dicts = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    t0 = time.perf_counter()
+    tabla = TablaEstados.desde_filas(filas, ESQUEMA_FINAL)
+    conversion = time.perf_counter() - t0
+    tracemalloc.start()
+    copia = TablaEstados(n, tabla.periodos)
+    copia.valores[...] = tabla.valores
+    arreglo = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    t0 = time.perf_counter()
+    por_dicts = calcular_todo_lote({k: [f.get(k, 0.0) for f in filas] for k in claves})
+    t_dicts = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    por_tabla = calcular_todo_lote(tabla.columnas(ESQUEMA_FINAL, DATOS_POR_DEFECTO))
+    t_tabla = time.perf_counter() - t0
+    for k in por_dicts:
+        assert np.array_equal(por_dicts[k], por_tabla[k], equal_nan=True), k
+
+    print(f"{n} empresas, {len(claves)} claves")
+    print(f"memoria   lista de dicts {dicts / 2**20:8.1f} MB   TablaEstados {arreglo / 2**20:8.1f} MB")
+    print(f"lote      columnas por .get {t_dicts * 1000:8.1f} ms   columnas de la tabla {t_tabla * 1000:8.1f} ms"
+          f"   (conversión única de las filas {conversion * 1000:.1f} ms)")
+    return {"memoria_dicts": dicts, "memoria_tabla": arreglo, "t_dicts": t_dicts, "t_tabla": t_tabla}
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Modelo único de estados financieros.")
+    p.add_argument("--benchmark", type=int, metavar="N", default=20000, help="empresas simuladas")
+    a = p.parse_args()
+    benchmark_modelo(a.benchmark)
@@ -6,25 +6,16 @@ from tkinter import ttk, messagebox, scrolledtext
 
 import math
 import os
+import base64
+import pickle
 import datetime
-import numpy as np
 
 # =============================
-# Matplotlib para gráficos
+# Matplotlib y ReportLab: carga diferida
 # =============================
-import matplotlib
-matplotlib.use("TkAgg")
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-# =============================
-# ReportLab para PDF (CORRECCIÓN: Se añade 'inch')
-# =============================
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch # <-- AGREGADO: Necesario para definir anchos de columna de tabla
+# matplotlib (Graficos.py, backend TkAgg) se importa al dibujar el gráfico de
+# la pestaña D y ReportLab dentro de las funciones del PDF, así la ventana
+# aparece sin esperar a ninguno de los dos (ver MedirArranque.py).
 
 # ======================================================
 # CLASE DE CÁLCULO Y LÓGICA FINANCIERA
@@ -226,6 +217,20 @@ class AnalisisFinanciero:
         self.economico()
         return self.r
 
+# ======================================================
+# CACHÉ DE RESULTADOS
+# ======================================================
+# run_analisis guarda r, los textos A–D y el PNG del gráfico por hash de las
+# entradas (CacheResultados.py); la firma de este archivo y de Graficos.py
+# entra en la clave.
+from CacheResultados import CacheResultados, clave_entradas, firma_codigo
+ESPACIO_CACHE = "Final1|" + firma_codigo(os.path.abspath(__file__),
+                                          os.path.join(os.path.dirname(os.path.abspath(__file__)), "Graficos.py"))
+try:
+    cache_resultados = CacheResultados()
+except OSError:
+    cache_resultados = None   # sin directorio escribible: se calcula siempre
+
 # ======================================================
 # UTILIDAD PARA MANEJO DE INPUTS
 # ======================================================
@@ -259,6 +264,8 @@ def read_all_inputs(form_widgets):
 
 def get_matrix_data_for_table(r):
     """Prepara los datos de la matriz D1 en formato de lista para ReportLab Table."""
+    from reportlab.platypus import Paragraph
+    from reportlab.lib.styles import getSampleStyleSheet
     styles = getSampleStyleSheet()
     
     # Cabecera de la tabla
@@ -290,6 +297,12 @@ def get_matrix_data_for_table(r):
 def generate_pdf(r):
     """Genera un informe PDF con todos los análisis, incluyendo la tabla y el formato."""
     global analisis_A_text, analisis_B_text, analisis_C_text, analisis_D_text
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch # Necesario para definir anchos de columna de tabla
+    from GraficosPDF import dibujo_final1
     
     try:
         # 1. Configuración del documento
@@ -360,6 +373,11 @@ def generate_pdf(r):
                 clean_line = line.replace("✅", "->").replace("⚠️", "->").replace("🌟", "").replace("*", "")
                 story.append(Paragraph(clean_line, styles['Normal']))
 
+        # 4. Anexo gráfico: los paneles de la pestaña D, vectoriales (GraficosPDF.py)
+        story.append(PageBreak())
+        story.append(Paragraph("ANEXO GRÁFICO", styles['Titulo1']))
+        story.append(dibujo_final1(r))
+
         # 5. Generar el PDF
         doc.build(story)
         messagebox.showinfo("Generación de PDF", f"¡Informe '{filename}' generado con éxito!")
@@ -672,8 +690,47 @@ def generar_diagnostico(r):
     outD.insert(tk.END, text)
     analisis_D_text = text # Almacenar para PDF
 
+def mostrar_textos(textos):
+    """Vuelca los textos A–D guardados en caché en las pestañas y en las variables del PDF."""
+    global analisis_A_text, analisis_B_text, analisis_C_text, analisis_D_text
+    for out, t in zip((outA, outB, outC, outD), textos):
+        out.delete("1.0", tk.END)
+        out.insert(tk.END, t)
+    analisis_A_text, analisis_B_text, analisis_C_text, analisis_D_text = textos
+
+def mostrar_grafico_png(png):
+    """Muestra el PNG ya renderizado en la pestaña D sin redibujar la figura."""
+    img = tk.PhotoImage(data=base64.b64encode(png))
+    lbl = ttk.Label(fig_frame, image=img)
+    lbl.image = img # mantener la referencia
+    lbl.pack(fill=tk.BOTH, expand=True)
+
+def agregar_boton_pdf(r):
+    # Eliminar botones viejos si existen para evitar duplicados
+    for w in tabD.winfo_children():
+        if isinstance(w, ttk.Button) and w.cget("text") == "Generar Informe PDF":
+            w.destroy()
+            
+    # Botón de PDF: llama a la función corregida
+    ttk.Button(tabD, text="Generar Informe PDF", 
+               command=lambda: generate_pdf(r)
+              ).pack(side="bottom", pady=10)
+
 def run_analisis(data):
     """Función unificada para calcular y generar todos los análisis."""
+    for w in fig_frame.winfo_children():
+        w.destroy()
+
+    # Mismas entradas que una ejecución anterior: se reutiliza todo desde la caché
+    clave = clave_entradas(data, ESPACIO_CACHE)
+    guardado = cache_resultados.obtener(clave) if cache_resultados else None
+    if guardado is not None:
+        r = guardado["r"]
+        mostrar_textos(guardado["textos"])
+        mostrar_grafico_png(guardado["png"])
+        agregar_boton_pdf(r)
+        return
+
     analizador = AnalisisFinanciero(data)
     r = analizador.calcular_todo()
     
@@ -683,62 +740,29 @@ def run_analisis(data):
     generar_analisis_economico(r, data)
     generar_diagnostico(r)
     
-    # Generar gráficos en la pestaña D (Mejora C)
-    for w in fig_frame.winfo_children():
-        w.destroy()
-
-    fig = Figure(figsize=(7, 6))
-    
-    # Subplot 1: Composición de la Estructura (Activo 2024)
-    ax1 = fig.add_subplot(221)
-    labels_a = ['Activo Corriente', 'Activo No Corriente']
-    sizes_a = [r['vertical_AC'], r['vertical_ANC']]
-    ax1.pie(sizes_a, labels=labels_a, autopct='%1.1f%%', startangle=90)
-    ax1.set_title('Estructura del Activo 2024', fontsize=10)
-    
-    # Subplot 2: Evolución de Ratios (LG, RAT)
-    ax2 = fig.add_subplot(222)
-    labels_r = ['2023', '2024']
-    lg_vals = [r['LG_2023'], r['LG_2024']]
-    rat_vals = [r['RAT_2023']/100, r['RAT_2024']/100] # Dividido por 100 para escala
-    x = np.arange(len(labels_r))
-    width = 0.35
+    # Generar gráficos en la pestaña D (Mejora C): figura compartida en Graficos.py
+    from Graficos import renderizar, canvas_tk
+    grafico = renderizar("final1", r)
     
-    rects1 = ax2.bar(x - width/2, lg_vals, width, label='Liq. General')
-    rects2 = ax2.bar(x + width/2, rat_vals, width, label='RAT (ROA)')
-    
-    ax2.set_ylabel('Ratio/Rentabilidad')
-    ax2.set_title('Evolución de Ratios Clave', fontsize=10)
-    ax2.set_xticks(x)
-    ax2.set_xticklabels(labels_r)
-    ax2.legend(fontsize=8)
-    
-    # Subplot 3: Descomposición DuPont (RRP)
-    ax3 = fig.add_subplot(212)
-    labels_d = ['Margen Neto', 'Rotación Activo', 'Apalancamiento']
-    dupont_vals = [r['margen_neto_dupont'], r['rotacion_activo'], r['apalancamiento_dupont']]
-    ax3.bar(labels_d, dupont_vals)
-    ax3.set_title('Componentes DuPont RRP 2024', fontsize=10)
-    
-    fig.tight_layout(pad=3.0) # Asegura que los gráficos no se superpongan
-    
-    canvas = FigureCanvasTkAgg(fig, master=fig_frame)
+    canvas = canvas_tk(grafico.fig, fig_frame)
     canvas_widget = canvas.get_tk_widget()
     canvas_widget.pack(fill=tk.BOTH, expand=True)
     canvas.draw()
+
+    # Guardar en caché (PNG a la resolución de pantalla de la figura)
+    if cache_resultados:
+        try:
+            cache_resultados.guardar(clave, {
+                "r": r,
+                "textos": (analisis_A_text, analisis_B_text, analisis_C_text, analisis_D_text),
+                "png": grafico.png()})
+        except (OSError, pickle.PicklingError) as e:
+            print(f"No se pudo guardar el análisis en la caché: {e}")
     
     # ------------------------------------------------------------------
     # Botón para generar PDF (Se crea dinámicamente aquí)
     # ------------------------------------------------------------------
-    # Eliminar botones viejos si existen para evitar duplicados
-    for w in tabD.winfo_children():
-        if isinstance(w, ttk.Button) and w.cget("text") == "Generar Informe PDF":
-            w.destroy()
-            
-    # Botón de PDF: llama a la función corregida
-    ttk.Button(tabD, text="Generar Informe PDF", 
-               command=lambda: generate_pdf(r)
-              ).pack(side="bottom", pady=10)
+    agregar_boton_pdf(r)
 
 # Botón principal para ejecutar el análisis (SIN CAMBIOS)
 button_analyze = ttk.Button(tab_inputs, text="Ejecutar Análisis y Generar Reporte", 
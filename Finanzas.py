@@ -1,8 +1,19 @@
-import math
+from MotorInteres import resolver, MOTIVOS, TablaTramos, interes_por_tramos
+from ConteoDias import CONVENCIONES, DIAS_COMERCIALES, dias_comerciales, fraccion_año
+
+# Las fórmulas están en MotorInteres.py (el mismo motor que calcula lotes de
+# contratos); si un caso no tiene solución se informa el motivo.
+def calcular(tipo, incognita, **datos):
+    valor, motivo = resolver(tipo, incognita, **datos).escalar()
+    if valor is None:
+        print(f"No puede calcularse {incognita}: {MOTIVOS[motivo].lower()}.")
+    return valor
 
 # ---------------- FUNCION PARA LEER TIEMPO ----------------
 def leer_tiempo():
     print("\n--- INGRESO DE TIEMPO ---")
+    if input("¿Ingresar fechas de inicio y fin? (s/n): ").strip().lower().startswith("s"):
+        return leer_fechas()
     años = int(input("Años: "))
     #semestres = int(input("Semestres: "))
     #cuatrimestres = int(input("Cuatrimestres: "))
@@ -13,21 +24,21 @@ def leer_tiempo():
     dias = int(input("Días: "))
 
     # Conversión a días (año comercial: 360 días)
-    total_dias = (
-        (años * 360) +
-        #(semestres * 180) +
-        #(cuatrimestres * 120) +
-        #(bimestres * 60) +
-        #(trimestres * 90) +
-        (meses * 30) +
-        (semanas * 7) +
-        dias
-    )
+    total_dias = dias_comerciales(años, meses, semanas, dias)
 
     tiempo_en_años = total_dias / 360
     print(f"Tiempo total convertido: {tiempo_en_años:.4f} años ({total_dias} días comerciales)")
     return tiempo_en_años
 
+def leer_fechas():
+    """Fracción de año entre dos fechas según la convención elegida (ConteoDias.py)."""
+    inicio = input("Fecha inicial (AAAA-MM-DD o DD/MM/AAAA): ")
+    fin = input("Fecha final: ")
+    convencion = input(f"Convención ({', '.join(CONVENCIONES)}) [30/360]: ").strip().upper() or "30/360"
+    tiempo_en_años = float(fraccion_año(inicio, fin, convencion))
+    print(f"Tiempo total convertido: {tiempo_en_años:.4f} años ({convencion})")
+    return tiempo_en_años
+
 # ----------------- INTERÉS SIMPLE -----------------
 def interes_simple_general():
     print("\n--- INTERÉS SIMPLE GENERAL ---")
@@ -42,53 +53,72 @@ def interes_simple_general():
         VP = float(input("Capital (VP o Principal): "))
         i = float(input("Tasa de interés (ej. 0.24 para 24% anual): "))
         t = leer_tiempo()
-        VF = VP * (1 + i * t)
-        print(f"Valor Futuro (Monto acumulado): {VF:.2f}")
-        print(f"Interpretación: Si inviertes {VP}, en {t:.2f} años tendrás {VF:.2f}.")
+        VF = calcular("Interés Simple", "VF", VP=VP, i=i, t=t)
+        if VF is not None:
+            print(f"Valor Futuro (Monto acumulado): {VF:.2f}")
+            print(f"Interpretación: Si inviertes {VP}, en {t:.2f} años tendrás {VF:.2f}.")
 
     elif opcion == 2:  # VP = VF / (1 + i*t)
         VF = float(input("Valor Futuro (VF o Monto): "))
         i = float(input("Tasa de interés: "))
         t = leer_tiempo()
-        VP = VF / (1 + i * t)
-        print(f"Valor Presente (Capital): {VP:.2f}")
+        VP = calcular("Interés Simple", "VP", VF=VF, i=i, t=t)
+        if VP is not None:
+            print(f"Valor Presente (Capital): {VP:.2f}")
 
     elif opcion == 3:  # I = VP * i * t
         VP = float(input("Capital (VP): "))
         i = float(input("Tasa de interés: "))
         t = leer_tiempo()
-        I = VP * i * t
-        print(f"Interés generado: {I:.2f}")
+        I = calcular("Interés Simple", "I", VP=VP, i=i, t=t)
+        if I is not None:
+            print(f"Interés generado: {I:.2f}")
 
     elif opcion == 4:  # i = I / (VP*t)
         I = float(input("Interés generado: "))
         VP = float(input("Capital (VP): "))
         t = leer_tiempo()
-        i = I / (VP * t)
-        print(f"Tasa de interés: {i:.4f} ({i*100:.2f}%)")
+        i = calcular("Interés Simple", "i", I=I, VP=VP, t=t)
+        if i is not None:
+            print(f"Tasa de interés: {i:.4f} ({i*100:.2f}%)")
 
     elif opcion == 5:  # n = I / (VP*i)
         I = float(input("Interés generado: "))
         VP = float(input("Capital: "))
         i = float(input("Tasa de interés: "))
-        t = I / (VP * i)
-        print(f"Tiempo: {t:.2f} años")
+        t = calcular("Interés Simple", "t", I=I, VP=VP, i=i)
+        if t is not None:
+            print(f"Tiempo: {t:.2f} años")
 
 # ----------------- INTERÉS SIMPLE CON VARIACIONES -----------------
 def interes_simple_variado():
     print("\n--- INTERÉS SIMPLE CON VARIACIONES DE TASA ---")
     capital = float(input("Capital inicial: "))
     tramos = int(input("¿Cuántos tramos de tasa hay?: "))
-    interes_total = 0
+    tasas, dias, años = [], [], []
 
     for t in range(tramos):
         tasa = float(input(f"Tasa del tramo {t+1} (ej. 0.03 para 3% mensual, 0.24 para 24% anual): "))
+        unidad = input("Unidad de tiempo (años, meses, semanas, días, o fechas con tasa anual): ").strip().lower()
+        if unidad == "fechas":
+            tasas.append(tasa)
+            años.append(leer_fechas())
+            dias.append(años[-1] * 360)
+            continue
         tiempo = float(input(f"Tiempo del tramo {t+1}: "))
-        unidad = input("Unidad de tiempo (años, meses, días): ")
-        tiempo_conv = leer_tiempo
-        interes = capital * tasa * tiempo_conv
-        interes_total += interes
+        # la tasa es por unidad de tiempo: se pasa a días comerciales y a tasa anual
+        dias_unidad = DIAS_COMERCIALES.get(unidad)
+        if dias_unidad is None:
+            print(f"Unidad no reconocida: {unidad!r}.")
+            return
+        tasas.append(tasa * 360 / dias_unidad)
+        dias.append(tiempo * dias_unidad)
+        años.append(dias[-1] / 360)
+
+    r = interes_por_tramos(capital, TablaTramos([0, tramos], tasas, dias, años))
+    for t, interes in enumerate(r.interes_tramos):
         print(f"→ Tramo {t+1}: interés generado = {interes:.2f}")
+    interes_total = r.interes[0]
 
     print(f"Interés acumulado total = {interes_total:.2f}")
     print(f"Interpretación: Con {tramos} variaciones de tasa, el capital generó {interes_total:.2f}.")
@@ -100,32 +130,61 @@ def interes_compuesto_general():
     print("2. Valor Presente (VP)")
     print("3. Tasa de Interés (i)")
     print("4. Tiempo (n)")
+    print("5. Tasa con varios flujos (TIR)")
     opcion = int(input("Elija una opción: "))
 
     if opcion == 1:
         VP = float(input("Capital (VP): "))
         i = float(input("Tasa de interés: "))
         t = leer_tiempo()
-        VF = VP * (1 + i) ** t
-        print(f"Valor Futuro: {VF:.2f}")
+        VF = calcular("Interés Compuesto", "VF", VP=VP, i=i, t=t)
+        if VF is not None:
+            print(f"Valor Futuro: {VF:.2f}")
     elif opcion == 2:
         VF = float(input("Valor Futuro (VF): "))
         i = float(input("Tasa de interés: "))
         t = leer_tiempo()
-        VP = VF / (1 + i) ** t
-        print(f"Valor Presente: {VP:.2f}")
+        VP = calcular("Interés Compuesto", "VP", VF=VF, i=i, t=t)
+        if VP is not None:
+            print(f"Valor Presente: {VP:.2f}")
     elif opcion == 3:
         VF = float(input("Valor Futuro: "))
         VP = float(input("Valor Presente: "))
         t = leer_tiempo()
-        i = (VF / VP) ** (1/t) - 1
-        print(f"Tasa de interés: {i*100:.2f}%")
+        i = calcular("Interés Compuesto", "i", VF=VF, VP=VP, t=t)
+        if i is not None:
+            print(f"Tasa de interés: {i*100:.2f}%")
     elif opcion == 4:
         VF = float(input("Valor Futuro: "))
         VP = float(input("Valor Presente: "))
         i = float(input("Tasa de interés: "))
-        n = math.log(VF / VP) / math.log(1 + i)
-        print(f"Tiempo: {n:.2f} años")
+        n = calcular("Interés Compuesto", "t", VF=VF, VP=VP, i=i)
+        if n is not None:
+            print(f"Tiempo: {n:.2f} años")
+    elif opcion == 5:
+        from TasaInterna import tir
+        texto = input("Flujos por período separados por comas, desde el período 0 (ej. -1000, 300, 400, 500): ")
+        valor, motivo = tir([float(x) for x in texto.split(",")]).escalar()
+        if valor is None:
+            print(f"No puede calcularse la TIR: {MOTIVOS[motivo].lower()}.")
+        else:
+            print(f"TIR: {valor*100:.4f}% por período")
+
+# ----------------- TABLA DE AMORTIZACIÓN -----------------
+def tabla_amortizacion():
+    from Amortizacion import amortizar, imprimir_tabla
+    print("\n--- TABLA DE AMORTIZACIÓN ---")
+    print("1. Francés (cuota constante)")
+    print("2. Alemán (amortización constante)")
+    print("3. Americano (capital al final)")
+    sistema = {1: "frances", 2: "aleman", 3: "americano"}.get(int(input("Elija un sistema: ")))
+    if sistema is None:
+        print("Opción inválida.")
+        return
+    VP = float(input("Capital (VP o Principal): "))
+    i = float(input("Tasa de interés por período (ej. 0.02 para 2% mensual): "))
+    n = int(input("Número de períodos (cuotas): "))
+    imprimir_tabla(amortizar(VP, i, n, sistema))
 
 # ----------------- MENÚ PRINCIPAL -----------------
 def main():
@@ -134,7 +193,8 @@ def main():
         print("1. Interés Simple (básico)")
         print("2. Interés Simple con variaciones de tasa")
         print("3. Interés Compuesto")
-        print("4. Salir")
+        print("4. Tabla de amortización")
+        print("5. Salir")
         opcion = int(input("Seleccione una opción: "))
 
         if opcion == 1:
@@ -144,6 +204,8 @@ def main():
         elif opcion == 3:
             interes_compuesto_general()
         elif opcion == 4:
+            tabla_amortizacion()
+        elif opcion == 5:
             print("Saliendo... ¡Hasta luego!")
             break
         else:
@@ -2,6 +2,7 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import math
+from RegistroRatios import construir_registro, interpretar_lote
 
 # ----------------- UTILIDADES -----------------
 def safe_float(s):
@@ -81,110 +82,76 @@ HELP_TEXT = {
 }
 
 # ----------------- CÁLCULOS RATIOS -----------------
+# Registro declarativo (RegistroRatios.py): búsqueda O(1) por nombre y
+# explicación construida solo cuando se necesita.
+REGISTRO_RATIOS = construir_registro(FIELDS_FOR_RATIO)
+
+def evaluar_ratio(name, values):
+    # solo el valor numérico (sin armar la explicación)
+    spec = REGISTRO_RATIOS.get(name)
+    return spec.evaluar(values) if spec else float('nan')
+
 def compute_ratio(name, values):
     # values: dict field->float
-    if name == "Razón corriente":
-        v = safe_div(values.get("Activo corriente",0), values.get("Pasivo corriente",0))
-        exp = f"{fmt_num(values.get('Activo corriente',0))} / {fmt_num(values.get('Pasivo corriente',0))} = {fmt_num(v)}"
-        return v, exp
-    if name == "Prueba ácida":
-        v = safe_div(values.get("Activo corriente",0) - values.get("Inventario promedio",0), values.get("Pasivo corriente",0))
-        exp = f"({fmt_num(values.get('Activo corriente',0))} - {fmt_num(values.get('Inventario promedio',0))}) / {fmt_num(values.get('Pasivo corriente',0))} = {fmt_num(v)}"
-        return v, exp
-    if name == "Capital de trabajo":
-        v = values.get("Activo corriente",0) - values.get("Pasivo corriente",0)
-        exp = f"{fmt_num(values.get('Activo corriente',0))} - {fmt_num(values.get('Pasivo corriente',0))} = {fmt_num(v)}"
-        return v, exp
-    if name == "Rotación inventarios":
-        v = safe_div(values.get("Costo de ventas",0), values.get("Inventario promedio",0))
-        exp = f"{fmt_num(values.get('Costo de ventas',0))} / {fmt_num(values.get('Inventario promedio',0))} = {fmt_num(v)} vueltas/año"
-        return v, exp
-    if name == "Período promedio de inventarios":
-        rot = safe_div(values.get("Costo de ventas",0), values.get("Inventario promedio",0))
-        v = safe_div(360, rot) if rot and rot != 0 else float('nan')
-        exp = f"360 / {fmt_num(rot)} = {fmt_num(v)} días"
-        return v, exp
-    if name == "Rotación CxC":
-        v = safe_div(values.get("Ventas netas",0), values.get("Cuentas por cobrar promedio",0))
-        exp = f"{fmt_num(values.get('Ventas netas',0))} / {fmt_num(values.get('Cuentas por cobrar promedio',0))} = {fmt_num(v)}"
-        return v, exp
-    if name == "Período promedio de cobro":
-        rot = safe_div(values.get("Ventas netas",0), values.get("Cuentas por cobrar promedio",0))
-        v = safe_div(360, rot) if rot and rot != 0 else float('nan')
-        exp = f"360 / {fmt_num(rot)} = {fmt_num(v)} días"
-        return v, exp
-    if name == "Rotación activos":
-        v = safe_div(values.get("Ventas netas",0), values.get("Activo total",0))
-        exp = f"{fmt_num(values.get('Ventas netas',0))} / {fmt_num(values.get('Activo total',0))} = {fmt_num(v)}"
-        return v, exp
-    if name == "Pasivo/Activo":
-        v = safe_div(values.get("Pasivo total",0), values.get("Activo total",0))
-        exp = f"{fmt_num(values.get('Pasivo total',0))} / {fmt_num(values.get('Activo total',0))} = {fmt_pct(v)}"
-        return v, exp
-    if name == "Deuda/Patrimonio":
-        v = safe_div(values.get("Pasivo total",0), values.get("Patrimonio",0))
-        exp = f"{fmt_num(values.get('Pasivo total',0))} / {fmt_num(values.get('Patrimonio',0))} = {fmt_num(v)}"
-        return v, exp
-    if name == "Cobertura intereses":
-        v = safe_div(values.get("UAII",0), values.get("Gastos por intereses",0))
-        exp = f"{fmt_num(values.get('UAII',0))} / {fmt_num(values.get('Gastos por intereses',0))} = {fmt_num(v)}"
-        return v, exp
-    if name == "Margen neto":
-        v = safe_div(values.get("Utilidad neta",0), values.get("Ventas netas",0))
-        exp = f"{fmt_num(values.get('Utilidad neta',0))} / {fmt_num(values.get('Ventas netas',0))} = {fmt_pct(v)}"
-        return v, exp
-    if name == "ROA":
-        v = safe_div(values.get("Utilidad neta",0), values.get("Activo total",0))
-        exp = f"{fmt_num(values.get('Utilidad neta',0))} / {fmt_num(values.get('Activo total',0))} = {fmt_pct(v)}"
-        return v, exp
-    if name == "ROE":
-        v = safe_div(values.get("Utilidad neta",0), values.get("Patrimonio",0))
-        exp = f"{fmt_num(values.get('Utilidad neta',0))} / {fmt_num(values.get('Patrimonio',0))} = {fmt_pct(v)}"
-        return v, exp
-    return float('nan'), "Ratio no implementado"
+    spec = REGISTRO_RATIOS.get(name)
+    if spec is None:
+        return float('nan'), "Ratio no implementado"
+    v = spec.evaluar(values)
+    return v, spec.explicar(values, v)
+
+# Interpretations (heuristic, based on your documents)
+# Una etiqueta por categoría, de la más baja a la más alta según los cortes de
+# RegistroRatios.py; la última es la de NaN (código -1).
+NO_DISPONIBLE = "No disponible"
+INTERPRETACIONES = {
+    "Razón corriente": (
+        "Insuficiente: riesgo de iliquidez a corto plazo.",
+        "Aceptable.",
+        "Alta liquidez; posible uso ineficiente de recursos.",
+        NO_DISPONIBLE,
+    ),
+    "Prueba ácida": (
+        "Riesgo: depende del inventario.",
+        "Buena liquidez sin depender del inventario.",
+        NO_DISPONIBLE,
+    ),
+    "Capital de trabajo": ("Negativo: riesgo operativo.", "Positivo", NO_DISPONIBLE),
+    "Rotación inventarios": (
+        "Rotación baja: exceso de inventario.",
+        "Rotación adecuada.",
+        "Rotación alta.",
+        NO_DISPONIBLE,
+    ),
+    "Período promedio de inventarios": ("Gestión adecuada.", "Inventarios lentos.", NO_DISPONIBLE),
+    "Rotación CxC": ("Cobranza lenta.", "Cobranza eficiente.", NO_DISPONIBLE),
+    "Período promedio de cobro": (
+        "Período saludable.",
+        "Cobro lento; revisar políticas de crédito.",
+        NO_DISPONIBLE,
+    ),
+    "Rotación activos": ("Activos infrautilizados.", "Activos bien aprovechados.", NO_DISPONIBLE),
+    "Pasivo/Activo": (
+        "Bajo endeudamiento.",
+        "Endeudamiento moderado.",
+        "Alto endeudamiento.",
+        NO_DISPONIBLE,
+    ),
+    "Deuda/Patrimonio": ("Estructura equilibrada.", "Riesgo alto si >1.", NO_DISPONIBLE),
+    "Cobertura intereses": ("Cobertura insuficiente.", "Adecuada", NO_DISPONIBLE),
+    "Margen neto": ("Margen bajo.", "Margen adecuado.", "Margen alto.", NO_DISPONIBLE),
+    "ROA": ("ROA bajo.", "ROA aceptable.", NO_DISPONIBLE),
+    "ROE": ("ROE bajo.", "ROE adecuado.", "ROE alto.", NO_DISPONIBLE),
+}
 
 def interpret_ratio(name, value):
-    # Interpretations (heuristic, based on your documents)
-    if value != value: return "No disponible"
-    if name == "Razón corriente":
-        if value < 1: return "Insuficiente: riesgo de iliquidez a corto plazo."
-        if value <= 2: return "Aceptable."
-        return "Alta liquidez; posible uso ineficiente de recursos."
-    if name == "Prueba ácida":
-        return "Buena liquidez sin depender del inventario." if value >= 1 else "Riesgo: depende del inventario."
-    if name == "Capital de trabajo":
-        return "Positivo" if value >= 0 else "Negativo: riesgo operativo."
-    if name == "Rotación inventarios":
-        if value < 3: return "Rotación baja: exceso de inventario."
-        if value <= 6: return "Rotación adecuada."
-        return "Rotación alta."
-    if name == "Período promedio de inventarios":
-        return "Gestión adecuada." if value <= 120 else "Inventarios lentos."
-    if name == "Rotación CxC":
-        return "Cobranza eficiente." if value >= 4 else "Cobranza lenta."
-    if name == "Período promedio de cobro":
-        return "Período saludable." if value <= 90 else "Cobro lento; revisar políticas de crédito."
-    if name == "Rotación activos":
-        return "Activos bien aprovechados." if value >= 1 else "Activos infrautilizados."
-    if name == "Pasivo/Activo":
-        if value > 0.6: return "Alto endeudamiento."
-        if value >= 0.4: return "Endeudamiento moderado."
-        return "Bajo endeudamiento."
-    if name == "Deuda/Patrimonio":
-        return "Riesgo alto si >1." if value > 1 else "Estructura equilibrada."
-    if name == "Cobertura intereses":
-        return "Adecuada" if value >= 2 else "Cobertura insuficiente."
-    if name == "Margen neto":
-        if value < 0.05: return "Margen bajo."
-        if value <= 0.15: return "Margen adecuado."
-        return "Margen alto."
-    if name == "ROA":
-        return "ROA aceptable." if value >= 0.05 else "ROA bajo."
-    if name == "ROE":
-        if value < 0.10: return "ROE bajo."
-        if value <= 0.20: return "ROE adecuado."
-        return "ROE alto."
-    return "Sin interpretación definida."
+    if value != value: return NO_DISPONIBLE
+    spec = REGISTRO_RATIOS.get(name)
+    if spec is None: return "Sin interpretación definida."
+    return INTERPRETACIONES[name][spec.clasificar(value)]
+
+def interpret_ratio_lote(name, values):
+    # códigos por numpy.searchsorted + tabla de etiquetas: tabla[codigo] es la interpretación
+    return interpretar_lote(REGISTRO_RATIOS, INTERPRETACIONES, name, values)
 
 # ----------------- DUPONT / ANALYSIS FUNCTIONS -----------------
 def calcular_ratios_y_dupont_from_inputs(current, prior, bg_current, bg_prior, er_current, er_prior):
@@ -0,0 +1,176 @@
+# ======================================================
+# GRÁFICOS DE LOS INFORMES (en memoria)
+# ======================================================
+# Un único lugar para las figuras de Final.py, Final1.py y prueba.py.
+# La figura se construye una vez por resultado y GraficoMemoria guarda cada
+# render (PNG a un dpi dado, SVG o PDF) como bytes: la pestaña de Tk dibuja la
+# misma Figure y el PDF recibe los bytes ya generados, sin pasar por disco
+# (antes grafico_temp.png) ni volver a rasterizar en cada informe.
+# Las ventanas importan este módulo dentro de la función que dibuja, para no
+# cargar matplotlib antes de mostrar la ventana.
+import io
+from collections import OrderedDict
+
+import numpy as np
+from matplotlib.figure import Figure
+
+# ======================================================
+# FIGURAS
+# ======================================================
+
+def figura_final(r):
+    """Final.py: 2x2 (estructura, rentabilidad, liquidez, garantía)."""
+    fig = Figure(figsize=(6, 5), dpi=100)
+    fig.patch.set_facecolor('#F0F0F0')
+
+    # 1. Pastel Estructura
+    ax1 = fig.add_subplot(221)
+    ax1.pie([r['vertical_AC'], r['vertical_ANC']], labels=['Corr.', 'No Corr.'], autopct='%1.0f%%', colors=['#3498DB', '#95A5A6'])
+    ax1.set_title('Activo 2024', fontsize=8)
+
+    # 2. Barras Rentabilidad
+    ax2 = fig.add_subplot(222)
+    ax2.bar(['RAT', 'ROE'], [r['RAT_2024'], r['RRP_2024']], color=['#2ECC71', '#E67E22'])
+    ax2.set_title('Rentabilidad %', fontsize=8)
+
+    # 3. Liquidez Gauge (simulado barra)
+    ax3 = fig.add_subplot(223)
+    ax3.barh(['Liq.', 'Opt.'], [r['LG_2024'], 2.0], color=['#9B59B6', '#BDC3C7'])
+    ax3.set_title('Liquidez', fontsize=8)
+
+    # 4. Solvencia
+    ax4 = fig.add_subplot(224)
+    ax4.bar(['Gar.'], [r['garantia_2024']], color='#34495E')
+    ax4.axhline(1.5, color='red', ls='--', lw=1)
+    ax4.set_title('Garantía', fontsize=8)
+
+    fig.tight_layout()
+    return fig
+
+def figura_final1(r):
+    """Final1.py: estructura del activo, evolución LG/RAT y componentes DuPont."""
+    fig = Figure(figsize=(7, 6))
+
+    # Subplot 1: Composición de la Estructura (Activo 2024)
+    ax1 = fig.add_subplot(221)
+    labels_a = ['Activo Corriente', 'Activo No Corriente']
+    sizes_a = [r['vertical_AC'], r['vertical_ANC']]
+    ax1.pie(sizes_a, labels=labels_a, autopct='%1.1f%%', startangle=90)
+    ax1.set_title('Estructura del Activo 2024', fontsize=10)
+
+    # Subplot 2: Evolución de Ratios (LG, RAT)
+    ax2 = fig.add_subplot(222)
+    labels_r = ['2023', '2024']
+    lg_vals = [r['LG_2023'], r['LG_2024']]
+    rat_vals = [r['RAT_2023']/100, r['RAT_2024']/100] # Dividido por 100 para escala
+    x = np.arange(len(labels_r))
+    width = 0.35
+
+    ax2.bar(x - width/2, lg_vals, width, label='Liq. General')
+    ax2.bar(x + width/2, rat_vals, width, label='RAT (ROA)')
+
+    ax2.set_ylabel('Ratio/Rentabilidad')
+    ax2.set_title('Evolución de Ratios Clave', fontsize=10)
+    ax2.set_xticks(x)
+    ax2.set_xticklabels(labels_r)
+    ax2.legend(fontsize=8)
+
+    # Subplot 3: Descomposición DuPont (RRP)
+    ax3 = fig.add_subplot(212)
+    labels_d = ['Margen Neto', 'Rotación Activo', 'Apalancamiento']
+    dupont_vals = [r['margen_neto_dupont'], r['rotacion_activo'], r['apalancamiento_dupont']]
+    ax3.bar(labels_d, dupont_vals)
+    ax3.set_title('Componentes DuPont RRP 2024', fontsize=10)
+
+    fig.tight_layout(pad=3.0) # Asegura que los gráficos no se superpongan
+    return fig
+
+def figura_prueba(r):
+    """prueba.py: indicadores clave 2024 (pestaña D y PDF)."""
+    fig = Figure(figsize=(5, 4))
+    ax = fig.add_subplot(111)
+
+    ratios = ["FM (Bs)", "Liq. Gral", "RAT (%)", "RRP (%)"]
+    valores_2024 = [r["FM_2024"], r["LG_2024"], r["RAT_2024"], r["RRP_2024"]]
+
+    ax.bar(ratios, valores_2024, color=['#1f77b4', '#ff7f0e', '#2ca02c', '#9467bd'])
+    ax.set_title("Indicadores Clave 2024", fontsize=10)
+    return fig
+
+FIGURAS = {
+    "final": figura_final,
+    "final1": figura_final1,
+    "prueba": figura_prueba,
+}
+
+# ======================================================
+# RENDER EN MEMORIA
+# ======================================================
+
+class GraficoMemoria:
+    """
+    Una Figure y sus renders como bytes, calculados una sola vez por
+    (formato, dpi, recorte). dpi=None usa el dpi con que se creó la figura,
+    aunque luego un canvas de Tk lo cambie.
+    """
+    def __init__(self, fig):
+        self.fig = fig
+        self.dpi = fig.dpi
+        self._renders = {}
+
+    def bytes(self, formato="png", dpi=None, ajustado=False):
+        clave = (formato, dpi or self.dpi, ajustado)
+        if clave not in self._renders:
+            buf = io.BytesIO()
+            opciones = {"format": formato, "dpi": clave[1]}
+            if ajustado:
+                opciones["bbox_inches"] = "tight"
+            self.fig.savefig(buf, **opciones)
+            self._renders[clave] = buf.getvalue()
+        return self._renders[clave]
+
+    def png(self, dpi=None, ajustado=False):
+        return self.bytes("png", dpi, ajustado)
+
+    def svg(self, ajustado=False):
+        return self.bytes("svg", None, ajustado)
+
+    def pdf(self, ajustado=False):
+        return self.bytes("pdf", None, ajustado)
+
+    def imagen_pdf(self, ancho, alto, dpi=None, ajustado=False):
+        """Flowable Image de ReportLab leyendo el PNG desde memoria."""
+        from reportlab.platypus import Image
+        return Image(io.BytesIO(self.png(dpi, ajustado)), width=ancho, height=alto)
+
+def canvas_tk(fig, master):
+    """
+    FigureCanvasTkAgg para mostrar `fig` en un widget de Tk. El backend TkAgg
+    se importa recién aquí, con el primer gráfico, y no al abrir la ventana.
+    """
+    import matplotlib
+    matplotlib.use("TkAgg")
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    return FigureCanvasTkAgg(fig, master=master)
+
+# Últimos gráficos por (tipo, resultados): la pestaña y el PDF del mismo
+# análisis comparten figura y bytes.
+_RECIENTES = OrderedDict()
+MAX_RECIENTES = 8
+
+def renderizar(tipo, r):
+    """GraficoMemoria del tipo pedido ("final", "final1", "prueba") para el dict r."""
+    try:
+        clave = (tipo, tuple(sorted(r.items())))
+        hash(clave)
+    except TypeError:
+        return GraficoMemoria(FIGURAS[tipo](r))
+    grafico = _RECIENTES.get(clave)
+    if grafico is None:
+        grafico = GraficoMemoria(FIGURAS[tipo](r))
+        _RECIENTES[clave] = grafico
+        if len(_RECIENTES) > MAX_RECIENTES:
+            _RECIENTES.popitem(last=False)
+    else:
+        _RECIENTES.move_to_end(clave)
+    return grafico
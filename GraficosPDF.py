@@ -0,0 +1,209 @@
+# ======================================================
+# GRÁFICOS VECTORIALES PARA EL PDF (reportlab.graphics)
+# ======================================================
+# Las mismas figuras de Graficos.py dibujadas con primitivas de ReportLab:
+# el anexo del PDF queda como vectores (texto seleccionable, nítido a
+# cualquier zoom) en lugar de un PNG de 300 dpi, y no hace falta importar ni
+# rasterizar con matplotlib. Un Drawing es un Flowable: se agrega tal cual a
+# la Story.
+#
+#   python GraficosPDF.py --benchmark 10    (tamaño y tiempo: PNG vs vectorial)
+import math
+
+from reportlab.graphics.shapes import Drawing, String, Line
+from reportlab.graphics.charts.piecharts import Pie
+from reportlab.graphics.charts.barcharts import VerticalBarChart, HorizontalBarChart
+from reportlab.graphics.charts.legends import Legend
+from reportlab.lib.colors import HexColor
+from reportlab.lib.units import inch
+
+# Colores por defecto de matplotlib (ciclo "tab10"), para las figuras sin colores propios
+C_MPL = [HexColor("#1f77b4"), HexColor("#ff7f0e"), HexColor("#2ca02c"), HexColor("#d62728")]
+C_TEXTO = HexColor("#262626")
+
+# ======================================================
+# PIEZAS
+# ======================================================
+
+def _finito(v):
+    try:
+        v = float(v)
+    except (TypeError, ValueError):
+        return 0.0
+    return v if math.isfinite(v) else 0.0
+
+def _titulo(d, x, y, w, h, texto, tam=8):
+    d.add(String(x + w / 2, y + h - tam, texto, fontName="Helvetica", fontSize=tam,
+                 fillColor=C_TEXTO, textAnchor="middle"))
+
+def _torta(d, x, y, w, h, valores, etiquetas, colores, decimales=0, angulo=90):
+    """Torta con etiquetas 'nombre NN%'. Valores negativos o todo cero: aviso en texto."""
+    valores = [max(_finito(v), 0.0) for v in valores]
+    total = sum(valores)
+    if total <= 0:
+        d.add(String(x + w / 2, y + h / 2, "Sin datos", fontName="Helvetica", fontSize=7,
+                     fillColor=C_TEXTO, textAnchor="middle"))
+        return
+    lado = min(w, h) * 0.62
+    p = Pie()
+    p.x, p.y = x + (w - lado) / 2, y + (h - lado) / 2 - 4
+    p.width = p.height = lado
+    p.data = valores
+    p.labels = [f"{e} {v / total * 100:.{decimales}f}%" for e, v in zip(etiquetas, valores)]
+    p.startAngle = angulo
+    p.direction = "anticlockwise"
+    p.simpleLabels = 1
+    p.slices.strokeWidth = 0.5
+    p.slices.strokeColor = HexColor("#FFFFFF")
+    p.slices.fontName = "Helvetica"
+    p.slices.fontSize = 6
+    p.slices.fontColor = C_TEXTO
+    p.slices.labelRadius = 1.15
+    for i, c in enumerate(colores):
+        p.slices[i].fillColor = c
+    d.add(p)
+
+def _barras(d, x, y, w, h, categorias, series, colores, horizontal=False, por_barra=False,
+            referencia=None, nombres=None):
+    """
+    Barras verticales u horizontales. series: lista de listas (una por serie).
+    por_barra=True colorea cada barra de la única serie con colores[i].
+    referencia: valor de una línea discontinua roja (como axhline).
+    """
+    series = [[_finito(v) for v in s] for s in series]
+    minimo = min([0.0] + [v for s in series for v in s])
+    maximo = max([0.0] + [v for s in series for v in s] + ([referencia] if referencia is not None else []))
+    if maximo <= minimo:
+        maximo = minimo + 1.0
+
+    c = HorizontalBarChart() if horizontal else VerticalBarChart()
+    margen_izq = 34 if horizontal else 26
+    c.x, c.y = x + margen_izq, y + 16
+    c.width, c.height = w - margen_izq - 8, h - 16 - 18 - (10 if nombres else 0)
+    c.data = series
+    c.categoryAxis.categoryNames = list(categorias)
+    c.categoryAxis.labels.fontName = c.valueAxis.labels.fontName = "Helvetica"
+    c.categoryAxis.labels.fontSize = c.valueAxis.labels.fontSize = 6
+    c.categoryAxis.strokeColor = c.valueAxis.strokeColor = C_TEXTO
+    c.valueAxis.valueMin = minimo
+    c.valueAxis.valueMax = maximo * 1.05 if maximo > 0 else maximo
+    c.valueAxis.visibleGrid = 0
+    c.barSpacing = 1
+    c.groupSpacing = 6
+    c.bars.strokeWidth = 0
+    if por_barra:
+        for i, col in enumerate(colores):
+            c.bars[(0, i)].fillColor = col
+    else:
+        for i, col in enumerate(colores):
+            c.bars[i].fillColor = col
+    d.add(c)
+
+    if referencia is not None and not horizontal:
+        yy = c.y + (referencia - c.valueAxis.valueMin) / (c.valueAxis.valueMax - c.valueAxis.valueMin) * c.height
+        d.add(Line(c.x, yy, c.x + c.width, yy, strokeColor=HexColor("#FF0000"),
+                   strokeWidth=1, strokeDashArray=[3, 2]))
+
+    if nombres:
+        ley = Legend()
+        ley.x, ley.y = c.x + 4, y + h - 20
+        ley.alignment = "right"
+        ley.columnMaximum = 1
+        ley.fontName = "Helvetica"
+        ley.fontSize = 6
+        ley.dx = ley.dy = 6
+        ley.deltax = 60
+        ley.colorNamePairs = list(zip(colores, nombres))
+        d.add(ley)
+
+# ======================================================
+# DIBUJOS (mismos paneles que Graficos.py)
+# ======================================================
+
+def dibujo_final(r, ancho=6.5*inch, alto=5.5*inch):
+    """Final.py: estructura, rentabilidad, liquidez y garantía en 2x2."""
+    d = Drawing(ancho, alto)
+    w, h = ancho / 2, alto / 2
+    # 1. Pastel Estructura
+    _titulo(d, 0, h, w, h, "Activo 2024")
+    _torta(d, 0, h, w, h, [r['vertical_AC'], r['vertical_ANC']], ['Corr.', 'No Corr.'],
+           [HexColor('#3498DB'), HexColor('#95A5A6')], angulo=0)
+    # 2. Barras Rentabilidad
+    _titulo(d, w, h, w, h, "Rentabilidad %")
+    _barras(d, w, h, w, h, ['RAT', 'ROE'], [[r['RAT_2024'], r['RRP_2024']]],
+            [HexColor('#2ECC71'), HexColor('#E67E22')], por_barra=True)
+    # 3. Liquidez (barra horizontal contra el óptimo)
+    _titulo(d, 0, 0, w, h, "Liquidez")
+    _barras(d, 0, 0, w, h, ['Liq.', 'Opt.'], [[r['LG_2024'], 2.0]],
+            [HexColor('#9B59B6'), HexColor('#BDC3C7')], horizontal=True, por_barra=True)
+    # 4. Solvencia
+    _titulo(d, w, 0, w, h, "Garantía")
+    _barras(d, w, 0, w, h, ['Gar.'], [[r['garantia_2024']]], [HexColor('#34495E')],
+            por_barra=True, referencia=1.5)
+    return d
+
+def dibujo_final1(r, ancho=6.5*inch, alto=5.5*inch):
+    """Final1.py: torta del activo, evolución LG/RAT y componentes DuPont."""
+    d = Drawing(ancho, alto)
+    w, h = ancho / 2, alto / 2
+    _titulo(d, 0, h, w, h, "Estructura del Activo 2024", 9)
+    _torta(d, 0, h, w, h, [r['vertical_AC'], r['vertical_ANC']],
+           ['Activo Corriente', 'Activo No Corriente'], C_MPL[:2], decimales=1)
+    _titulo(d, w, h, w, h, "Evolución de Ratios Clave", 9)
+    _barras(d, w, h, w, h, ['2023', '2024'],
+            [[r['LG_2023'], r['LG_2024']], [r['RAT_2023'] / 100, r['RAT_2024'] / 100]],
+            C_MPL[:2], nombres=['Liq. General', 'RAT (ROA)'])
+    _titulo(d, 0, 0, ancho, h, "Componentes DuPont RRP 2024", 9)
+    _barras(d, 0, 0, ancho, h, ['Margen Neto', 'Rotación Activo', 'Apalancamiento'],
+            [[r['margen_neto_dupont'], r['rotacion_activo'], r['apalancamiento_dupont']]],
+            [C_MPL[0]] * 3, por_barra=True)
+    return d
+
+# ======================================================
+# BENCHMARK: PNG 300 dpi vs vectorial
+# ======================================================
+
+def benchmark_graficos(n=10, dpi=300):
+    """
+    Arma n informes completos de Final.py (construir_pdf) en memoria con cada
+    backend del anexo y compara tiempo medio por informe y tamaño del PDF.
+    """
+    import io
+    import time
+    import random
+    from CalculoFinanciero import AnalisisFinanciero, DATOS_POR_DEFECTO
+    from ReporteFinanciero import construir_textos, construir_pdf, grafico_png
+
+    rnd = random.Random(0)
+    casos = []
+    for _ in range(n):
+        data = {k: v * rnd.uniform(0.7, 1.3) for k, v in DATOS_POR_DEFECTO.items()}
+        r = AnalisisFinanciero(data).calcular_todo()
+        casos.append((r, construir_textos(r)))
+
+    backends = (
+        (f"PNG {dpi} dpi", lambda r: grafico_png(r, dpi=dpi)),
+        ("vectorial", dibujo_final),
+        ("sin gráfico", lambda r: None),
+    )
+    filas = []
+    for nombre, grafico in backends:
+        t0 = time.perf_counter()
+        tam = 0
+        for r, textos in casos:
+            buf = io.BytesIO()
+            construir_pdf(r, textos, buf, grafico=grafico(r))
+            tam += buf.tell()
+        seg = (time.perf_counter() - t0) / n
+        filas.append((nombre, seg, tam / n))
+        print(f"{nombre:<14} {seg * 1000:8.1f} ms/informe  {tam / n / 1024:8.1f} KB/informe")
+    return filas
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Gráficos vectoriales del PDF.")
+    p.add_argument("--benchmark", type=int, metavar="N", default=10,
+                   help="informes por backend (por defecto: 10)")
+    p.add_argument("--dpi", type=int, default=300)
+    a = p.parse_args()
+    benchmark_graficos(a.benchmark, a.dpi)
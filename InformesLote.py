@@ -0,0 +1,205 @@
+# ======================================================
+# INFORMES PDF MASIVOS (sin interfaz)
+# ======================================================
+# Genera un informe PDF por empresa a partir de una tabla CSV/Excel con las
+# mismas claves que read_all_inputs de Final.py (AC_2023, PN_2024, ...).
+# Cada informe se arma en un proceso del ProcessPoolExecutor con su propio
+# estado: textos, gráfico en memoria y archivo temporal propio que se renombra
+# al terminar, así que los trabajos no comparten globales ni grafico_temp.png.
+#
+#   python InformesLote.py empresas.csv --salida informes --workers 4
+#   python InformesLote.py --benchmark 40 --workers 1 2 4
+import os
+import re
+import sys
+import time
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    import resource   # solo Unix: memoria pico de cada proceso
+except ImportError:
+    resource = None
+
+from CalculoFinanciero import AnalisisFinanciero, DATOS_POR_DEFECTO
+from ReporteFinanciero import construir_textos, grafico_png, construir_pdf
+from GraficosPDF import dibujo_final
+
+COLUMNAS_NOMBRE = ("empresa", "Empresa", "EMPRESA", "nombre", "Nombre")
+DPI_GRAFICO = 0   # 0 = anexo vectorial; >0 = PNG de matplotlib a esa resolución
+
+# ======================================================
+# LECTURA DE LA TABLA
+# ======================================================
+
+def _valor_numerico(v):
+    try:
+        f = float(v)
+    except (TypeError, ValueError):
+        return None
+    return None if f != f else f
+
+def leer_empresas(ruta):
+    """Devuelve [(nombre, data), ...]; las celdas vacías toman el valor por defecto."""
+    import pandas as pd
+    if ruta.lower().endswith((".xlsx", ".xls")):
+        df = pd.read_excel(ruta)
+    else:
+        df = pd.read_csv(ruta)
+    col_nombre = next((c for c in COLUMNAS_NOMBRE if c in df.columns), None)
+    empresas = []
+    for i, fila in enumerate(df.to_dict("records")):
+        nombre = str(fila.get(col_nombre) or "") if col_nombre else ""
+        data = {}
+        for k, v in fila.items():
+            if k == col_nombre:
+                continue
+            f = _valor_numerico(v)
+            if f is not None:
+                data[str(k)] = f
+        empresas.append((nombre or f"Empresa {i + 1}", data))
+    return empresas
+
+def _nombre_archivo(indice, nombre):
+    limpio = re.sub(r"[^\w\-]+", "_", nombre, flags=re.UNICODE).strip("_") or "empresa"
+    return f"{indice + 1:04d}_{limpio[:60]}.pdf"
+
+# ======================================================
+# TRABAJO POR EMPRESA (se ejecuta en el proceso hijo)
+# ======================================================
+
+def _rss_pico_kb():
+    if resource is None:
+        return 0
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico // 1024 if sys.platform == "darwin" else pico   # macOS da bytes
+
+def generar_informe(indice, nombre, data, carpeta, dpi=DPI_GRAFICO):
+    """
+    Un informe completo. Devuelve un dict con la ruta o el error, sin lanzar excepciones.
+    dpi=0 dibuja el anexo como vectores de ReportLab (GraficosPDF.py) en vez de PNG.
+    """
+    t0 = time.perf_counter()
+    destino = os.path.join(carpeta, _nombre_archivo(indice, nombre))
+    tmp = None
+    try:
+        r = AnalisisFinanciero(data).calcular_todo()
+        textos = construir_textos(r)
+        grafico = grafico_png(r, dpi=dpi) if dpi else dibujo_final(r)
+        tmp = f"{destino}.{os.getpid()}.tmp"   # propio de este trabajo
+        construir_pdf(r, textos, tmp, grafico=grafico, empresa=nombre)
+        os.replace(tmp, destino)
+        error = None
+    except Exception as e:
+        if tmp:
+            try: os.remove(tmp)
+            except OSError: pass
+        destino, error = None, f"{type(e).__name__}: {e}"
+    return {"indice": indice, "nombre": nombre, "ruta": destino, "error": error,
+            "segundos": time.perf_counter() - t0, "pid": os.getpid(), "rss_kb": _rss_pico_kb()}
+
+def _trabajo(args):
+    return generar_informe(*args)
+
+# ======================================================
+# LOTE
+# ======================================================
+
+def generar_informes(empresas, carpeta, workers=None, dpi=DPI_GRAFICO, progreso=None):
+    """
+    Genera un PDF por (nombre, data) de `empresas` en `carpeta`.
+    workers=1 trabaja en este mismo proceso; None usa os.cpu_count().
+    progreso(hechos, total) se llama tras cada informe. Devuelve los dicts en orden.
+    """
+    os.makedirs(carpeta, exist_ok=True)
+    trabajos = [(i, nombre, data, carpeta, dpi) for i, (nombre, data) in enumerate(empresas)]
+    resultados = [None] * len(trabajos)
+    if workers == 1:
+        for hechos, t in enumerate(trabajos, 1):
+            resultados[t[0]] = _trabajo(t)
+            if progreso: progreso(hechos, len(trabajos))
+        return resultados
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futuros = [ex.submit(_trabajo, t) for t in trabajos]
+        for hechos, fut in enumerate(as_completed(futuros), 1):
+            res = fut.result()
+            resultados[res["indice"]] = res
+            if progreso: progreso(hechos, len(trabajos))
+    return resultados
+
+def resumen_memoria_mb(resultados):
+    """(pico del proceso más grande, suma de picos de todos los procesos) en MB."""
+    por_pid = {}
+    for res in resultados:
+        por_pid[res["pid"]] = max(por_pid.get(res["pid"], 0), res["rss_kb"])
+    if not por_pid:
+        return 0.0, 0.0
+    return max(por_pid.values()) / 1024, sum(por_pid.values()) / 1024
+
+# ======================================================
+# BENCHMARK
+# ======================================================
+
+def empresas_sinteticas(n, semilla=0):
+    """n empresas alrededor de los datos por defecto (±30 %), para medir."""
+    import random
+    rnd = random.Random(semilla)
+    return [(f"Empresa {i + 1}", {k: round(v * rnd.uniform(0.7, 1.3), 2) for k, v in DATOS_POR_DEFECTO.items()})
+            for i in range(n)]
+
+def benchmark_lote(n=40, workers_lista=(1, 2, 4), dpi=DPI_GRAFICO):
+    """Informes/segundo y memoria pico para cada cantidad de procesos."""
+    empresas = empresas_sinteticas(n)
+    filas = []
+    for w in workers_lista:
+        with tempfile.TemporaryDirectory() as carpeta:
+            t0 = time.perf_counter()
+            res = generar_informes(empresas, carpeta, workers=w, dpi=dpi)
+            seg = time.perf_counter() - t0
+        errores = sum(1 for x in res if x["error"])
+        pico, total = resumen_memoria_mb(res)
+        filas.append((w, seg, n / seg, pico, total, errores))
+        print(f"workers={w:<2}  {seg:7.2f} s  {n / seg:6.2f} informes/s  "
+              f"RSS pico/proceso {pico:6.1f} MB  RSS pico total {total:7.1f} MB  errores={errores}")
+    return filas
+
+# ======================================================
+# LÍNEA DE COMANDOS
+# ======================================================
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Genera un informe PDF por empresa (una fila por empresa).")
+    p.add_argument("tabla", nargs="?", help="CSV o Excel con las claves de Final.py (columna opcional 'empresa')")
+    p.add_argument("--salida", default="informes", help="carpeta de destino (por defecto: informes)")
+    p.add_argument("--workers", type=int, nargs="+", default=None,
+                   help="procesos en paralelo (por defecto: uno por CPU); varios valores con --benchmark")
+    p.add_argument("--dpi", type=int, default=DPI_GRAFICO,
+                   help="anexo como PNG de matplotlib a esta resolución (por defecto: vectorial)")
+    p.add_argument("--benchmark", type=int, metavar="N", help="medir con N empresas sintéticas")
+    a = p.parse_args(argv)
+
+    if a.benchmark:
+        benchmark_lote(a.benchmark, a.workers or (1, 2, 4), a.dpi)
+        return 0
+    if not a.tabla:
+        p.error("falta la tabla de empresas (o use --benchmark N)")
+
+    empresas = leer_empresas(a.tabla)
+    workers = a.workers[0] if a.workers else None
+
+    def progreso(hechos, total):
+        print(f"\r{hechos}/{total} informes", end="", file=sys.stderr, flush=True)
+
+    t0 = time.perf_counter()
+    resultados = generar_informes(empresas, a.salida, workers=workers, dpi=a.dpi, progreso=progreso)
+    seg = time.perf_counter() - t0
+    print(file=sys.stderr)
+    errores = [x for x in resultados if x["error"]]
+    for x in errores:
+        print(f"ERROR fila {x['indice'] + 1} ({x['nombre']}): {x['error']}", file=sys.stderr)
+    print(f"{len(resultados) - len(errores)} informes en {a.salida} ({seg:.1f} s)")
+    return 1 if errores else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
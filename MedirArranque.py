@@ -0,0 +1,135 @@
+# ======================================================
+# ARRANQUE DE LAS VENTANAS (Final.py, Final1.py, prueba.py)
+# ======================================================
+# Mide cuánto tarda cada script en mostrar su ventana y qué importa antes:
+# se ejecuta en un proceso nuevo con `python -X importtime` y mainloop()
+# reemplazado por un update() que anota la hora y cierra la ventana. Sin
+# pantalla (servidor, CI) Tk() falla, pero los imports de módulo ya se
+# hicieron: se informa el tiempo de imports y "sin pantalla".
+#
+#   python MedirArranque.py                          (los tres scripts)
+#   python MedirArranque.py Final.py --referencia HEAD~1 --guardar arranque.json
+#
+# --referencia mide además la misma revisión de git (git archive a una
+# carpeta temporal) para comparar antes/después.
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+SCRIPTS = ("Final.py", "Final1.py", "prueba.py")
+OBJETIVO_MS = 300   # hasta la primera ventana
+
+# Envoltorio que corre el script: la primera llamada a mainloop() dibuja la
+# ventana, anota la hora y la cierra.
+_ENVOLTORIO = r"""
+import sys, time, runpy, tkinter
+def _primera_ventana(self, n=0):
+    self.update()
+    sys.stderr.write("VENTANA %.6f\n" % time.time())
+    self.destroy()
+tkinter.Misc.mainloop = _primera_ventana
+sys.argv = [sys.argv[1]]
+try:
+    runpy.run_path(sys.argv[0], run_name="__main__")
+except tkinter.TclError as e:
+    sys.stderr.write("SIN_PANTALLA %s\n" % e)
+"""
+
+_LINEA_IMPORTTIME = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+# ======================================================
+# MEDICIÓN
+# ======================================================
+
+def leer_importtime(stderr):
+    """[(modulo, acumulado_us)] de los imports de primer nivel en la salida de -X importtime."""
+    nivel1 = []
+    for linea in stderr.splitlines():
+        m = _LINEA_IMPORTTIME.match(linea)
+        if m and len(m.group(3)) == 1:
+            nivel1.append((m.group(4), int(m.group(2))))
+    return nivel1
+
+def medir_script(script, carpeta):
+    """Un arranque en frío de `script` (dentro de `carpeta`)."""
+    t0 = time.time()
+    p = subprocess.run([sys.executable, "-X", "importtime", "-c", _ENVOLTORIO, script],
+                       cwd=carpeta, capture_output=True, text=True)
+    total = time.time() - t0
+    imports = leer_importtime(p.stderr)
+    ventana = re.search(r"^VENTANA (\S+)$", p.stderr, re.M)
+    return {
+        "script": script,
+        "imports_ms": sum(us for _, us in imports) / 1000,
+        "ventana_ms": (float(ventana.group(1)) - t0) * 1000 if ventana else None,
+        "proceso_ms": total * 1000,
+        "sin_pantalla": "SIN_PANTALLA" in p.stderr,
+        "mas_pesados": sorted(imports, key=lambda x: -x[1])[:8],
+    }
+
+def medir(scripts, carpeta, n=5):
+    """Mediana de n arranques por script (la primera corrida calienta la caché del disco)."""
+    filas = []
+    for script in scripts:
+        medir_script(script, carpeta)
+        corridas = sorted((medir_script(script, carpeta) for _ in range(n)),
+                          key=lambda x: x["imports_ms"])
+        filas.append(corridas[len(corridas) // 2])
+    return filas
+
+def _extraer_revision(rev, destino):
+    # el repositorio de este script, no el del directorio actual
+    raiz = subprocess.run(["git", "rev-parse", "--show-toplevel"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                          capture_output=True, text=True, check=True).stdout.strip()
+    archivo = subprocess.run(["git", "archive", rev], cwd=raiz, capture_output=True, check=True).stdout
+    subprocess.run(["tar", "-x", "-C", destino], input=archivo, check=True)
+
+# ======================================================
+# INFORME
+# ======================================================
+
+def _imprimir(titulo, filas):
+    print(f"== {titulo}")
+    for f in filas:
+        if f["ventana_ms"] is not None:
+            estado = "OK" if f["ventana_ms"] <= OBJETIVO_MS else f"> {OBJETIVO_MS} ms"
+            ventana = f"ventana {f['ventana_ms']:7.1f} ms ({estado})"
+        else:
+            ventana = "ventana -- (sin pantalla)" if f["sin_pantalla"] else "ventana --"
+        print(f"{f['script']:<10} imports {f['imports_ms']:7.1f} ms  {ventana}")
+        print("           " + ", ".join(f"{m} {us / 1000:.0f}" for m, us in f["mas_pesados"][:5]))
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Tiempo de arranque de las ventanas (python -X importtime).")
+    p.add_argument("scripts", nargs="*", default=list(SCRIPTS))
+    p.add_argument("-n", type=int, default=5, help="arranques por script (se informa la mediana)")
+    p.add_argument("--referencia", metavar="REV", help="revisión de git para comparar (p. ej. HEAD~1)")
+    p.add_argument("--guardar", metavar="JSON", help="guardar las mediciones en un archivo")
+    a = p.parse_args(argv)
+
+    aqui = os.path.dirname(os.path.abspath(__file__))
+    registro = {"objetivo_ms": OBJETIVO_MS, "python": sys.version.split()[0]}
+    if a.referencia:
+        tmp = tempfile.mkdtemp()
+        try:
+            _extraer_revision(a.referencia, tmp)
+            registro["antes"] = medir(a.scripts, tmp, a.n)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        _imprimir(f"antes ({a.referencia})", registro["antes"])
+    registro["despues"] = medir(a.scripts, aqui, a.n)
+    _imprimir("actual", registro["despues"])
+
+    if a.guardar:
+        with open(a.guardar, "w", encoding="utf-8") as f:
+            json.dump(registro, f, ensure_ascii=False, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,370 @@
+# ======================================================
+# MOTOR DE INTERÉS SIMPLE Y COMPUESTO (SIN INTERFAZ)
+# ======================================================
+# UnifiedApp.calcular_interes (Parcial2Finanzas.py) y las funciones de consola
+# de Finanzas.py resuelven un caso a la vez, mezclado con messagebox/input.
+# Aquí las mismas fórmulas trabajan sobre arrays de NumPy (un contrato por
+# fila) para cualquier incógnita: VF, VP, I, i o t. En lugar de diálogos,
+# cada fila trae un código en `motivo` (OK, FALTAN_DATOS, DIVISION_CERO,
+# FUERA_DE_DOMINIO) y su valor queda en NaN si no es OK.
+#
+# El interés simple (solo sumas, productos y divisiones) da exactamente lo
+# mismo que las fórmulas escalares. En el compuesto, np.power y np.log usan
+# las rutinas vectorizadas de NumPy, que pueden diferir de math/pow en el
+# último bit (diferencia relativa del orden de 1e-16; ver el benchmark).
+#
+#   r = interes_simple("VF", VP=[1000, 2500], i=0.24, t=[0.5, 2])
+#   r.valor, r.valido, r.mensajes()
+#
+#   python MotorInteres.py --benchmark 1000000
+#   python MotorInteres.py --benchmark 1000000 --tramos
+import math
+
+import numpy as np
+
+INCOGNITAS = ("VF", "VP", "I", "i", "t")
+
+OK, FALTAN_DATOS, DIVISION_CERO, FUERA_DE_DOMINIO = range(4)
+MOTIVOS = ("", "Faltan datos", "División por cero", "Fuera de dominio")
+
+class ResultadoInteres:
+    """valor: float64 por fila (NaN si no es válida); motivo: int8 por fila (0 = OK)."""
+    __slots__ = ("incognita", "valor", "motivo")
+
+    def __init__(self, incognita, valor, motivo):
+        self.incognita = incognita
+        self.valor = valor
+        self.motivo = motivo
+
+    @property
+    def valido(self):
+        return self.motivo == OK
+
+    def mensajes(self):
+        """Texto del motivo de cada fila ("" si es válida)."""
+        return [MOTIVOS[m] for m in self.motivo.ravel()]
+
+    def escalar(self):
+        """(valor, motivo) de un resultado de una sola fila, con valor None si no es válida."""
+        m = int(self.motivo.ravel()[0])
+        return (float(self.valor.ravel()[0]) if m == OK else None), m
+
+def _arrays(**datos):
+    """Convierte a float64 con broadcast común; None = dato faltante (NaN)."""
+    nombres = list(datos)
+    arrays = np.broadcast_arrays(*[np.asarray(np.nan if v is None else v, dtype=np.float64)
+                                   for v in datos.values()])
+    return dict(zip(nombres, arrays))
+
+def _resultado(incognita, valor, faltan, cero, fuera=None):
+    valor = np.asarray(valor, dtype=np.float64)
+    motivo = np.zeros(valor.shape, dtype=np.int8)
+    motivo[~np.isfinite(valor)] = FUERA_DE_DOMINIO
+    if fuera is not None:
+        motivo[fuera] = FUERA_DE_DOMINIO
+    motivo[cero] = DIVISION_CERO
+    motivo[faltan] = FALTAN_DATOS
+    valor = np.where(motivo == OK, valor, np.nan)
+    return ResultadoInteres(incognita, valor, motivo)
+
+def _falta(*xs):
+    m = np.isnan(xs[0])
+    for x in xs[1:]:
+        m = m | np.isnan(x)
+    return m
+
+# ======================================================
+# INTERÉS SIMPLE
+# ======================================================
+
+def interes_simple(incognita, VP=None, VF=None, I=None, i=None, t=None):
+    """
+    VF = VP(1 + i t)    VP = VF / (1 + i t)    I = VP i t
+    i = I / (VP t)      o, sin I, (VF/VP - 1) / t
+    t = I / (VP i)      o, sin I, (VF/VP - 1) / i
+    i y t en la misma unidad (tasa anual y años). Los datos pueden ser
+    números o arrays (se hace broadcast).
+    """
+    d = _arrays(VP=VP, VF=VF, I=I, i=i, t=t)
+    VP, VF, I, i, t = d["VP"], d["VF"], d["I"], d["i"], d["t"]
+    sin_cero = np.zeros(VP.shape, dtype=bool)
+    with np.errstate(all="ignore"):
+        if incognita == "VF":
+            return _resultado(incognita, VP * (1 + i * t), _falta(VP, i, t), sin_cero)
+        if incognita == "VP":
+            den = 1 + i * t
+            return _resultado(incognita, VF / den, _falta(VF, i, t), den == 0)
+        if incognita == "I":
+            return _resultado(incognita, VP * i * t, _falta(VP, i, t), sin_cero)
+        con_I = ~np.isnan(I)
+        if incognita == "i":
+            valor = np.where(con_I, I / (VP * t), (VF / VP - 1) / t)
+            faltan = _falta(VP, t) | (~con_I & np.isnan(VF))
+            return _resultado(incognita, valor, faltan, (VP == 0) | (t == 0))
+        if incognita == "t":
+            valor = np.where(con_I, I / (VP * i), (VF / VP - 1) / i)
+            faltan = _falta(VP, i) | (~con_I & np.isnan(VF))
+            return _resultado(incognita, valor, faltan, (VP == 0) | (i == 0))
+    raise ValueError(f"Incógnita desconocida: {incognita!r} (use una de {', '.join(INCOGNITAS)})")
+
+# ======================================================
+# INTERÉS COMPUESTO
+# ======================================================
+
+def interes_compuesto(incognita, VP=None, VF=None, I=None, i=None, t=None):
+    """
+    VF = VP(1 + i)^t    VP = VF / (1 + i)^t    I = VP((1 + i)^t - 1)
+    i = (VF/VP)^(1/t) - 1    t = ln(VF/VP) / ln(1 + i)
+    Si falta VF para i o t y está I, se usa VF = VP + I. Una tasa i <= -1
+    (1 + i <= 0) es FUERA_DE_DOMINIO, como en Amortizacion.
+    """
+    d = _arrays(VP=VP, VF=VF, I=I, i=i, t=t)
+    VP, VF, I, i, t = d["VP"], d["VF"], d["I"], d["i"], d["t"]
+    sin_cero = np.zeros(VP.shape, dtype=bool)
+    fuera = i <= -1
+    with np.errstate(all="ignore"):
+        if incognita == "VF":
+            return _resultado(incognita, VP * (1 + i) ** t, _falta(VP, i, t), sin_cero, fuera)
+        if incognita == "VP":
+            den = (1 + i) ** t
+            return _resultado(incognita, VF / den, _falta(VF, i, t), den == 0, fuera)
+        if incognita == "I":
+            return _resultado(incognita, VP * ((1 + i) ** t - 1), _falta(VP, i, t), sin_cero, fuera)
+        VF = np.where(np.isnan(VF), VP + I, VF)
+        if incognita == "i":
+            return _resultado(incognita, (VF / VP) ** (1 / t) - 1, _falta(VP, VF, t), (VP == 0) | (t == 0))
+        if incognita == "t":
+            return _resultado(incognita, np.log(VF / VP) / np.log(1 + i), _falta(VP, VF, i),
+                              (VP == 0) | (i == 0), fuera)
+    raise ValueError(f"Incógnita desconocida: {incognita!r} (use una de {', '.join(INCOGNITAS)})")
+
+TIPOS = {"Interés Simple": interes_simple, "Interés Compuesto": interes_compuesto}
+
+def resolver(tipo, incognita, **datos):
+    """Por el nombre del tipo como en la interfaz ("Interés Simple", "Interés Compuesto")."""
+    return TIPOS[tipo](incognita, **datos)
+
+# ======================================================
+# TASAS POR TRAMOS (MUCHOS CONTRATOS)
+# ======================================================
+# "Interés Simple con Variación de Tasas": cada contrato tiene su lista de
+# tramos (tasa anual, días). Los tramos de todos los contratos van seguidos
+# en dos arrays planos y `offsets` marca dónde empieza cada contrato: los
+# tramos del contrato k son tasas[offsets[k]:offsets[k + 1]]. La suma por
+# contrato es una sola reducción segmentada (np.add.reduceat), sin bucle en
+# Python; su orden de suma puede diferir del bucle tramo a tramo en el
+# último bit.
+
+class TablaTramos:
+    """
+    Tramos de muchos contratos: offsets int64 (n + 1), tasas y dias float64
+    planos. `años` (opcional) es la fracción de año de cada tramo según una
+    convención de ConteoDias; si falta, se usa dias/base.
+    """
+    __slots__ = ("offsets", "tasas", "dias", "años")
+
+    def __init__(self, offsets, tasas, dias, años=None):
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.tasas = np.asarray(tasas, dtype=np.float64)
+        self.dias = np.asarray(dias, dtype=np.float64)
+        self.años = None if años is None else np.asarray(años, dtype=np.float64)
+        if self.offsets[0] != 0 or self.offsets[-1] != len(self.tasas) or len(self.tasas) != len(self.dias):
+            raise ValueError("offsets no corresponde a los arrays de tramos")
+
+    @classmethod
+    def desde_fechas(cls, offsets, tasas, inicios, fines, convencion="30/360", calendario=None):
+        """Tramos con fechas de inicio y fin (planas, como tasas); dias = días reales."""
+        from ConteoDias import dias_reales, fraccion_año
+        return cls(offsets, tasas, dias_reales(inicios, fines),
+                   fraccion_año(inicios, fines, convencion, calendario))
+
+    @classmethod
+    def desde_listas(cls, contratos):
+        """contratos: [[(tasa, dias), ...], ...], una lista (posiblemente vacía) por contrato."""
+        largos = np.fromiter((len(c) for c in contratos), dtype=np.int64, count=len(contratos))
+        offsets = np.zeros(len(contratos) + 1, dtype=np.int64)
+        np.cumsum(largos, out=offsets[1:])
+        planos = np.array([tramo for c in contratos for tramo in c], dtype=np.float64).reshape(-1, 2)
+        return cls(offsets, planos[:, 0], planos[:, 1])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def largos(self):
+        return np.diff(self.offsets)
+
+    def contrato(self, k):
+        """(tasas, dias) del contrato k, como vistas."""
+        a, b = self.offsets[k], self.offsets[k + 1]
+        return self.tasas[a:b], self.dias[a:b]
+
+def _por_contrato(ufunc, valores, offsets, vacio):
+    """ufunc.reduceat por contrato; los contratos sin tramos dan `vacio`."""
+    n = len(offsets) - 1
+    salida = np.full(n, vacio, dtype=np.float64)
+    con_tramos = offsets[1:] > offsets[:-1]
+    if len(valores):
+        salida[con_tramos] = ufunc.reduceat(valores, offsets[:-1][con_tramos])
+    return salida
+
+class ResultadoTramos:
+    """
+    interes y VF por contrato (NaN si no es válido), motivo por contrato y,
+    en modo simple, el interés de cada tramo (plano, alineado con la tabla).
+    """
+    __slots__ = ("interes", "VF", "motivo", "interes_tramos")
+
+    def __init__(self, interes, VF, motivo, interes_tramos=None):
+        self.interes = interes
+        self.VF = VF
+        self.motivo = motivo
+        self.interes_tramos = interes_tramos
+
+    @property
+    def valido(self):
+        return self.motivo == OK
+
+def interes_por_tramos(VP, tramos, compuesto=False, base=360.0):
+    """
+    VP: capital por contrato (o uno para todos); tramos: TablaTramos.
+    Simple: I = suma de VP * tasa * dias/base sobre los tramos, VF = VP + I.
+    compuesto=True: VF = VP * producto de (1 + tasa)^(dias/base), I = VF - VP;
+    un contrato con algún tramo de tasa <= -1 es FUERA_DE_DOMINIO, como en
+    interes_compuesto.
+    Si la tabla trae `años` (tramos con fechas), se usa en lugar de dias/base.
+    """
+    n = len(tramos)
+    VP = np.broadcast_to(np.asarray(np.nan if VP is None else VP, dtype=np.float64), (n,))
+    largos = tramos.largos
+    with np.errstate(all="ignore"):
+        años = tramos.dias / base if tramos.años is None else tramos.años
+        malos = _por_contrato(np.add, (np.isnan(tramos.tasas) | np.isnan(años)).astype(np.float64),
+                              tramos.offsets, 0.0) > 0
+        fuera = np.zeros(n, dtype=bool)
+        if compuesto:
+            fuera = _por_contrato(np.add, (tramos.tasas <= -1).astype(np.float64), tramos.offsets, 0.0) > 0
+            factor = _por_contrato(np.multiply, (1 + tramos.tasas) ** años, tramos.offsets, 1.0)
+            VF = VP * factor
+            interes = VF - VP
+            interes_tramos = None
+        else:
+            interes_tramos = np.repeat(VP, largos) * tramos.tasas * años
+            interes = _por_contrato(np.add, interes_tramos, tramos.offsets, 0.0)
+            VF = VP + interes
+    motivo = np.zeros(n, dtype=np.int8)
+    motivo[~np.isfinite(VF) | fuera] = FUERA_DE_DOMINIO
+    motivo[np.isnan(VP) | malos] = FALTAN_DATOS
+    invalido = motivo != OK
+    interes[invalido] = np.nan
+    VF[invalido] = np.nan
+    return ResultadoTramos(interes, VF, motivo, interes_tramos)
+
+# ======================================================
+# BENCHMARK
+# ======================================================
+
+def _escalar_simple_VF(VP, i, t):
+    return VP * (1 + i * t)
+
+def _escalar_compuesto_t(VF, VP, i):
+    return math.log(VF / VP) / math.log(1 + i)
+
+def benchmark_motor(n=1_000_000, semilla=0):
+    """Fórmula escalar fila por fila contra el motor, para VF simple y t compuesto."""
+    import time
+    rnd = np.random.default_rng(semilla)
+    VP = rnd.uniform(100, 1e6, n).round(2)
+    i = rnd.uniform(0.001, 0.6, n).round(4)
+    t = rnd.uniform(0.1, 30, n).round(3)
+    VF = (VP * rnd.uniform(1.01, 5, n)).round(2)
+    filas = []
+    for nombre, escalar, motor, args in (
+            ("simple VF", _escalar_simple_VF, lambda: interes_simple("VF", VP=VP, i=i, t=t), (VP, i, t)),
+            ("compuesto t", _escalar_compuesto_t, lambda: interes_compuesto("t", VF=VF, VP=VP, i=i), (VF, VP, i))):
+        listas = [a.tolist() for a in args]
+        t0 = time.perf_counter()
+        ref = [escalar(*x) for x in zip(*listas)]
+        t_escalar = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        r = motor()
+        t_motor = time.perf_counter() - t0
+        ref = np.array(ref)
+        iguales = int(np.count_nonzero(r.valor == ref))
+        dif = float(np.max(np.abs(r.valor - ref) / np.abs(ref)))
+        filas.append((nombre, t_escalar, t_motor, iguales, dif))
+        print(f"{nombre:<12} escalar {t_escalar * 1000:9.1f} ms   motor {t_motor * 1000:8.1f} ms   "
+              f"x{t_escalar / t_motor:5.1f}   idénticos {iguales}/{n}   máx. dif. relativa {dif:.1e}")
+    return filas
+
+def _escalar_compuesto_tramos(VP, tasas, dias, base=360.0):
+    """Interés compuesto de un contrato tramo a tramo; NaN si una tasa es <= -1."""
+    factor = 1.0
+    for tasa, d in zip(tasas, dias):
+        if tasa <= -1:
+            return math.nan
+        factor *= (1 + tasa) ** (d / base)
+    return VP * factor - VP
+
+def benchmark_tramos(contratos=1_000_000, max_tramos=8, semilla=0):
+    """
+    Bucle tramo a tramo (como calcular_interes) contra interes_por_tramos.
+    Uno de cada mil tramos tiene tasa -1.5: en compuesto su contrato tiene que
+    salir FUERA_DE_DOMINIO, igual que en el bucle escalar.
+    """
+    import time
+    rnd = np.random.default_rng(semilla)
+    largos = rnd.integers(1, max_tramos + 1, contratos)
+    offsets = np.concatenate(([0], np.cumsum(largos)))
+    total = int(offsets[-1])
+    tasas = rnd.uniform(0.01, 0.6, total).round(4)
+    tasas[rnd.random(total) < 0.001] = -1.5
+    tramos = TablaTramos(offsets, tasas, rnd.integers(1, 361, total))
+    VP = rnd.uniform(1000, 1e6, contratos).round(2)
+
+    VP_l, off_l, tasas_l, dias_l = VP.tolist(), offsets.tolist(), tramos.tasas.tolist(), tramos.dias.tolist()
+    t0 = time.perf_counter()
+    ref = []
+    for k in range(contratos):
+        total_interes = 0.0
+        for j in range(off_l[k], off_l[k + 1]):
+            total_interes += VP_l[k] * tasas_l[j] * (dias_l[j] / 360.0)
+        ref.append(total_interes)
+    t_bucle = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    r = interes_por_tramos(VP, tramos)
+    t_motor = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    ref_comp = [_escalar_compuesto_tramos(VP_l[k], tasas_l[off_l[k]:off_l[k + 1]], dias_l[off_l[k]:off_l[k + 1]])
+                for k in range(contratos)]
+    t_bucle_comp = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    rc = interes_por_tramos(VP, tramos, compuesto=True)
+    t_comp = time.perf_counter() - t0
+
+    ref = np.array(ref)
+    ref_comp = np.array(ref_comp)
+    fuera = np.isnan(ref_comp)
+    # la diferencia relativa se mide sin esos contratos (en simple su interés puede rondar cero)
+    dif = float(np.max((np.abs(r.interes - ref) / np.abs(ref))[~fuera]))
+    dif_comp = float(np.max((np.abs(rc.interes - ref_comp) / np.abs(ref_comp))[~fuera]))
+    coinciden = int(np.count_nonzero((rc.motivo == FUERA_DE_DOMINIO) == fuera))
+    print(f"{contratos} contratos, {total} tramos (1 a {max_tramos} por contrato)")
+    print(f"simple     bucle {t_bucle * 1000:9.1f} ms   reduceat {t_motor * 1000:8.1f} ms   "
+          f"x{t_bucle / t_motor:5.1f}   máx. dif. relativa {dif:.1e}")
+    print(f"compuesto  bucle {t_bucle_comp * 1000:9.1f} ms   reduceat {t_comp * 1000:8.1f} ms   "
+          f"x{t_bucle_comp / t_comp:5.1f}   máx. dif. relativa {dif_comp:.1e}   "
+          f"fuera de dominio {int(fuera.sum())} (coinciden {coinciden}/{contratos})")
+    return t_bucle, t_motor, t_comp
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Motor vectorizado de interés simple y compuesto.")
+    p.add_argument("--benchmark", type=int, metavar="N", default=1_000_000, help="contratos por caso")
+    p.add_argument("--tramos", action="store_true", help="medir el cálculo por tramos de tasa")
+    p.add_argument("--max-tramos", type=int, default=8)
+    a = p.parse_args()
+    if a.tramos:
+        benchmark_tramos(a.benchmark, a.max_tramos)
+    else:
+        benchmark_motor(a.benchmark)
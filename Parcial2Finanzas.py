@@ -2,6 +2,7 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import math
+from RegistroRatios import construir_registro, interpretar_lote
 
 # ------------------ UTILIDADES ------------------
 def safe_float(s):
@@ -67,94 +68,104 @@ FIELDS = {
     "ROE":["Utilidad neta","Patrimonio"]
 }
 
+# Etiquetas por categoría (de la más baja a la más alta según los cortes de
+# RegistroRatios.py); la última es la de NaN (código -1).
+NO_DISPONIBLE = "No disponible (posible división por cero o dato faltante)."
+INTERPRETACIONES = {
+    "Razón corriente": (
+        "Insuficiente: riesgo de iliquidez a corto plazo. Recomendación: aumentar activos líquidos o renegociar pasivos corrientes.",
+        "Aceptable: cubre obligaciones a corto plazo. Mantener control de ciclo operativo.",
+        "Exceso de liquidez: la empresa puede no estar usando eficientemente recursos (considerar inversión o reducción de inventarios).",
+        NO_DISPONIBLE,
+    ),
+    "Prueba ácida": (
+        "Riesgo: dependencia del inventario para cubrir pasivos. Revisar rotación de inventarios y políticas de crédito.",
+        "Buena liquidez inmediata sin depender del inventario.",
+        NO_DISPONIBLE,
+    ),
+    "Capital de trabajo": (
+        "Capital de trabajo negativo: riesgo operativo y posible iliquidez. Priorizar gestión de corto plazo.",
+        "Capital de trabajo positivo: capacidad para operar con normalidad.",
+        NO_DISPONIBLE,
+    ),
+    "Rotación inventarios": (
+        "Rotación baja: exceso de inventario o problemas de ventas. Revisar niveles y promociones.",
+        "Rotación adecuada: la venta y reposición están equilibradas.",
+        "Rotación alta: buen ritmo de ventas, pero cuidado con rupturas de stock.",
+        NO_DISPONIBLE,
+    ),
+    "Período promedio de inventarios": (
+        "Inventario se renueva en tiempo razonable.",
+        "Inventarios permanecen mucho tiempo: riesgo de obsolescencia.",
+        NO_DISPONIBLE,
+    ),
+    "Rotación CxC": (
+        "Cobranza lenta: revisar condiciones de crédito y gestión de cobranzas.",
+        "Cobranza eficiente.",
+        NO_DISPONIBLE,
+    ),
+    "Período promedio de cobro": (
+        "Período de cobro saludable.",
+        "Días de cobro altos: impacto negativo en liquidez; mejorar políticas o incentivos de pago.",
+        NO_DISPONIBLE,
+    ),
+    "Rotación activos": (
+        "Baja eficiencia en uso de activos: posibles inversiones improductivas o activos ociosos.",
+        "Activos generan ventas eficientemente.",
+        NO_DISPONIBLE,
+    ),
+    "Pasivo/Activo": (
+        "Bajo endeudamiento: conservador; puede aumentar financiamiento para crecer.",
+        "Endeudamiento moderado: equilibrio entre deuda y capital.",
+        "Alto endeudamiento: riesgo financiero elevado. Revisar estructura de capital.",
+        NO_DISPONIBLE,
+    ),
+    "Deuda/Patrimonio": (
+        "Estructura patrimonial equilibrada.",
+        "Deuda mayor que patrimonio: alta dependencia de financiamiento externo.",
+        NO_DISPONIBLE,
+    ),
+    "Cobertura intereses": (
+        "Cobertura insuficiente: riesgo ante aumentos en tasa de interés.",
+        "Capacidad adecuada para pagar intereses.",
+        NO_DISPONIBLE,
+    ),
+    "Margen neto": (
+        "Margen bajo: revisar precios y estructura de costos.",
+        "Margen adecuado: negocio rentable.",
+        "Margen alto: excelente control de costos o posicionamiento.",
+        NO_DISPONIBLE,
+    ),
+    "ROA": (
+        "ROA bajo: los activos no generan suficiente retorno.",
+        "ROA aceptable: buena utilización de activos.",
+        NO_DISPONIBLE,
+    ),
+    "ROE": (
+        "ROE bajo: bajo retorno sobre el capital propio.",
+        "ROE adecuado: retorno aceptable para accionistas.",
+        "ROE alto: excelente retorno para accionistas.",
+        NO_DISPONIBLE,
+    ),
+}
+
 def interpretar(ratio, v):
     # versión mejorada y algo más elaborada (breve)
-    if v != v: return "No disponible (posible división por cero o dato faltante)."
-    if ratio=="Razón corriente":
-        if v<1:
-            return "Insuficiente: riesgo de iliquidez a corto plazo. Recomendación: aumentar activos líquidos o renegociar pasivos corrientes."
-        if v<=2:
-            return "Aceptable: cubre obligaciones a corto plazo. Mantener control de ciclo operativo."
-        return "Exceso de liquidez: la empresa puede no estar usando eficientemente recursos (considerar inversión o reducción de inventarios)."
-    if ratio=="Prueba ácida":
-        if v<1:
-            return "Riesgo: dependencia del inventario para cubrir pasivos. Revisar rotación de inventarios y políticas de crédito."
-        return "Buena liquidez inmediata sin depender del inventario."
-    if ratio=="Capital de trabajo":
-        if v < 0:
-            return "Capital de trabajo negativo: riesgo operativo y posible iliquidez. Priorizar gestión de corto plazo."
-        return "Capital de trabajo positivo: capacidad para operar con normalidad."
-    if ratio=="Rotación inventarios":
-        if v < 3:
-            return "Rotación baja: exceso de inventario o problemas de ventas. Revisar niveles y promociones."
-        if v <= 6:
-            return "Rotación adecuada: la venta y reposición están equilibradas."
-        return "Rotación alta: buen ritmo de ventas, pero cuidado con rupturas de stock."
-    if ratio=="Período promedio de inventarios":
-        if v > 120:
-            return "Inventarios permanecen mucho tiempo: riesgo de obsolescencia."
-        return "Inventario se renueva en tiempo razonable."
-    if ratio=="Rotación CxC":
-        if v < 4:
-            return "Cobranza lenta: revisar condiciones de crédito y gestión de cobranzas."
-        return "Cobranza eficiente."
-    if ratio=="Período promedio de cobro":
-        if v > 90:
-            return "Días de cobro altos: impacto negativo en liquidez; mejorar políticas o incentivos de pago."
-        return "Período de cobro saludable."
-    if ratio=="Rotación activos":
-        if v < 1:
-            return "Baja eficiencia en uso de activos: posibles inversiones improductivas o activos ociosos."
-        return "Activos generan ventas eficientemente."
-    if ratio=="Pasivo/Activo":
-        if v > 0.6:
-            return "Alto endeudamiento: riesgo financiero elevado. Revisar estructura de capital."
-        if v >= 0.4:
-            return "Endeudamiento moderado: equilibrio entre deuda y capital."
-        return "Bajo endeudamiento: conservador; puede aumentar financiamiento para crecer."
-    if ratio=="Deuda/Patrimonio":
-        if v > 1:
-            return "Deuda mayor que patrimonio: alta dependencia de financiamiento externo."
-        return "Estructura patrimonial equilibrada."
-    if ratio=="Cobertura intereses":
-        if v < 2:
-            return "Cobertura insuficiente: riesgo ante aumentos en tasa de interés."
-        return "Capacidad adecuada para pagar intereses."
-    if ratio=="Margen neto":
-        if v < 0.05:
-            return "Margen bajo: revisar precios y estructura de costos."
-        if v <= 0.15:
-            return "Margen adecuado: negocio rentable."
-        return "Margen alto: excelente control de costos o posicionamiento."
-    if ratio=="ROA":
-        if v < 0.05:
-            return "ROA bajo: los activos no generan suficiente retorno."
-        return "ROA aceptable: buena utilización de activos."
-    if ratio=="ROE":
-        if v < 0.10:
-            return "ROE bajo: bajo retorno sobre el capital propio."
-        if v <= 0.20:
-            return "ROE adecuado: retorno aceptable para accionistas."
-        return "ROE alto: excelente retorno para accionistas."
-    return "Sin interpretación."
+    if v != v: return NO_DISPONIBLE
+    spec = REGISTRO_RATIOS.get(ratio)
+    if spec is None: return "Sin interpretación."
+    return INTERPRETACIONES[ratio][spec.clasificar(v)]
+
+def interpretar_lote_ratio(ratio, valores):
+    # códigos por numpy.searchsorted + tabla de etiquetas: tabla[codigo] es la interpretación
+    return interpretar_lote(REGISTRO_RATIOS, INTERPRETACIONES, ratio, valores)
+
+# Registro declarativo (RegistroRatios.py): búsqueda O(1) en vez de la cadena de if
+REGISTRO_RATIOS = construir_registro(FIELDS)
 
 def calcular(r, vals):
-    # user code mapping
-    if r=="Razón corriente": return safe_div(vals.get("Activo corriente",0), vals.get("Pasivo corriente",0))
-    if r=="Prueba ácida": return safe_div(vals.get("Activo corriente",0) - vals.get("Inventarios",0), vals.get("Pasivo corriente",0))
-    if r=="Capital de trabajo": return vals.get("Activo corriente",0) - vals.get("Pasivo corriente",0)
-    if r=="Rotación inventarios": return safe_div(vals.get("Costo de ventas",0), vals.get("Inventario promedio",0))
-    if r=="Período promedio de inventarios": return safe_div(360, safe_div(vals.get("Costo de ventas",0), vals.get("Inventario promedio",0)))
-    if r=="Rotación CxC": return safe_div(vals.get("Ventas netas",0), vals.get("Cuentas por cobrar",0))
-    if r=="Período promedio de cobro": return safe_div(360, safe_div(vals.get("Ventas netas",0), vals.get("Cuentas por cobrar",0)))
-    if r=="Rotación activos": return safe_div(vals.get("Ventas netas",0), vals.get("Activo total",0))
-    if r=="Pasivo/Activo": return safe_div(vals.get("Pasivo total",0), vals.get("Activo total",0))
-    if r=="Deuda/Patrimonio": return safe_div(vals.get("Pasivo total",0), vals.get("Patrimonio",0))
-    if r=="Cobertura intereses": return safe_div(vals.get("UAII",0), vals.get("Gastos por intereses",0))
-    if r=="Margen neto": return safe_div(vals.get("Utilidad neta",0), vals.get("Ventas netas",0))
-    if r=="ROA": return safe_div(vals.get("Utilidad neta",0), vals.get("Activo total",0))
-    if r=="ROE": return safe_div(vals.get("Utilidad neta",0), vals.get("Patrimonio",0))
-    return float('nan')
+    spec = REGISTRO_RATIOS.get(r)
+    return spec.evaluar(vals) if spec else float('nan')
 
 # ------------------ DUPONT & ANALYSIS ------------------
 def calculate_dupont(current):
@@ -327,8 +338,9 @@ class UnifiedApp:
         tipo = self.int_tipo.get()
         calc = self.int_calculo.get()
 
-        # Campos comunes de tiempo (los añadimos solo cuando correspondan)
-        campos_tiempo = ["Años", "Meses", "Semanas", "Días"]
+        # Campos comunes de tiempo (los añadimos solo cuando correspondan);
+        # con las dos fechas cargadas se usan ellas y la convención en lugar de años/meses/...
+        campos_tiempo = ["Años", "Meses", "Semanas", "Días", "Fecha inicial", "Fecha final", "Convención"]
 
         campos = []
         # INTERÉS SIMPLE
@@ -359,7 +371,12 @@ class UnifiedApp:
         r = 0
         for c in campos:
             ttk.Label(self.int_fields_frame, text=c + ":").grid(row=r, column=0, sticky="w")
-            e = ttk.Entry(self.int_fields_frame, width=20)
+            if c == "Convención":
+                from ConteoDias import CONVENCIONES
+                e = ttk.Combobox(self.int_fields_frame, values=CONVENCIONES, width=17)
+                e.set(CONVENCIONES[0])
+            else:
+                e = ttk.Entry(self.int_fields_frame, width=20)
             e.grid(row=r, column=1)
             self.int_inputs[c] = e
             r += 1
@@ -402,6 +419,17 @@ class UnifiedApp:
 
     def convertir_tiempo(self):
         # lee campos de tiempo que existan; devuelve años float (puede ser 0)
+        # o None si las fechas no son válidas
+        inicio = self.int_inputs.get("Fecha inicial", ttk.Entry()).get().strip()
+        fin = self.int_inputs.get("Fecha final", ttk.Entry()).get().strip()
+        if inicio and fin:
+            from ConteoDias import CONVENCIONES, fraccion_año
+            convencion = self.int_inputs.get("Convención", ttk.Entry()).get().strip().upper() or CONVENCIONES[0]
+            try:
+                return float(fraccion_año(inicio, fin, convencion))
+            except ValueError as e:
+                messagebox.showwarning("Fechas inválidas", f"Use AAAA-MM-DD o DD/MM/AAAA.\n{e}")
+                return None
         try:
             años = float(self.int_inputs.get("Años", ttk.Entry()).get() or 0)
         except Exception:
@@ -419,8 +447,8 @@ class UnifiedApp:
         except Exception:
             dias = 0.0
 
-        total_dias = años*360 + meses*30 + semanas*7 + dias
-        return total_dias / 360.0
+        from ConteoDias import dias_comerciales
+        return dias_comerciales(años, meses, semanas, dias) / 360.0
 
     def limpiar_interes(self):
         # limpiar todos los inputs del frame de interés (incluida tabla de tramos)
@@ -458,6 +486,15 @@ class UnifiedApp:
             except:
                 return None
 
+        # fórmulas: MotorInteres.py (el mismo motor que calcula lotes de contratos)
+        from MotorInteres import resolver, MOTIVOS, TablaTramos, interes_por_tramos
+
+        def motor(incognita, **datos):
+            valor, motivo = resolver(tipo, incognita, **datos).escalar()
+            if valor is None:
+                messagebox.showerror("Error", f"No puede calcularse {incognita}: {MOTIVOS[motivo].lower()}.")
+            return valor
+
         # helper para mostrar resultado
         self.int_reporte.configure(state="normal")
         self.int_reporte.delete("1.0", "end")
@@ -469,6 +506,8 @@ class UnifiedApp:
         VF = get_val("Valor Futuro (VF)")
         I = get_val("Interés (I)")
         t_from_fields = self.convertir_tiempo()  # años (puede ser 0)
+        if t_from_fields is None:
+            return
 
         # VALIDACIONES INICIALES por caso
         # INTERÉS SIMPLE
@@ -481,7 +520,9 @@ class UnifiedApp:
                 if t_from_fields == 0:
                     if not messagebox.askyesno("Tiempo = 0", "No ingresaste tiempo (resultado inmediato). ¿Continuar con t=0?"):
                         return
-                VF_calc = VP * (1 + i * t_from_fields)
+                VF_calc = motor("VF", VP=VP, i=i, t=t_from_fields)
+                if VF_calc is None:
+                    return
                 lines.append(f"Tipo: Interés Simple — Valor Futuro (VF)")
                 lines.append(f"VP = {VP:.2f}, i = {i:.6f}, t = {t_from_fields:.6f} años")
                 lines.append(f"VF = {VF_calc:.2f}")
@@ -492,11 +533,12 @@ class UnifiedApp:
                 if t_from_fields is None:
                     messagebox.showwarning("Faltan datos", "Ingrese el tiempo.")
                     return
-                denom = (1 + i * t_from_fields)
-                if denom == 0:
+                if 1 + i * t_from_fields == 0:
                     messagebox.showerror("Error", "División por cero en cómputo de VP (1 + i*t = 0).")
                     return
-                VP_calc = VF / denom
+                VP_calc = motor("VP", VF=VF, i=i, t=t_from_fields)
+                if VP_calc is None:
+                    return
                 lines.append(f"Tipo: Interés Simple — Valor Presente (VP)")
                 lines.append(f"VF = {VF:.2f}, i = {i if i is not None else 'N/A'}, t = {t_from_fields:.6f} años")
                 lines.append(f"VP = {VP_calc:.2f}")
@@ -504,7 +546,9 @@ class UnifiedApp:
                 if VP is None or i is None:
                     messagebox.showwarning("Faltan datos", "Ingrese Capital (VP) y Tasa (i).")
                     return
-                I_calc = VP * i * t_from_fields
+                I_calc = motor("I", VP=VP, i=i, t=t_from_fields)
+                if I_calc is None:
+                    return
                 lines.append(f"Interés generado = {I_calc:.2f}")
             elif calc == "Tasa de interés (i)":
                 if VP is None or VF is None:
@@ -513,7 +557,9 @@ class UnifiedApp:
                 if t_from_fields == 0:
                     messagebox.showerror("Error", "No puede calcularse i con t = 0.")
                     return
-                i_calc = (VF / VP - 1) / t_from_fields
+                i_calc = motor("i", VF=VF, VP=VP, t=t_from_fields)
+                if i_calc is None:
+                    return
                 lines.append(f"Tasa i = {i_calc:.6f} ({i_calc*100:.4f}%)")
             elif calc == "Tiempo (t)":
                 if VP is None or VF is None or i is None:
@@ -522,7 +568,9 @@ class UnifiedApp:
                 if i == 0:
                     messagebox.showerror("Error", "No puede calcularse tiempo con i = 0.")
                     return
-                t_calc = (VF / VP - 1) / i
+                t_calc = motor("t", VF=VF, VP=VP, i=i)
+                if t_calc is None:
+                    return
                 lines.append(f"Tiempo t = {t_calc:.6f} años")
             else:
                 lines.append("Cálculo no reconocido para Interés Simple.")
@@ -533,18 +581,21 @@ class UnifiedApp:
                 if VP is None or i is None:
                     messagebox.showwarning("Faltan datos", "Ingrese VP y Tasa (i).")
                     return
-                VF_calc = VP * (1 + i) ** t_from_fields
+                VF_calc = motor("VF", VP=VP, i=i, t=t_from_fields)
+                if VF_calc is None:
+                    return
                 lines.append(f"Interés Compuesto — Valor Futuro")
                 lines.append(f"VF = {VF_calc:.2f}")
             elif calc == "Valor Presente (VP)":
                 if VF is None or i is None:
                     messagebox.showwarning("Faltan datos", "Ingrese VF y Tasa (i).")
                     return
-                denom = (1 + i) ** t_from_fields
-                if denom == 0:
+                if (1 + i) ** t_from_fields == 0:
                     messagebox.showerror("Error", "División por cero en cálculo de VP compuesto.")
                     return
-                VP_calc = VF / denom
+                VP_calc = motor("VP", VF=VF, i=i, t=t_from_fields)
+                if VP_calc is None:
+                    return
                 lines.append(f"Interés Compuesto — Valor Presente")
                 lines.append(f"VP = {VP_calc:.2f}")
             else:
@@ -560,8 +611,7 @@ class UnifiedApp:
             if not tabla:
                 messagebox.showwarning("Faltan tramos", "Defina Número de tramos y las tasas/días.")
                 return
-            total_interes = 0.0
-            detalle = []
+            tramos = []
             for idx, (t_e, d_e) in enumerate(tabla):
                 try:
                     tasa_pct = float(t_e.get().strip()) if t_e.get().strip() != "" else 0.0
@@ -569,12 +619,16 @@ class UnifiedApp:
                 except:
                     messagebox.showwarning("Entrada inválida", f"Tramo {idx+1} tiene entradas inválidas.")
                     return
-                tasa = tasa_pct / 100.0
-                años_tramo = dias / 360.0
-                interes_tramo = VP * tasa * años_tramo
-                total_interes += interes_tramo
-                detalle.append(f"Tramo {idx+1}: tasa={tasa_pct:.4f}%, días={dias:.0f} → interés={interes_tramo:.2f}")
-            VF_calc = VP + total_interes
+                tramos.append((tasa_pct / 100.0, dias))
+            # un solo contrato en el motor por tramos (MotorInteres.interes_por_tramos)
+            r = interes_por_tramos(VP, TablaTramos.desde_listas([tramos]))
+            if not r.valido[0]:
+                messagebox.showerror("Error", f"No puede calcularse el interés: {MOTIVOS[int(r.motivo[0])].lower()}.")
+                return
+            total_interes = r.interes[0]
+            VF_calc = r.VF[0]
+            detalle = [f"Tramo {idx+1}: tasa={tasa * 100:.4f}%, días={dias:.0f} → interés={interes_tramo:.2f}"
+                       for idx, ((tasa, dias), interes_tramo) in enumerate(zip(tramos, r.interes_tramos))]
             lines.append("Interés Simple con Variación de Tasas (sumatoria por tramos, interés simple sobre VP):")
             lines.append(f"VP = {VP:.2f}")
             lines.extend(detalle)
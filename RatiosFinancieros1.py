@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext
 import math
+from RegistroRatios import construir_registro, interpretar_lote
 
 # ---------- UTILIDADES ----------
 def safe_float(s):
@@ -13,42 +14,56 @@ def fmt_num(v): return "N/A" if v!=v else f"{v:,.2f}"
 def fmt_pct(v): return "N/A" if v!=v else f"{pct(v):.2f}%"
 
 # ---------- INTERPRETACIONES ----------
+# Una etiqueta por categoría (de la más baja a la más alta según los cortes de
+# RegistroRatios.py); la última es la de NaN (código -1), que aquí es la categoría
+# a la que caían las comparaciones con NaN en la versión con if.
+INTERPRETACIONES = {
+    "Razón corriente": (
+        "Insuficiente: riesgo de iliquidez.",
+        "Aceptable: cubre deudas de corto plazo.",
+        "Exceso de liquidez.",
+        "Exceso de liquidez.",
+    ),
+    "Prueba ácida": (
+        "Riesgo: depende de inventarios.",
+        "Buena liquidez sin inventario.",
+        "Riesgo: depende de inventarios.",
+    ),
+    "Capital de trabajo": (
+        "Negativo: riesgo de insolvencia.",
+        "Positivo: operación estable.",
+        "Negativo: riesgo de insolvencia.",
+    ),
+    "Rotación inventarios": ("Baja rotación.", "Adecuada.", "Muy alta.", "Muy alta."),
+    "Período promedio de inventarios": ("Razonable.", "Inventarios lentos.", "Inventarios lentos."),
+    "Rotación CxC": ("Cobranza lenta.", "Buena cobranza.", "Cobranza lenta."),
+    "Período promedio de cobro": ("Saludable.", "Cobro tardío.", "Cobro tardío."),
+    "Rotación activos": (
+        "Uso ineficiente de activos.",
+        "Activos eficientes.",
+        "Uso ineficiente de activos.",
+    ),
+    "Pasivo/Activo": (
+        "Bajo endeudamiento.",
+        "Moderado.",
+        "Alto endeudamiento.",
+        "Bajo endeudamiento.",
+    ),
+    "Deuda/Patrimonio": ("Estructura equilibrada.", "Riesgo alto.", "Estructura equilibrada."),
+    "Cobertura intereses": ("Débil cobertura.", "Adecuada.", "Débil cobertura."),
+    "Margen neto": ("Bajo.", "Adecuado.", "Excelente.", "Bajo."),
+    "ROA": ("Bajo.", "Aceptable.", "Bajo."),
+    "ROE": ("Bajo.", "Adecuado.", "Excelente retorno.", "Bajo."),
+}
+
 def interpretar(ratio, v):
-    if ratio=="Razón corriente":
-        if v<1: return "Insuficiente: riesgo de iliquidez."
-        if v<=2: return "Aceptable: cubre deudas de corto plazo."
-        return "Exceso de liquidez."
-    if ratio=="Prueba ácida":
-        return "Buena liquidez sin inventario." if v>=1 else "Riesgo: depende de inventarios."
-    if ratio=="Capital de trabajo":
-        return "Positivo: operación estable." if v>=0 else "Negativo: riesgo de insolvencia."
-    if ratio=="Rotación inventarios":
-        return "Adecuada." if 3<=v<=6 else ("Baja rotación." if v<3 else "Muy alta.")
-    if ratio=="Período promedio de inventarios":
-        return "Razonable." if v<=120 else "Inventarios lentos."
-    if ratio=="Rotación CxC":
-        return "Buena cobranza." if v>=4 else "Cobranza lenta."
-    if ratio=="Período promedio de cobro":
-        return "Saludable." if v<=90 else "Cobro tardío."
-    if ratio=="Rotación activos":
-        return "Activos eficientes." if v>=1 else "Uso ineficiente de activos."
-    if ratio=="Pasivo/Activo":
-        if v>0.6: return "Alto endeudamiento."
-        if v>=0.4: return "Moderado."
-        return "Bajo endeudamiento."
-    if ratio=="Deuda/Patrimonio":
-        return "Riesgo alto." if v>1 else "Estructura equilibrada."
-    if ratio=="Cobertura intereses":
-        return "Adecuada." if v>=2 else "Débil cobertura."
-    if ratio=="Margen neto":
-        return "Excelente." if v>0.15 else ("Adecuado." if v>=0.05 else "Bajo.")
-    if ratio=="ROA":
-        return "Aceptable." if v>=0.05 else "Bajo."
-    if ratio=="ROE":
-        if v>0.2: return "Excelente retorno."
-        if v>=0.1: return "Adecuado."
-        return "Bajo."
-    return "Sin interpretación."
+    spec = REGISTRO_RATIOS.get(ratio)
+    if spec is None: return "Sin interpretación."
+    return INTERPRETACIONES[ratio][spec.clasificar(v)]
+
+def interpretar_lote_ratio(ratio, valores):
+    # códigos por numpy.searchsorted + tabla de etiquetas: tabla[codigo] es la interpretación
+    return interpretar_lote(REGISTRO_RATIOS, INTERPRETACIONES, ratio, valores)
 
 # ---------- CAMPOS Y RATIOS ----------
 CATEGORIES={
@@ -75,22 +90,12 @@ FIELDS={
 }
 
 # ---------- CÁLCULO ----------
+# Registro declarativo (RegistroRatios.py): búsqueda O(1) en vez de la cadena de if
+REGISTRO_RATIOS = construir_registro(FIELDS)
+
 def calcular(r,vals):
-    if r=="Razón corriente": return safe_div(vals["Activo corriente"],vals["Pasivo corriente"])
-    if r=="Prueba ácida": return safe_div(vals["Activo corriente"]-vals["Inventarios"],vals["Pasivo corriente"])
-    if r=="Capital de trabajo": return vals["Activo corriente"]-vals["Pasivo corriente"]
-    if r=="Rotación inventarios": return safe_div(vals["Costo de ventas"],vals["Inventario promedio"])
-    if r=="Período promedio de inventarios": return safe_div(360,safe_div(vals["Costo de ventas"],vals["Inventario promedio"]))
-    if r=="Rotación CxC": return safe_div(vals["Ventas netas"],vals["Cuentas por cobrar"])
-    if r=="Período promedio de cobro": return safe_div(360,safe_div(vals["Ventas netas"],vals["Cuentas por cobrar"]))
-    if r=="Rotación activos": return safe_div(vals["Ventas netas"],vals["Activo total"])
-    if r=="Pasivo/Activo": return safe_div(vals["Pasivo total"],vals["Activo total"])
-    if r=="Deuda/Patrimonio": return safe_div(vals["Pasivo total"],vals["Patrimonio"])
-    if r=="Cobertura intereses": return safe_div(vals["UAII"],vals["Gastos por intereses"])
-    if r=="Margen neto": return safe_div(vals["Utilidad neta"],vals["Ventas netas"])
-    if r=="ROA": return safe_div(vals["Utilidad neta"],vals["Activo total"])
-    if r=="ROE": return safe_div(vals["Utilidad neta"],vals["Patrimonio"])
-    return float('nan')
+    spec = REGISTRO_RATIOS.get(r)
+    return spec.evaluar(vals) if spec else float('nan')
 
 # ---------- SCROLLABLE ----------
 class Scroll(ttk.Frame):
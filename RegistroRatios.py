@@ -0,0 +1,152 @@
+# ----------------- REGISTRO DECLARATIVO DE RATIOS -----------------
+# Tabla única de ratios (fórmula, unidad, plantilla de explicación y umbrales de
+# interpretación) compartida por FinanzasUnido.py, InterfazF.py, Parcial2Finanzas.py
+# y RatiosFinancieros1.py. Cada script construye su registro con sus propios nombres
+# de campo (FIELDS / FIELDS_FOR_RATIO): las fórmulas reciben los valores por posición.
+
+# ----------------- UTILIDADES -----------------
+def safe_div(a, b):
+    try:
+        return a / b if b != 0 else float('nan')
+    except:
+        return float('nan')
+
+def pct(v):
+    return v * 100 if v == v else float('nan')
+
+def fmt_num(v):
+    return "N/A" if v != v else f"{v:,.2f}"
+
+def fmt_pct(v):
+    return "N/A" if v != v else f"{pct(v):.2f}%"
+
+# ----------------- ESPECIFICACIÓN -----------------
+class RatioSpec:
+    """
+    Un ratio del registro.
+    - entradas: nombres de campo en el orden que espera `formula`.
+    - unidad: "num", "pct", "dias" o "vueltas" (solo afecta al formato).
+    - plantilla: texto de la explicación; {0}, {1}... son las entradas y {aux}
+      el valor intermedio de `auxiliar` (p. ej. la rotación en los períodos).
+    - cortes: ((valor, incluye), ...) ordenados de menor a mayor. Un valor pasa a la
+      categoría siguiente si v >= valor (incluye=True) o v > valor (incluye=False).
+    """
+    __slots__ = ("nombre", "entradas", "formula", "unidad", "plantilla", "auxiliar", "cortes", "_compilado")
+
+    def __init__(self, nombre, entradas, formula, unidad, plantilla, cortes, auxiliar=None):
+        self.nombre = nombre
+        self.entradas = tuple(entradas)
+        self.formula = formula
+        self.unidad = unidad
+        self.plantilla = plantilla
+        self.auxiliar = auxiliar
+        self.cortes = tuple(cortes)
+        self._compilado = None
+
+    def evaluar(self, valores):
+        """Solo el número: no construye ningún texto."""
+        return self.formula(*[valores.get(c, 0) for c in self.entradas])
+
+    def formatear(self, v):
+        """Texto del resultado tal como lo muestran los reportes."""
+        if self.unidad == "pct":
+            return fmt_pct(v)
+        if self.unidad == "dias":
+            return f"{fmt_num(v)} días"
+        return fmt_num(v)
+
+    def explicar(self, valores, v=None):
+        """Explicación del cálculo; se construye solo cuando se pide."""
+        args = [valores.get(c, 0) for c in self.entradas]
+        if v is None:
+            v = self.formula(*args)
+        aux = fmt_num(self.auxiliar(*args)) if self.auxiliar else ""
+        base = self.plantilla.format(*[fmt_num(a) for a in args], aux=aux)
+        if self.unidad == "vueltas":
+            return f"{base} = {fmt_num(v)} vueltas/año"
+        return f"{base} = {self.formatear(v)}"
+
+    def clasificar(self, v):
+        """Índice de categoría (0 = la más baja) según `cortes`; -1 si v es NaN."""
+        if v != v:
+            return -1
+        return sum(1 for c, incluye in self.cortes if (v >= c if incluye else v > c))
+
+    def compilar(self):
+        """Separa los cortes en dos arrays ordenados (>= y >) para numpy.searchsorted."""
+        if self._compilado is None:
+            import numpy as np  # solo el modo por lotes necesita numpy
+            cerrados = np.array(sorted(c for c, incluye in self.cortes if incluye), dtype=np.float64)
+            abiertos = np.array(sorted(c for c, incluye in self.cortes if not incluye), dtype=np.float64)
+            self._compilado = (cerrados, abiertos)
+        return self._compilado
+
+    def clasificar_lote(self, valores):
+        """
+        Igual que clasificar() para un array de valores: devuelve códigos int8
+        (0 = categoría más baja) y -1 donde el valor es NaN.
+        """
+        import numpy as np
+        v = np.asarray(valores, dtype=np.float64)
+        cerrados, abiertos = self.compilar()
+        # nº de cortes con v >= c  +  nº de cortes con v > c
+        codigos = np.searchsorted(cerrados, v, side="right") + np.searchsorted(abiertos, v, side="left")
+        codigos = codigos.astype(np.int8)
+        codigos[np.isnan(v)] = -1
+        return codigos
+
+# ----------------- TABLA BASE -----------------
+# Los umbrales son los de interpret_ratio / interpretar (iguales en todos los scripts).
+_BASE = {
+    # Liquidez
+    "Razón corriente": dict(formula=lambda ac, pc: safe_div(ac, pc), unidad="num",
+                            plantilla="{0} / {1}", cortes=((1, True), (2, False))),
+    "Prueba ácida": dict(formula=lambda ac, inv, pc: safe_div(ac - inv, pc), unidad="num",
+                         plantilla="({0} - {1}) / {2}", cortes=((1, True),)),
+    "Capital de trabajo": dict(formula=lambda ac, pc: ac - pc, unidad="num",
+                               plantilla="{0} - {1}", cortes=((0, True),)),
+    # Actividad
+    "Rotación inventarios": dict(formula=lambda cv, inv: safe_div(cv, inv), unidad="vueltas",
+                                 plantilla="{0} / {1}", cortes=((3, True), (6, False))),
+    "Período promedio de inventarios": dict(formula=lambda cv, inv: safe_div(360, safe_div(cv, inv)), unidad="dias",
+                                            plantilla="360 / {aux}", cortes=((120, False),),
+                                            auxiliar=lambda cv, inv: safe_div(cv, inv)),
+    "Rotación CxC": dict(formula=lambda vn, cxc: safe_div(vn, cxc), unidad="num",
+                         plantilla="{0} / {1}", cortes=((4, True),)),
+    "Período promedio de cobro": dict(formula=lambda vn, cxc: safe_div(360, safe_div(vn, cxc)), unidad="dias",
+                                      plantilla="360 / {aux}", cortes=((90, False),),
+                                      auxiliar=lambda vn, cxc: safe_div(vn, cxc)),
+    "Rotación activos": dict(formula=lambda vn, at: safe_div(vn, at), unidad="num",
+                             plantilla="{0} / {1}", cortes=((1, True),)),
+    # Endeudamiento
+    "Pasivo/Activo": dict(formula=lambda pt, at: safe_div(pt, at), unidad="pct",
+                          plantilla="{0} / {1}", cortes=((0.4, True), (0.6, False))),
+    "Deuda/Patrimonio": dict(formula=lambda pt, pat: safe_div(pt, pat), unidad="num",
+                             plantilla="{0} / {1}", cortes=((1, False),)),
+    "Cobertura intereses": dict(formula=lambda uaii, gi: safe_div(uaii, gi), unidad="num",
+                                plantilla="{0} / {1}", cortes=((2, True),)),
+    # Rentabilidad
+    "Margen neto": dict(formula=lambda un, vn: safe_div(un, vn), unidad="pct",
+                        plantilla="{0} / {1}", cortes=((0.05, True), (0.15, False))),
+    "ROA": dict(formula=lambda un, at: safe_div(un, at), unidad="pct",
+                plantilla="{0} / {1}", cortes=((0.05, True),)),
+    "ROE": dict(formula=lambda un, pat: safe_div(un, pat), unidad="pct",
+                plantilla="{0} / {1}", cortes=((0.10, True), (0.20, False))),
+}
+
+def construir_registro(campos_por_ratio):
+    """Devuelve {nombre: RatioSpec} usando los nombres de campo del script (FIELDS)."""
+    return {nombre: RatioSpec(nombre, campos, **_BASE[nombre])
+            for nombre, campos in campos_por_ratio.items() if nombre in _BASE}
+
+def evaluar_todos(registro, valores):
+    """Evalúa todos los ratios del registro sobre un mismo dict de valores (sin textos)."""
+    return {nombre: spec.evaluar(valores) for nombre, spec in registro.items()}
+
+def interpretar_lote(registro, etiquetas, nombre, valores):
+    """
+    Clasifica un array de valores del ratio `nombre`.
+    Devuelve (codigos, tabla): `etiquetas[nombre]` tiene una etiqueta por categoría
+    y al final la de "no disponible", así que tabla[codigo] sirve también para -1 (NaN).
+    """
+    return registro[nombre].clasificar_lote(valores), etiquetas[nombre]
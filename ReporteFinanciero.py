@@ -0,0 +1,224 @@
+# ======================================================
+# INFORME FINANCIERO (sin interfaz)
+# ======================================================
+# Gráfico y PDF del informe de Final.py como funciones puras (los textos A–D
+# están en TextosAnalisis.py, sin dependencias, y se reexportan aquí):
+# todo entra por parámetro (r, textos, bytes del gráfico, destino) y nada se
+# guarda en variables globales ni en archivos temporales compartidos. Lo usan
+# la ventana de Final.py y la generación masiva de InformesLote.py. La figura
+# está en Graficos.py, compartida con Final1.py y prueba.py.
+import io
+import html
+import re
+import datetime
+
+from TextosAnalisis import construir_textos, filas_resumen
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, PageBreak, Flowable
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib.colors import HexColor
+
+# ======================================================
+# PALETA DE COLORES CORPORATIVA
+# ======================================================
+COLOR_PRIMARIO = HexColor("#2C3E50")  # Azul Oscuro (Midnight Blue)
+COLOR_SECUNDARIO = HexColor("#3498DB") # Azul Brillante
+COLOR_ACENTO = HexColor("#E74C3C")    # Rojo Suave
+COLOR_FONDO_TABLA = HexColor("#ECF0F1") # Gris muy claro
+COLOR_TEXTO = HexColor("#34495E")     # Gris oscuro (mejor que negro puro)
+
+EMPRESA_POR_DEFECTO = "Innovatech Solutions"
+
+# ======================================================
+# GRÁFICO
+# ======================================================
+
+def grafico_png(r, dpi=300):
+    """PNG del gráfico de Final.py en memoria (bytes), listo para Image() de ReportLab."""
+    # matplotlib solo se carga si el anexo es PNG (el vectorial no lo necesita)
+    from Graficos import GraficoMemoria, figura_final
+    return GraficoMemoria(figura_final(r)).png(dpi=dpi, ajustado=True)
+
+# ======================================================
+# GENERACIÓN DE PDF - DISEÑO PROFESIONAL "DESIGNER"
+# ======================================================
+
+def draw_cover(canvas, doc):
+    """Dibuja una portada elegante con franja lateral y tipografía grande."""
+    canvas.saveState()
+    
+    # Franja lateral azul oscura
+    canvas.setFillColor(COLOR_PRIMARIO)
+    canvas.rect(0, 0, 2.5*inch, 11*inch, fill=1, stroke=0)
+    
+    # Cuadrado decorativo rojo
+    canvas.setFillColor(COLOR_ACENTO)
+    canvas.rect(2.5*inch, 8*inch, 0.5*inch, 0.5*inch, fill=1, stroke=0)
+
+    # Título Principal
+    canvas.setFillColor(HexColor("#2C3E50"))
+    canvas.setFont("Helvetica-Bold", 36)
+    canvas.drawString(3.2*inch, 8*inch, "INFORME")
+    canvas.drawString(3.2*inch, 7.5*inch, "FINANCIERO")
+    canvas.drawString(3.2*inch, 7.0*inch, "ESTRATÉGICO")
+
+    # Línea divisoria
+    canvas.setStrokeColor(HexColor("#BDC3C7"))
+    canvas.setLineWidth(2)
+    canvas.line(3.2*inch, 6.7*inch, 7.5*inch, 6.7*inch)
+
+    # Subtítulo / Fecha
+    today = datetime.date.today().strftime("%d de %B, %Y")
+    canvas.setFillColor(HexColor("#7F8C8D"))
+    canvas.setFont("Helvetica", 14)
+    canvas.drawString(3.2*inch, 6.4*inch, f"Generado el: {today}")
+    canvas.drawString(3.2*inch, 6.1*inch, getattr(doc, "empresa", EMPRESA_POR_DEFECTO))
+
+    # Texto en la franja lateral (blanco, rotado)
+    canvas.setFillColor(colors.white)
+    canvas.setFont("Helvetica-Bold", 40)
+    canvas.translate(1.5*inch, 4*inch)
+    canvas.rotate(90)
+    canvas.drawString(0, 0, "2024-2025")
+    
+    canvas.restoreState()
+
+def draw_header_footer(canvas, doc):
+    """Dibuja encabezado y pie de página en páginas de contenido."""
+    canvas.saveState()
+    
+    # Encabezado
+    canvas.setFillColor(COLOR_PRIMARIO)
+    canvas.rect(0, 10.5*inch, 8.5*inch, 0.5*inch, fill=1, stroke=0)
+    canvas.setFillColor(colors.white)
+    canvas.setFont("Helvetica-Bold", 10)
+    canvas.drawString(0.5*inch, 10.65*inch, "ANÁLISIS FINANCIERO INTEGRAL")
+    
+    # Pie de página
+    canvas.setStrokeColor(COLOR_SECUNDARIO)
+    canvas.setLineWidth(1)
+    canvas.line(0.5*inch, 0.75*inch, 8*inch, 0.75*inch)
+    
+    canvas.setFillColor(COLOR_TEXTO)
+    canvas.setFont("Helvetica", 9)
+    page_num = doc.page
+    canvas.drawRightString(8*inch, 0.5*inch, f"Página {page_num}")
+    canvas.drawString(0.5*inch, 0.5*inch, "Confidencial - Uso Interno")
+    
+    canvas.restoreState()
+
+def construir_pdf(r, textos, destino, grafico=None, empresa=EMPRESA_POR_DEFECTO):
+    """
+    Escribe el informe en `destino` (ruta o archivo binario).
+    - textos: (A, B, C, D) como los devuelve construir_textos().
+    - grafico: Drawing de GraficosPDF.py (vectorial), bytes PNG, ruta de
+      imagen o None para omitir el anexo.
+    """
+    # Estilos Personalizados
+    styles = getSampleStyleSheet()
+    
+    # Estilo Título de Sección (Grande y Azul)
+    style_h1 = ParagraphStyle('H1_Pro', parent=styles['Heading1'],
+                              fontName='Helvetica-Bold', fontSize=18,
+                              textColor=COLOR_PRIMARIO, spaceAfter=12, spaceBefore=20,
+                              borderPadding=5, borderWidth=0, borderColor=COLOR_PRIMARIO)
+
+    # Estilo Texto Normal (Limpio y legible)
+    style_body = ParagraphStyle('Body_Pro', parent=styles['Normal'],
+                                fontName='Helvetica', fontSize=10, leading=14,
+                                textColor=COLOR_TEXTO, spaceAfter=8, alignment=4) # Justificado
+
+    # Estilo Tabla (Cebra)
+    style_table = TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), COLOR_PRIMARIO), # Encabezado Azul Oscuro
+        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0,0), (-1,0), 10),
+        ('BOTTOMPADDING', (0,0), (-1,0), 8),
+        ('TOPPADDING', (0,0), (-1,0), 8),
+        # Filas alternas
+        ('ROWBACKGROUNDS', (0,1), (-1,-1), [COLOR_FONDO_TABLA, colors.white]),
+        ('GRID', (0,0), (-1,-1), 0.5, HexColor("#BDC3C7")),
+        ('FONTNAME', (0,1), (0,-1), 'Helvetica-Bold'), # Primera columna negrita
+        ('ALIGN', (0,1), (0,-1), 'LEFT'),
+    ])
+
+    Story = []
+    
+    # Espacio inicial para no solapar con la portada (que se dibuja aparte)
+    # En realidad usamos PageBreak para empezar el contenido limpio
+    Story.append(PageBreak())
+
+    # --- FUNCIÓN HELPER PARA PROCESAR TEXTO ---
+    def add_section(text_input, title=""):
+        if title:
+            Story.append(Paragraph(title.upper(), style_h1))
+            Story.append(Spacer(1, 0.1*inch))
+            # Línea decorativa debajo del título
+            # (No es un objeto de flujo, así que usamos un truco con Tabla vacía o imagen, 
+            # pero mejor confiamos en el estilo del header)
+
+        if not text_input: return
+
+        # Limpiar y procesar texto
+        lines = text_input.split('\n')
+        for line in lines:
+            line = line.strip()
+            if not line: continue
+            
+            # Detectar si es un subtítulo interno (Empieza con A1., B1., etc)
+            if re.match(r'^[A-D]\d\.', line) or "DIAGNÓSTICO" in line or "RECOMENDACIONES" in line:
+                 sub_style = ParagraphStyle('Sub', parent=style_body, fontName='Helvetica-Bold', fontSize=11, textColor=COLOR_SECUNDARIO, spaceBefore=6)
+                 clean = line.replace('*', '')
+                 Story.append(Paragraph(clean, sub_style))
+            else:
+                # Convertir **texto** a <b>texto</b> para ReportLab
+                line = html.escape(line)
+                line = re.sub(r'\*\*(.*?)\*\*', r'<font color="#2C3E50"><b>\1</b></font>', line) # Negritas en azul oscuro
+                Story.append(Paragraph(line, style_body))
+
+    # --- CONTENIDO ---
+    
+    # Sección A y B
+    add_section(textos[0])
+    Story.append(Spacer(1, 0.2*inch))
+    add_section(textos[1])
+    
+    Story.append(PageBreak()) # Salto de página para gráficos y resto
+
+    # Sección C y D
+    add_section(textos[2])
+    Story.append(Spacer(1, 0.2*inch))
+    add_section(textos[3])
+
+    # --- TABLA RESUMEN (Ahora estilo PRO) ---
+    Story.append(Spacer(1, 0.3*inch))
+    Story.append(Paragraph("TABLA RESUMEN DE INDICADORES", style_h1))
+    
+    matriz_data = filas_resumen(r)
+    
+    t = Table(matriz_data, colWidths=[2*inch, 1.2*inch, 1.2*inch, 1.5*inch])
+    t.setStyle(style_table)
+    Story.append(t)
+
+    # --- IMAGEN GRÁFICO ---
+    if grafico is not None and grafico != b"":
+        Story.append(PageBreak())
+        Story.append(Paragraph("ANEXO GRÁFICO", style_h1))
+        if isinstance(grafico, Flowable):
+            Story.append(grafico)   # Drawing vectorial (GraficosPDF.py)
+        else:
+            fuente = io.BytesIO(grafico) if isinstance(grafico, bytes) else grafico
+            img = Image(fuente, width=6.5*inch, height=5.5*inch)
+            Story.append(img)
+
+    # Construir PDF con Portada y Layouts
+    doc = SimpleDocTemplate(destino, pagesize=letter, rightMargin=50, leftMargin=50, topMargin=50, bottomMargin=50)
+    doc.empresa = empresa
+    
+    # Asignamos las funciones de dibujo a los eventos
+    doc.build(Story, onFirstPage=draw_cover, onLaterPages=draw_header_footer)
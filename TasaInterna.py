@@ -0,0 +1,270 @@
+# ======================================================
+# TASA INTERNA DE RETORNO (TIR) PARA MUCHOS FLUJOS
+# ======================================================
+# MotorInteres.interes_compuesto("i", ...) despeja la tasa con la fórmula
+# cerrada (VF/VP)^(1/t) - 1, que solo sirve con un pago al inicio y otro al
+# final. Con varios flujos (cuotas, cupones, un proyecto con inversiones y
+# retornos) la tasa es la raíz del valor actual neto:
+#
+#   VAN(r) = sum_k flujo_k / (1 + r)^k = 0      (k = 0, 1, ..., períodos)
+#
+# y no tiene fórmula. tir() resuelve una fila de flujos por instrumento:
+#
+#   1. Newton vectorizado desde `estimacion` (por defecto, la tasa del
+#      compuesto entre el total invertido y el total cobrado): cada iteración evalúa VAN y su
+#      derivada para todas las filas que siguen activas (Horner en
+#      v = 1/(1+r), un recorrido por los períodos). Ningún paso baja más de
+#      la mitad de la distancia a -1. Cada fila sale del conjunto activo al
+#      converger o si Newton se escapa (paso no finito o r <= -1).
+#   2. Las que no convergieron pasan a bisección: se busca un intervalo con
+#      cambio de signo sobre una grilla fija de tasas y se lo parte a la
+#      mitad hasta la tolerancia.
+#
+# Sin cambio de signo en los flujos no hay TIR (FUERA_DE_DOMINIO); con
+# varios cambios puede haber más de una y se obtiene la más cercana a la
+# estimación (o, en bisección, la menor de la grilla). La tasa es por
+# período de los flujos.
+#
+#   r = tir([[-1000, 300, 400, 500], [-500, 0, 0, 800]])
+#   r.valor, r.motivo, r.iteraciones, r.biseccion
+#
+#   python TasaInterna.py --benchmark 100000 --periodos 60
+import time
+
+import numpy as np
+
+from MotorInteres import ResultadoInteres, OK, FALTAN_DATOS, FUERA_DE_DOMINIO
+
+# Tasas donde se busca el cambio de signo para la bisección
+GRILLA_BISECCION = np.array([-0.99, -0.9, -0.5, -0.2, 0.0, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0,
+                             10.0, 100.0, 1e4])
+
+class ResultadoTasa(ResultadoInteres):
+    """ResultadoInteres con iteraciones de Newton y si la fila terminó por bisección."""
+    __slots__ = ("iteraciones", "biseccion")
+
+    def __init__(self, valor, motivo, iteraciones, biseccion):
+        super().__init__("TIR", valor, motivo)
+        self.iteraciones = iteraciones
+        self.biseccion = biseccion
+
+def matriz_flujos(listas):
+    """Listas de flujos de distinto largo -> matriz rellenada con 0 (no cambia el VAN)."""
+    largo = max((len(f) for f in listas), default=0)
+    m = np.zeros((len(listas), largo), dtype=np.float64)
+    for k, f in enumerate(listas):
+        m[k, :len(f)] = f
+    return m
+
+def van(tasa, flujos, derivada=False):
+    """
+    VAN de cada fila de `flujos` (filas, períodos) a su `tasa`. Con
+    derivada=True devuelve (VAN, dVAN/dr).
+    """
+    flujos = np.atleast_2d(flujos)
+    v = 1.0 / (1.0 + np.broadcast_to(np.asarray(tasa, dtype=np.float64), (len(flujos),)))
+    p = flujos[:, -1].copy()
+    dp = np.zeros_like(p)
+    # Horner desde el último período: p = sum flujo_k v^k, dp = dp/dv
+    for k in range(flujos.shape[1] - 2, -1, -1):
+        if derivada:
+            dp *= v
+            dp += p
+        p *= v
+        p += flujos[:, k]
+    if derivada:
+        return p, -dp * v * v           # dv/dr = -v^2
+    return p
+
+def _datos(flujos):
+    if isinstance(flujos, (list, tuple)) and flujos and isinstance(flujos[0], (list, tuple)):
+        flujos = matriz_flujos(flujos)
+    flujos = np.asfortranarray(np.atleast_2d(np.asarray(flujos, dtype=np.float64)))
+    motivo = np.zeros(len(flujos), dtype=np.int8)
+    hay_positivo = (flujos > 0).any(axis=1)
+    hay_negativo = (flujos < 0).any(axis=1)
+    motivo[~(hay_positivo & hay_negativo) | np.isinf(flujos).any(axis=1)] = FUERA_DE_DOMINIO
+    motivo[np.isnan(flujos).any(axis=1)] = FALTAN_DATOS
+    return flujos, motivo
+
+def _biseccion(flujos, tol, max_iter):
+    """(tasa, encontrada) por bisección sobre la grilla; tasa NaN si no hay cambio de signo."""
+    n = len(flujos)
+    with np.errstate(all="ignore"):
+        valores = np.column_stack([van(np.full(n, r), flujos) for r in GRILLA_BISECCION])
+    signo = np.sign(valores)
+    exacta = signo == 0
+    cambio = (signo[:, :-1] * signo[:, 1:] < 0) & np.isfinite(valores[:, :-1]) & np.isfinite(valores[:, 1:])
+    # primer punto de la grilla donde el VAN es 0 o cambia de signo
+    tiene_exacta, tiene_cambio = exacta.any(axis=1), cambio.any(axis=1)
+    tasa = np.full(n, np.nan)
+    tasa[tiene_exacta] = GRILLA_BISECCION[exacta.argmax(axis=1)[tiene_exacta]]
+    filas = np.flatnonzero(tiene_cambio & ~tiene_exacta)
+    j = cambio.argmax(axis=1)[filas]
+    a, b = GRILLA_BISECCION[j], GRILLA_BISECCION[j + 1]
+    fa = valores[filas, j]
+    F = flujos[filas]
+    for _ in range(max_iter):
+        if not len(filas):
+            break
+        m = 0.5 * (a + b)
+        fm = van(m, F)
+        izquierda = np.sign(fm) == np.sign(fa)
+        a = np.where(izquierda, m, a)
+        fa = np.where(izquierda, fm, fa)
+        b = np.where(izquierda, b, m)
+        listo = (b - a <= tol * (1 + np.abs(m))) | (fm == 0)
+        if listo.any():
+            tasa[filas[listo]] = np.where(fm[listo] == 0, m[listo], 0.5 * (a[listo] + b[listo]))
+            seguir = ~listo
+            filas, a, b, fa, F = filas[seguir], a[seguir], b[seguir], fa[seguir], F[seguir]
+    return tasa, ~np.isnan(tasa)
+
+def estimacion_inicial(flujos):
+    """
+    Tasa de arranque por fila: la fórmula cerrada del compuesto (VF/VP)^(1/t) - 1
+    tomando como VP los flujos negativos, como VF los positivos y como t la
+    distancia entre sus períodos medios (ponderados por monto).
+    """
+    k = np.arange(flujos.shape[1], dtype=np.float64)
+    positivos = np.where(flujos > 0, flujos, 0.0)
+    negativos = np.where(flujos < 0, -flujos, 0.0)
+    with np.errstate(all="ignore"):
+        VF, VP = positivos.sum(axis=1), negativos.sum(axis=1)
+        t = positivos @ k / VF - negativos @ k / VP
+        r = (VF / VP) ** (1 / t) - 1
+    return np.where(np.isfinite(r) & (r > -1) & (t > 0), r, 0.1)
+
+def tir(flujos, estimacion=None, tol=1e-12, max_iter=50, max_biseccion=200):
+    """
+    TIR por período de cada fila de `flujos` (filas, períodos; flujo del
+    período 0 en la primera columna). estimacion=None arranca cada fila en
+    estimacion_inicial(). Filas sin solución: valor NaN y el motivo de
+    MotorInteres.
+    """
+    flujos, motivo = _datos(flujos)
+    n = len(flujos)
+    if estimacion is None:
+        r = estimacion_inicial(flujos)
+    else:
+        r = np.broadcast_to(np.asarray(estimacion, dtype=np.float64), (n,)).copy()
+    iteraciones = np.zeros(n, dtype=np.int32)
+    convergida = np.zeros(n, dtype=bool)
+    activas = np.flatnonzero(motivo == OK)
+    F = flujos[activas]
+    with np.errstate(all="ignore"):
+        for _ in range(max_iter):
+            if not len(activas):
+                break
+            f, df = van(r[activas], F, derivada=True)
+            actual = r[activas]
+            paso = f / df
+            # cerca de -1 el VAN crece como (1+r)^-períodos: un paso que se pasa
+            # hacia la izquierda deja a Newton avanzando de a poco; se limita a
+            # recorrer a lo sumo la mitad de la distancia hasta -1
+            paso = np.minimum(paso, 0.5 * (1 + actual))
+            nueva = actual - paso
+            escapada = ~np.isfinite(nueva) | (nueva <= -1)
+            lista = ~escapada & (np.abs(paso) <= tol * (1 + np.abs(nueva)))
+            r[activas] = np.where(escapada, actual, nueva)
+            iteraciones[activas] += 1
+            convergida[activas[lista]] = True
+            # las escapadas se resuelven por bisección
+            seguir = ~(lista | escapada)
+            activas, F = activas[seguir], F[seguir]
+
+    biseccion = (motivo == OK) & ~convergida
+    if biseccion.any():
+        filas = np.flatnonzero(biseccion)
+        tasa, encontrada = _biseccion(flujos[filas], tol, max_biseccion)
+        r[filas] = tasa
+        motivo[filas[~encontrada]] = FUERA_DE_DOMINIO
+    r[motivo != OK] = np.nan
+    return ResultadoTasa(r, motivo, iteraciones, biseccion)
+
+def tasa_implicita(precio, flujos, estimacion=None):
+    """Tasa que iguala `precio` (pagado en el período 0) con los `flujos` de los períodos 1, 2, ..."""
+    flujos = np.atleast_2d(np.asarray(flujos, dtype=np.float64))
+    precio = np.atleast_1d(np.asarray(precio, dtype=np.float64))
+    filas = max(len(flujos), len(precio))
+    flujos = np.broadcast_to(flujos, (filas, flujos.shape[1]))
+    precio = np.broadcast_to(precio, (filas,))
+    return tir(np.column_stack([-precio, flujos]), estimacion)
+
+# ======================================================
+# BENCHMARK
+# ======================================================
+
+def _tir_escalar(flujos, tol=1e-12, max_iter=50):
+    """Newton fila por fila en Python puro (la forma directa), con bisección si falla."""
+    VF = sum(c for c in flujos if c > 0)
+    VP = -sum(c for c in flujos if c < 0)
+    t = sum(k * c for k, c in enumerate(flujos) if c > 0) / VF + sum(k * c for k, c in enumerate(flujos) if c < 0) / VP
+    r = (VF / VP) ** (1 / t) - 1 if t > 0 else 0.1
+    for _ in range(max_iter):
+        f = df = 0.0
+        for k, c in enumerate(flujos):
+            d = (1 + r) ** -k
+            f += c * d
+            df -= k * c * d / (1 + r)
+        if df == 0:
+            break
+        nueva = r - f / df
+        if nueva <= -1:
+            break
+        if abs(nueva - r) <= tol * (1 + abs(nueva)):
+            return nueva
+        r = nueva
+    a, b = -0.99, 1e4
+    fa = sum(c * (1 + a) ** -k for k, c in enumerate(flujos))
+    for _ in range(200):
+        m = 0.5 * (a + b)
+        fm = sum(c * (1 + m) ** -k for k, c in enumerate(flujos))
+        if (fm > 0) == (fa > 0):
+            a, fa = m, fm
+        else:
+            b = m
+        if b - a <= tol * (1 + abs(m)):
+            break
+    return 0.5 * (a + b)
+
+def flujos_sinteticos(n, periodos=60, semilla=0):
+    """Inversión en el período 0 y retornos ruidosos; algunas filas con un flujo negativo en el medio."""
+    rnd = np.random.default_rng(semilla)
+    flujos = rnd.uniform(50, 150, (n, periodos + 1))
+    flujos[:, 0] = -rnd.uniform(0.5, 1.5, n) * flujos[:, 1:].sum(axis=1) / rnd.uniform(1.1, 3, n)
+    medio = rnd.random(n) < 0.1
+    flujos[medio, periodos // 2] -= rnd.uniform(200, 2000, medio.sum())
+    return flujos.round(2)
+
+def benchmark_tir(n=100_000, periodos=60, muestra=2000):
+    """tir() contra Newton fila por fila en Python (medido en `muestra` filas y extrapolado)."""
+    flujos = flujos_sinteticos(n, periodos)
+    t0 = time.perf_counter()
+    r = tir(flujos)
+    t_vec = time.perf_counter() - t0
+    m = min(muestra, n)
+    filas = flujos[:m].tolist()
+    t0 = time.perf_counter()
+    ref = np.array([_tir_escalar(f) for f in filas])
+    t_bucle = (time.perf_counter() - t0) * n / m
+
+    validas = r.valido[:m]
+    dif = float(np.max(np.abs(r.valor[:m][validas] - ref[validas]))) if validas.any() else 0.0
+    residuo = np.abs(van(r.valor[r.valido], flujos[r.valido])) / np.abs(flujos[r.valido, 0])
+    print(f"{n} filas de {periodos + 1} flujos")
+    print(f"bucle Python {t_bucle * 1000:9.0f} ms (est. con {m} filas)   vectorizado {t_vec * 1000:8.1f} ms   "
+          f"x{t_bucle / t_vec:6.1f}")
+    print(f"válidas {int(r.valido.sum())}/{n}   por bisección {int(r.biseccion.sum())}   "
+          f"iteraciones de Newton: media {r.iteraciones.mean():.1f}, máx. {r.iteraciones.max()}")
+    print(f"máx. dif. con el bucle {dif:.1e}   máx. |VAN| / inversión {float(residuo.max()):.1e}")
+    return t_bucle, t_vec
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="TIR vectorizada (Newton + bisección) contra un bucle por fila.")
+    p.add_argument("--benchmark", type=int, metavar="N", default=100_000, help="filas de flujos")
+    p.add_argument("--periodos", type=int, default=60)
+    p.add_argument("--muestra", type=int, default=2000, help="filas medidas con el bucle de Python")
+    a = p.parse_args()
+    benchmark_tir(a.benchmark, a.periodos, a.muestra)
@@ -0,0 +1,103 @@
+# ======================================================
+# TEXTOS DEL ANÁLISIS (sin dependencias)
+# ======================================================
+# Secciones A–D del informe de Final.py y la tabla resumen, a partir del dict
+# de AnalisisFinanciero.calcular_todo(). Solo usa la biblioteca estándar para
+# que la línea de comandos (AnalisisConsola.py) arranque sin Tk, matplotlib ni
+# ReportLab; el PDF (ReporteFinanciero.py) usa estas mismas funciones.
+import re
+
+def construir_textos(r):
+    """Textos de las secciones A–D a partir del dict de calcular_todo()."""
+    textos = []
+
+    # A. PATRIMONIAL
+    t = "🏆 **ANÁLISIS PATRIMONIAL**\n\n"
+    t += "A1. FONDO DE MANIOBRA\n"
+    t += f"FM 2023: {r['FM_2023']:.2f} | FM 2024: {r['FM_2024']:.2f} (Var: {r['FM_2024'] - r['FM_2023']:+.2f})\n"
+    t += f"Interpretación: FM **{ 'positivo' if r['FM_2024'] >= 0 else 'negativo'}**. Situación de **EQUILIBRIO**.\n\n"
+    t += "A2. ESTRUCTURA 2024\n"
+    t += f"AC: {r['vertical_AC']:.1f}% | ANC: {r['vertical_ANC']:.1f}% | PN: {r['vertical_PN']:.1f}% | Pasivo: {100-r['vertical_PN']:.1f}%\n\n"
+    t += "A3. CICLO DE EFECTIVO\n"
+    t += f"CCE: **{r['CCE']:.0f} días**. Tiempo de financiación del ciclo operativo.\n"
+    textos.append(t)
+
+    # B. FINANCIERO
+    t = "💰 **ANÁLISIS FINANCIERO**\n\n"
+    t += "B1. LIQUIDEZ\n"
+    t += f"Liquidez General: **{r['LG_2024']:.2f}** (Óptimo 1.5-2.0)\n"
+    t += f"Tesorería: **{r['T_2024']:.2f}** (Óptimo 0.7-1.0)\n"
+    status_liq = "EXCESO DE LIQUIDEZ" if r['LG_2024'] > 2 else "PROBLEMAS DE LIQUIDEZ" if r['LG_2024'] < 1 else "LIQUIDEZ ÓPTIMA"
+    t += f"Diagnóstico: **{status_liq}**.\n\n"
+    t += "B2. SOLVENCIA\n"
+    t += f"Garantía: **{r['garantia_2024']:.2f}** | Autonomía: **{r['autonomia_2024']:.2f}**\n"
+    t += "B3. ESTRÉS\n"
+    t += f"Punto de Quiebre: **{r['PQ']:.2f} Bs**. Escenario -30% ventas: {'PERDIDAS' if r['Ingresos_2025_sim'] < r['PQ'] else 'BENEFICIOS'}.\n"
+    textos.append(t)
+
+    # C. ECONOMICO
+    t = "📈 **ANÁLISIS ECONÓMICO**\n\n"
+    t += "C1. RENTABILIDAD\n"
+    t += f"RAT (ROA) 2024: **{r['RAT_2024']:.2f}%** (Antes: {r['RAT_2023']:.2f}%)\n"
+    t += f"RRP (ROE) 2024: **{r['RRP_2024']:.2f}%** (Antes: {r['RRP_2023']:.2f}%)\n"
+    t += "C2. DUPONT\n"
+    t += f"Margen: {r['margen_neto_dupont']:.2f} x Rotación: {r['rotacion_activo']:.2f} x Apalancamiento: {r['apalancamiento_dupont']:.2f}\n\n"
+    t += "C3. APALANCAMIENTO\n"
+    tipo = "POSITIVO" if r['RAT_2024'] > r['costo_deuda'] else "NEGATIVO"
+    t += f"Efecto: **{tipo}**. Costo deuda: {r['costo_deuda']:.2f}% vs ROA: {r['RAT_2024']:.2f}%.\n"
+    textos.append(t)
+
+    # D. DIAGNOSTICO
+    t = "🌟 **DIAGNÓSTICO INTEGRAL**\n\n"
+    t += "D1. RESUMEN\n"
+    t += f"Salud Financiera: **{'MUY BUENA' if r['RRP_2024'] > 10 and r['garantia_2024'] > 1.2 else 'PRECAUCIÓN'}**.\n"
+    t += "Fortalezas: Rentabilidad (ROE), Solvencia.\n"
+    t += "Debilidades: Gestión de liquidez (excesiva), Eficiencia de cobros.\n\n"
+    t += "D2. RECOMENDACIONES\n"
+    t += "1. Reducir Días Clientes para mejorar flujo.\n"
+    t += f"2. Refinanciar deuda a largo plazo ({r['transferencia_deuda']:.0f} Bs).\n"
+    t += "3. Invertir excedentes de caja.\n"
+    textos.append(t)
+    return tuple(textos)
+
+def filas_resumen(r):
+    """Tabla resumen de indicadores (encabezado + filas), igual que en el PDF."""
+    return [
+        ["INDICADOR", "2023", "2024", "ESTADO"],
+        ["Fondo Maniobra", f"{r['FM_2023']:.0f}", f"{r['FM_2024']:.0f}", "OK" if r['FM_2024']>0 else "RIESGO"],
+        ["Liquidez Gral.", f"{r['LG_2023']:.2f}", f"{r['LG_2024']:.2f}", "ALTA" if r['LG_2024']>2 else "BAJA" if r['LG_2024']<1 else "OPTIMA"],
+        ["Rentabilidad (ROE)", f"{r['RRP_2023']:.1f}%", f"{r['RRP_2024']:.1f}%", "MEJORA" if r['RRP_2024']>r['RRP_2023'] else "BAJA"],
+        ["Garantía", f"{r['garantia_2023']:.2f}", f"{r['garantia_2024']:.2f}", "SOLIDO"],
+    ]
+
+# ======================================================
+# MARKDOWN
+# ======================================================
+
+_SUBTITULO = re.compile(r'^[A-D]\d\.')
+
+def seccion_markdown(texto):
+    """Una sección A–D en Markdown: su título como ##, los apartados A1., B2.... como ###."""
+    salida = []
+    for i, linea in enumerate(texto.strip().split("\n")):
+        linea = linea.strip()
+        if not linea:
+            continue
+        if i == 0 or _SUBTITULO.match(linea):
+            if salida and salida[-1]: salida.append("")
+            salida.extend([("## " + linea.replace("**", "")) if i == 0 else "### " + linea, ""])
+        else:
+            salida.append(linea + "  ")   # dos espacios: salto de línea en Markdown
+    return "\n".join(salida).rstrip() + "\n"
+
+def informe_markdown(r, textos, titulo="Informe financiero"):
+    """Informe completo en Markdown: secciones A–D y tabla resumen."""
+    partes = [f"# {titulo}\n"]
+    partes.extend(seccion_markdown(t) for t in textos)
+    filas = filas_resumen(r)
+    tabla = ["## Tabla resumen de indicadores", "",
+             "| " + " | ".join(filas[0]) + " |",
+             "|" + "---|" * len(filas[0])]
+    tabla.extend("| " + " | ".join(f) + " |" for f in filas[1:])
+    partes.append("\n".join(tabla) + "\n")
+    return "\n".join(partes)
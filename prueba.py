@@ -1,18 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import math
-import matplotlib
-matplotlib.use("TkAgg")
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-# NUEVAS IMPORTACIONES PARA PDF
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch
-# Importación para guardar el gráfico de Matplotlib
-import io
+# matplotlib (Graficos.py, backend TkAgg) y ReportLab se importan al dibujar el
+# gráfico o generar el PDF, no al abrir la ventana (ver MedirArranque.py)
 import os 
 # ======================================================
 # FUNCIONES DE CÁLCULO
@@ -177,6 +167,13 @@ def calcular_resultados(data):
 
 # NUEVA FUNCIÓN PARA GENERAR EL PDF
 def generar_pdf(data, r, root):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import inch
+    # Gráfico compartido con la pestaña D, renderizado en memoria
+    from Graficos import renderizar
     try:
         # 1. Definir el documento PDF
         doc = SimpleDocTemplate("Informe_Analisis_Financiero.pdf", pagesize=letter)
@@ -259,21 +256,9 @@ def generar_pdf(data, r, root):
         story.append(Spacer(1, 0.25*inch))
         
         # --- Gráfico de Matplotlib ---
-        fig = Figure(figsize=(5, 4))
-        ax = fig.add_subplot(111)
-        
-        ratios = ["FM (Bs)", "Liq. Gral", "RAT (%)", "RRP (%)"]
-        valores_2024 = [r["FM_2024"], r["LG_2024"], r["RAT_2024"], r["RRP_2024"]]
-        
-        ax.bar(ratios, valores_2024, color=['#1f77b4', '#ff7f0e', '#2ca02c', '#9467bd'])
-        ax.set_title("Indicadores Clave 2024")
-        
-        # Guardar el gráfico en memoria para ReportLab
-        img_data = io.BytesIO()
-        fig.savefig(img_data, format='png')
-        img_data.seek(0)
-        
-        story.append(Image(img_data, 4*inch, 3*inch))
+        # Misma figura que la pestaña D (Graficos.py): si ya se dibujó con estos
+        # resultados se reutilizan los bytes PNG en memoria
+        story.append(renderizar("prueba", r).imagen_pdf(4*inch, 3*inch))
         story.append(Spacer(1, 0.5*inch))
 
         # Construir el PDF
@@ -637,16 +622,8 @@ def runD():
     for w in fig_frame.winfo_children():
         w.destroy()
 
-    fig = Figure(figsize=(5,4))
-    ax = fig.add_subplot(111)
-    
-    ratios = ["FM (Bs)", "Liq. Gral", "RAT (%)", "RRP (%)"]
-    valores_2024 = [r["FM_2024"], r["LG_2024"], r["RAT_2024"], r["RRP_2024"]]
-    
-    ax.bar(ratios, valores_2024, color=['#1f77b4', '#ff7f0e', '#2ca02c', '#9467bd'])
-    ax.set_title("Indicadores Clave 2024", fontsize=10)
-    
-    canvas = FigureCanvasTkAgg(fig, master=fig_frame)
+    from Graficos import renderizar, canvas_tk
+    canvas = canvas_tk(renderizar("prueba", r).fig, fig_frame)
     canvas.draw()
     canvas.get_tk_widget().pack()
 
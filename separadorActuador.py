@@ -0,0 +1,269 @@
+# ======================================================
+# ACTUADOR SERIE DEL SEPARADOR
+# ======================================================
+# Antes, enviar_comando escribía un byte a Arduino en cada cuadro clasificado,
+# aunque el material no hubiera cambiado: a 15 cuadros/s son 15 escrituras
+# por segundo por un enlace de 9600 baudios, y cualquier cuadro ruidoso movía
+# la compuerta. ActuadorSerial:
+#
+#   - suaviza: el material es el que gana por mayoría en los últimos
+#     `ventana` cuadros (VotoMayoritario); sin mayoría se queda el anterior;
+#   - solo envía cuando ese material cambia;
+#   - escribe en un hilo propio, así enviar() no bloquea al pipeline; entre
+#     dos escrituras pasa al menos `intervalo_min` y, si mientras tanto el
+#     material cambió varias veces, solo se envía el último.
+#
+# PuertoPty es un Arduino falso sobre un pseudo-terminal (os.openpty): el
+# actuador escribe en un extremo como en un puerto serie, al ritmo de los
+# baudios configurados, y un hilo lee el otro extremo y guarda cada byte con
+# su hora de llegada. Sirve para probar el protocolo y los tiempos sin placa:
+#
+#   python separadorActuador.py --simular 600 --ruido 0.2
+import os
+import time
+import threading
+from collections import Counter, deque
+
+from separadorPipeline import ColaReciente, EstadisticasLatencia
+
+# Comando de un byte para Arduino por material; 'D' si no se reconoce
+COMANDOS = {"Plastico": b'P', "Metal": b'M', "Organico": b'O'}
+COMANDO_DESCONOCIDO = b'D'
+
+# ======================================================
+# SUAVIZADO TEMPORAL
+# ======================================================
+
+class VotoMayoritario:
+    """
+    voto(material) -> material estable. Gana el material con más de la mitad
+    de los últimos `ventana` votos; mientras ninguno la tenga (o la ventana no
+    se haya llenado) se devuelve el último ganador (None al principio).
+    """
+    def __init__(self, ventana=5):
+        self.ventana = max(1, ventana)
+        self.actual = None
+        self._votos = deque(maxlen=self.ventana)
+        self._cuenta = Counter()
+
+    def __call__(self, material):
+        if len(self._votos) == self.ventana:
+            viejo = self._votos[0]
+            self._cuenta[viejo] -= 1
+        self._votos.append(material)
+        self._cuenta[material] += 1
+        if len(self._votos) == self.ventana:
+            ganador, votos = self._cuenta.most_common(1)[0]
+            if votos * 2 > self.ventana:
+                self.actual = ganador
+        return self.actual
+
+# ======================================================
+# ESCRITOR NO BLOQUEANTE
+# ======================================================
+
+class ActuadorSerial:
+    """
+    actuador.enviar(material): para usar como `enviar` de PipelineSeparador.
+    `puerto` es cualquier objeto con write(bytes) (serial.Serial, PuertoPty).
+    `al_enviar(material, comando)` se llama en el hilo escritor después de
+    cada escritura (p. ej. para imprimir). cerrar() envía lo pendiente y
+    termina el hilo; no cierra el puerto.
+    """
+    def __init__(self, puerto, comandos=COMANDOS, ventana=5, intervalo_min=0.05, al_enviar=None):
+        self.puerto = puerto
+        self.comandos = comandos
+        self.voto = VotoMayoritario(ventana)
+        self.intervalo_min = intervalo_min
+        self.al_enviar = al_enviar
+        self.recibidos = 0          # materiales que llegaron a enviar()
+        self.enviados = 0           # bytes escritos en el puerto
+        self.escritura = EstadisticasLatencia()
+        self.error = None
+        self._pedido = None         # último material estable pedido al escritor
+        self._cola = ColaReciente(1)
+        self._hilo = threading.Thread(target=self._escritor, name="separador-serie", daemon=True)
+        self._hilo.start()
+
+    def comando(self, material):
+        return self.comandos.get(material, COMANDO_DESCONOCIDO)
+
+    def enviar(self, material):
+        self.recibidos += 1
+        estable = self.voto(material)
+        if estable is not None and estable != self._pedido:
+            self._pedido = estable
+            self._cola.poner(estable)
+
+    def _escritor(self):
+        escrito = None
+        ultimo = float("-inf")
+        try:
+            while True:
+                material = self._cola.sacar(timeout=0.1)
+                if material is None:
+                    if self._cola.cerrada:
+                        break
+                    continue
+                espera = ultimo + self.intervalo_min - time.perf_counter()
+                if espera > 0:
+                    time.sleep(espera)
+                    # durante la espera pudo llegar un material más nuevo
+                    nuevo = self._cola.sacar(timeout=0)
+                    if nuevo is not None:
+                        material = nuevo
+                if material == escrito:
+                    continue
+                comando = self.comando(material)
+                t0 = time.perf_counter()
+                self.puerto.write(comando)
+                ultimo = time.perf_counter()
+                self.escritura.registrar(ultimo - t0)
+                self.enviados += 1
+                escrito = material
+                if self.al_enviar is not None:
+                    self.al_enviar(material, comando)
+        except Exception as e:
+            self.error = e
+
+    @property
+    def reemplazados(self):
+        """Cambios que no llegaron a escribirse porque hubo uno más nuevo."""
+        return self._cola.descartados
+
+    def cerrar(self, timeout=2.0):
+        self._cola.cerrar()
+        self._hilo.join(timeout)
+
+    def estadisticas(self):
+        return {"recibidos": self.recibidos, "enviados": self.enviados,
+                "reemplazados": self.reemplazados, "escritura": self.escritura.resumen()}
+
+# ======================================================
+# ARDUINO FALSO SOBRE UN PSEUDO-TERMINAL
+# ======================================================
+
+class PuertoPty:
+    """
+    Puerto serie falso. write() escribe en el extremo esclavo del pty y tarda
+    lo que tardaría la línea real (10 bits por byte a `baudios`; 0 = sin
+    demora). Un hilo lee el extremo maestro: `recibidos` es la lista de
+    (t_llegada, byte) en segundos de time.perf_counter(). `nombre` es la ruta
+    del dispositivo (/dev/pts/N), por si se quiere abrir con serial.Serial.
+    """
+    def __init__(self, baudios=9600):
+        import tty
+        self.baudios = baudios
+        self._maestro, self._esclavo = os.openpty()
+        tty.setraw(self._esclavo)                  # sin eco ni búfer de línea
+        self.nombre = os.ttyname(self._esclavo)
+        self.recibidos = []
+        self._lock = threading.Lock()
+        self._hilo = threading.Thread(target=self._leer, name="arduino-pty", daemon=True)
+        self._hilo.start()
+
+    def write(self, datos):
+        os.write(self._esclavo, datos)
+        if self.baudios:
+            time.sleep(len(datos) * 10 / self.baudios)
+        return len(datos)
+
+    def _leer(self):
+        while True:
+            try:
+                datos = os.read(self._maestro, 1024)
+            except OSError:
+                break
+            if not datos:
+                break
+            t = time.perf_counter()
+            with self._lock:
+                self.recibidos.extend((t, bytes([b])) for b in datos)
+
+    def bytes_recibidos(self):
+        with self._lock:
+            return b"".join(b for _, b in self.recibidos)
+
+    def close(self):
+        os.close(self._esclavo)
+        self._hilo.join(1.0)
+        os.close(self._maestro)
+
+# ======================================================
+# SIMULACIÓN: UN BYTE POR CUADRO CONTRA ACTUADORSERIAL
+# ======================================================
+
+def secuencia_ruidosa(n, tramo=30, ruido=0.2, materiales=("Plastico", "Metal", "Organico", "Desconocido"),
+                      semilla=0):
+    """
+    (reales, clasificados): el material real cambia cada `tramo` cuadros y el
+    clasificador se equivoca con probabilidad `ruido`.
+    """
+    import random
+    rnd = random.Random(semilla)
+    reales, clasificados = [], []
+    for i in range(n):
+        real = materiales[(i // tramo) % len(materiales)]
+        reales.append(real)
+        clasificados.append(rnd.choice(materiales) if rnd.random() < ruido else real)
+    return reales, clasificados
+
+def simular(n=600, fps=15.0, ruido=0.2, ventana=5, intervalo_min=0.05, baudios=9600, tramo=30):
+    """
+    Reproduce una secuencia ruidosa a `fps` contra dos Arduinos falsos: el
+    envío original (write bloqueante en cada cuadro) y ActuadorSerial.
+    Imprime bytes enviados, cambios de compuerta y el tiempo que enviar()
+    retiene al hilo del pipeline.
+    """
+    reales, clasificados = secuencia_ruidosa(n, tramo, ruido)
+    cambios_reales = sum(a != b for a, b in zip(reales, reales[1:])) + 1
+    periodo = 1.0 / fps if fps > 0 else 0.0
+
+    def reproducir(enviar):
+        lat = EstadisticasLatencia()
+        proximo = time.perf_counter()
+        for material in clasificados:
+            t0 = time.perf_counter()
+            enviar(material)
+            lat.registrar(time.perf_counter() - t0)
+            proximo += periodo
+            espera = proximo - time.perf_counter()
+            if espera > 0:
+                time.sleep(espera)
+        return lat.resumen()
+
+    filas = []
+    puerto = PuertoPty(baudios)
+    lat = reproducir(lambda m: puerto.write(COMANDOS.get(m, COMANDO_DESCONOCIDO)))
+    time.sleep(0.05)
+    filas.append(("un byte por cuadro", puerto.bytes_recibidos(), lat))
+    puerto.close()
+
+    puerto = PuertoPty(baudios)
+    actuador = ActuadorSerial(puerto, ventana=ventana, intervalo_min=intervalo_min)
+    lat = reproducir(actuador.enviar)
+    actuador.cerrar()
+    time.sleep(0.05)
+    filas.append((f"ActuadorSerial (ventana {ventana})", puerto.bytes_recibidos(), lat))
+    puerto.close()
+
+    print(f"{n} cuadros a {fps:g} fps, {baudios} baudios, ruido {ruido:.0%}, "
+          f"{cambios_reales} materiales reales distintos seguidos")
+    for nombre, recibido, lat in filas:
+        cambios = sum(a != b for a, b in zip(recibido, recibido[1:])) + (1 if recibido else 0)
+        print(f"{nombre:<28} bytes {len(recibido):<5} cambios de compuerta {cambios:<5} "
+              f"enviar(): p50 {lat['p50_ms']:6.3f} ms  p99 {lat['p99_ms']:6.3f} ms")
+    return filas
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Actuador serie del separador contra un Arduino falso (pty).")
+    p.add_argument("--simular", type=int, metavar="N", default=600, help="cuadros a reproducir")
+    p.add_argument("--fps", type=float, default=15.0)
+    p.add_argument("--ruido", type=float, default=0.2, help="probabilidad de que un cuadro se clasifique mal")
+    p.add_argument("--tramo", type=int, default=30, help="cuadros seguidos del mismo material real")
+    p.add_argument("--ventana", type=int, default=5, help="cuadros del voto por mayoría")
+    p.add_argument("--intervalo-ms", type=float, default=50.0, help="mínimo entre dos comandos")
+    p.add_argument("--baudios", type=int, default=9600)
+    a = p.parse_args()
+    simular(a.simular, a.fps, a.ruido, a.ventana, a.intervalo_ms / 1000.0, a.baudios, a.tramo)
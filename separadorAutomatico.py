@@ -1,116 +1,123 @@
 import cv2
-import numpy as np
-import tensorflow as tf
-import tensorflow_hub as hub
 import serial
 import time
 
+from separadorActuador import ActuadorSerial
+from separadorCompuerta import CompuertaMovimiento
+from separadorPipeline import PipelineSeparador, imprimir_estadisticas
+from separadorInferencia import ClasificadorPorLotes
+from separadorMateriales import DecisorMaterial, object_to_material
+from separadorModelo import DIR_MODELOS, cargar
+
+# Ritmo de captura en cuadros por segundo (0 = el que entregue la cámara).
+# Reemplaza al time.sleep(0.2) fijo entre cuadros.
+FPS_OBJETIVO = 15.0
+
+# Inferencia por lotes: hasta LOTE_MAX cuadros por llamada a model(...),
+# esperando a lo sumo ESPERA_LOTE_MS a que se junten. LOTE_MAX = 1 vuelve al
+# cuadro por cuadro; más lote da más cuadros/s, más espera da más latencia.
+LOTE_MAX = 4
+ESPERA_LOTE_MS = 10.0
+
 # Configurar la conexión serial (ajusta el puerto y la velocidad según tu Arduino)
 try:
     arduino = serial.Serial('COM4', 9600)  # Cambia 'COM4' por el puerto correcto
-    time.sleep(5)  # Esperar a que se establezca la conexión
+    t_conexion = time.time()
 except serial.SerialException as e:
     print(f"Error de conexión con Arduino: {e}")
     exit(1)
 
-# Cargar el modelo preentrenado desde TensorFlow Hub (MobileNetV2)
-model = hub.load("https://tfhub.dev/google/tf2-preview/mobilenet_v2/classification/4")
-
-# Imágenes de entrenamiento de ImageNet tienen resolución 224x224
-IMAGE_SHAPE = (224, 224)
-
-# Cargar las etiquetas de ImageNet (mapa de IDs a nombres de clases)
-labels_path = tf.keras.utils.get_file(
-    'ImageNetLabels.txt', 
-    'https://storage.googleapis.com/download.tensorflow.org/data/ImageNetLabels.txt')
-imagenet_labels = np.array(open(labels_path).read().splitlines())
-
-# Mapeo manual de productos a materiales (metal, plástico, orgánico)
-object_to_material = {
-    "bottle": "Plastico",
-    "water bottle": "Plastico",
-    "plastic bag": "Plastico",
-    "knife": "Metal",
-    "fork": "Metal",
-    "spoon": "Metal",
-    "apple": "Organico",
-    "banana": "Organico",
-    "orange": "Organico",
-    "carrot": "Organico",
-    "can": "Metal",
-    "scissors": "Metal",
-    "straw": "Plastico",
-    "cup": "Plastico",
-    "paper cup": "Plastico", 
-    "glass bottle": "Metal",
-    "aluminum foil": "Metal",
-    "toothbrush": "Plastico",
-    "pen": "Plastico",
-    "chair": "Plastico",
-    "table": "Plastico",
-    "pizza": "Organico",
-    "sandwich": "Organico",
-    "broccoli": "Organico",
-    "lettuce": "Organico",
-    "cucumber": "Organico",
-    "zucchini": "Organico",
-    "soda can": "Metal",
-    "nail": "Metal",
-    "screw": "Metal",
-    "hammer": "Metal",
-    "tire": "Plastico",
-}
+# Cargar el modelo preentrenado (MobileNetV2) y las etiquetas de ImageNet desde
+# el almacén local, sin red (separadorModelo.py; exportar una vez con
+# `python separadorModelo.py --exportar`). `model` es un BackendInferencia:
+# FORMATO_MODELO elige "savedmodel" (TensorFlow), "tflite", "tflite_int8"
+# (cuantizado; comparar antes con --benchmark-backends) o None = el mejor
+# formato exportado.
+FORMATO_MODELO = None
+try:
+    model, imagenet_labels, formato = cargar(DIR_MODELOS, FORMATO_MODELO)
+except (FileNotFoundError, ValueError) as e:
+    print(f"Error al cargar el modelo: {e}")
+    arduino.close()
+    exit(1)
+print(f"Modelo cargado de {DIR_MODELOS} ({formato})")
 
-def map_prediction_to_material(predictions):
-    imagenet_label = imagenet_labels[np.argmax(predictions)]
-    for object_name, material in object_to_material.items():
-        if object_name in imagenet_label.lower():
-            return material
-    return "Desconocido"
+# Esperar a que se establezca la conexión (5 s desde que se abrió el puerto;
+# la carga del modelo ya consumió parte de esa espera)
+time.sleep(max(0.0, 5 - (time.time() - t_conexion)))
 
-# Capturar imagen desde la cámara
-cap = cv2.VideoCapture(0)
+# Etiqueta de ImageNet -> material: la tabla de object_to_material se resuelve
+# una vez para las 1001 clases (separadorMateriales.py). TOP_K = 1 decide por
+# la clase más probable; con más, por la probabilidad sumada de las TOP_K
+# primeras clases de cada material.
+TOP_K = 1
+decisor = DecisorMaterial(imagenet_labels, object_to_material, top_k=TOP_K)
 
-while True:
-    ret, frame = cap.read()
-    if not ret:
-        print("Error al capturar la imagen.")
-        break
+def map_prediction_to_material(predictions):
+    return decisor(predictions)
 
-    # Preprocesar la imagen
-    resized_frame = cv2.resize(frame, IMAGE_SHAPE)
-    normalized_frame = np.array(resized_frame) / 255.0
+# Preprocesar los cuadros del lote, una predicción y un material por cuadro
+clasificar = ClasificadorPorLotes(model, decisor)
 
-    # Asegúrate de que la imagen sea de tipo float32
-    input_frame = np.expand_dims(normalized_frame.astype(np.float32), axis=0)  # Añadir batch dimension
+# Comandos a Arduino (P, M, O; 'D' si no se reconoce) desde un hilo propio
+# (separadorActuador.py): solo cuando cambia el material que gana por mayoría
+# en los últimos VENTANA_VOTO cuadros, y con al menos INTERVALO_COMANDO_MS
+# entre dos comandos. VENTANA_VOTO = 1 sigue cada cuadro.
+VENTANA_VOTO = 5
+INTERVALO_COMANDO_MS = 50.0
 
-    # Hacer predicción
-    predictions = model(input_frame)
-    material = map_prediction_to_material(predictions)
+def material_enviado(material, comando):
+    print(f"Material detectado: {material}")  # Imprimir para depuración
 
-    # Mostrar la imagen con la etiqueta
-    cv2.putText(frame, f'Material: {material}', (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-    cv2.imshow('Frame', frame)
+actuador = ActuadorSerial(arduino, ventana=VENTANA_VOTO, intervalo_min=INTERVALO_COMANDO_MS / 1000.0,
+                          al_enviar=material_enviado)
+enviar_comando = actuador.enviar
 
-    # Verificar el material detectado y enviar el comando a Arduino
-    print(f"Material detectado: {material}")  # Imprimir para depuración
-    
-    if material == "Plastico":
-        arduino.write(b'P')  # Enviar 'P' para Plástico
-    elif material == "Metal":
-        arduino.write(b'M')  # Enviar 'M' para Metal
-    elif material == "Organico":
-        arduino.write(b'O')  # Enviar 'O' para Orgánico
-    else:
-        arduino.write(b'D')  # Enviar 'D' si no se reconoce el material
-
-    # Esperar un poco antes de la próxima iteración
-    time.sleep(0.2)  # Ajusta el tiempo según sea necesario
+# Compuerta de movimiento (separadorCompuerta.py): solo se clasifican los
+# cuadros en los que algo se mueve dentro de ROI (x, y, ancho, alto; None =
+# cuadro completo), y solo el recorte de la ROI. USAR_COMPUERTA = False
+# clasifica todos los cuadros completos, como antes.
+USAR_COMPUERTA = True
+ROI = None
+compuerta = CompuertaMovimiento(ROI) if USAR_COMPUERTA else None
+
+# Capturar imagen desde la cámara. Captura, inferencia y envío corren en hilos
+# separados (separadorPipeline.py); este hilo solo muestra la imagen.
+cap = cv2.VideoCapture(0)
+pipeline = PipelineSeparador(cap.read, clasificar if LOTE_MAX > 1 else clasificar.uno, enviar_comando,
+                             fps_objetivo=FPS_OBJETIVO, lote_max=LOTE_MAX,
+                             espera_lote_ms=ESPERA_LOTE_MS, filtrar=compuerta).iniciar()
+
+mostrado = None
+while pipeline.activo:
+    cuadro = pipeline.ultima_captura
+    if cuadro is not None and cuadro is not mostrado:
+        # Mostrar la imagen con la etiqueta del último cuadro clasificado. Se
+        # dibuja en una copia: el cuadro (o su recorte) puede estar todavía
+        # en la cola de inferencia.
+        frame = cuadro.imagen.copy()
+        material = pipeline.ultimo.material if pipeline.ultimo is not None else "-"
+        if ROI is not None:
+            x, y, ancho, alto = ROI
+            cv2.rectangle(frame, (x, y), (x + ancho, y + alto), (0, 255, 0), 1)
+        cv2.putText(frame, f'Material: {material}', (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        cv2.imshow('Frame', frame)
+        mostrado = cuadro
 
     # Presionar 'q' para salir
     if cv2.waitKey(1) & 0xFF == ord('q'):
         break
 
+pipeline.detener()
+actuador.cerrar()
+if pipeline.error is not None:
+    print(f"Error en el pipeline: {pipeline.error}")
+if actuador.error is not None:
+    print(f"Error al escribir a Arduino: {actuador.error}")
+imprimir_estadisticas(pipeline.estadisticas())
+est = actuador.estadisticas()
+print(f"comandos: {est['enviados']} enviados por {est['recibidos']} cuadros clasificados")
+
 # Liberar la cámara y cerrar la conexión
 cap.release()
 cv2.destroyAllWindows()
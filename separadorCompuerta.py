@@ -0,0 +1,170 @@
+# ======================================================
+# COMPUERTA DE MOVIMIENTO: NO CLASIFICAR LA CINTA VACÍA
+# ======================================================
+# La mayoría de los cuadros de la cámara muestran la cinta sin nada encima y
+# aun así pasaban por el preprocesado y por MobileNetV2. CompuertaMovimiento
+# corre en el hilo de captura, antes de la cola de cuadros: mira solo la
+# región de interés (ROI) de la cinta, reducida `escala` veces por lado y en
+# gris, y la compara con un fondo que se actualiza de a poco (promedio
+# móvil, mucho más lento mientras hay movimiento). Si cambió más de
+# `fraccion` de los píxeles, el cuadro pasa a la inferencia recortado a la
+# ROI; si no, se omite. Después de un cuadro con movimiento la compuerta
+# sigue abierta `espera` cuadros más, para que el voto del actuador
+# (separadorActuador.py) tenga varios cuadros del objeto. Los cuadros
+# omitidos llegan al actuador como "Desconocido" (PipelineSeparador,
+# material_omitido): con la cinta vacía el voto pasa a 'D' y la compuerta
+# física no se queda con el comando del último objeto.
+#
+# En un cuadro de 640x480 con escala 8 la compuerta mira a lo sumo 80x60
+# píxeles: unos cien µs por cuadro contra los milisegundos de una inferencia.
+#
+#   python separadorCompuerta.py --benchmark 300
+import time
+
+import numpy as np
+
+# BGR -> gris (pesos de luminancia de ITU-R BT.601, los de cv2.cvtColor)
+_PESOS_GRIS = np.array([0.114, 0.587, 0.299], np.float32)
+
+class CompuertaMovimiento:
+    """
+    compuerta(imagen) -> recorte de la ROI si hay movimiento, None si no.
+
+    roi       (x, y, ancho, alto) en píxeles del cuadro; None = cuadro completo.
+    escala    se toma uno de cada `escala` píxeles por lado para comparar.
+    umbral    diferencia de gris (0–255) para que un píxel cuente como cambiado.
+    fraccion  parte de la ROI que tiene que cambiar para abrir la compuerta.
+    alfa      peso del cuadro nuevo en el fondo (promedio móvil; alfa/20 con movimiento).
+    espera    cuadros que la compuerta sigue abierta después del movimiento.
+    """
+    def __init__(self, roi=None, escala=8, umbral=20.0, fraccion=0.02, alfa=0.05, espera=5):
+        self.roi = tuple(roi) if roi is not None else None
+        self.escala = max(1, escala)
+        self.umbral = umbral
+        self.fraccion = fraccion
+        self.alfa = alfa
+        self.espera = espera
+        self.cuadros = 0
+        self.abiertos = 0
+        self.ultimo_cambio = 0.0    # fracción de la ROI que cambió en el último cuadro
+        self._fondo = None
+        self._restantes = 0
+
+    def recorte(self, imagen):
+        """La ROI de `imagen` (una vista, sin copiar)."""
+        if self.roi is None:
+            return imagen
+        x, y, ancho, alto = self.roi
+        return imagen[y:y + alto, x:x + ancho]
+
+    def _gris(self, imagen):
+        reducida = self.recorte(imagen)[::self.escala, ::self.escala]
+        return reducida @ _PESOS_GRIS
+
+    def movimiento(self, imagen):
+        """Compara con el fondo, lo actualiza y devuelve la fracción de la ROI que cambió."""
+        gris = self._gris(imagen)
+        if self._fondo is None:
+            self._fondo = gris
+            return 0.0
+        cambio = np.count_nonzero(np.abs(gris - self._fondo) > self.umbral) / gris.size
+        # con movimiento el fondo casi no se actualiza: si absorbiera al objeto,
+        # al salir este dejaría un "fantasma" que mantiene abierta la compuerta
+        alfa = self.alfa if cambio <= self.fraccion else self.alfa / 20
+        self._fondo += alfa * (gris - self._fondo)
+        return cambio
+
+    def __call__(self, imagen):
+        self.cuadros += 1
+        self.ultimo_cambio = self.movimiento(imagen)
+        if self.ultimo_cambio > self.fraccion:
+            self._restantes = self.espera + 1
+        if self._restantes <= 0:
+            return None
+        self._restantes -= 1
+        self.abiertos += 1
+        return self.recorte(imagen)
+
+def leer_roi(texto):
+    """"x,y,ancho,alto" -> tupla de enteros (para la línea de comandos)."""
+    roi = tuple(int(v) for v in texto.split(","))
+    if len(roi) != 4:
+        raise ValueError(f"ROI inválida: {texto!r} (se espera x,y,ancho,alto)")
+    return roi
+
+# ======================================================
+# CINTA SIMULADA Y BENCHMARK
+# ======================================================
+
+def escena_cinta(n, alto=480, ancho=640, periodo=60, paso=40, lado=120, ruido=4.0, semilla=0):
+    """
+    Genera n cuadros BGR uint8 de una cinta con ruido de sensor por la que
+    cada `periodo` cuadros cruza un objeto de `lado` píxeles a `paso`
+    píxeles por cuadro. Devuelve (cuadro, x_objeto) con x_objeto=None si no
+    hay objeto en el cuadro.
+    """
+    rnd = np.random.default_rng(semilla)
+    cinta = rnd.integers(60, 90, (alto, ancho, 3)).astype(np.float32)
+    objeto = rnd.integers(150, 255, (lado, lado, 3)).astype(np.float32)
+    y = (alto - lado) // 2
+    for i in range(n):
+        cuadro = cinta + rnd.normal(0.0, ruido, cinta.shape).astype(np.float32)
+        x = (i % periodo) * paso - lado
+        if x + lado > 0 and x < ancho:
+            a, b = max(x, 0), min(x + lado, ancho)
+            cuadro[y:y + lado, a:b] = objeto[:, a - x:b - x]
+        else:
+            x = None
+        yield np.clip(cuadro, 0, 255).astype(np.uint8), x
+
+def benchmark_compuerta(n=300, roi=(160, 120, 320, 240), escala=8, modelo=None):
+    """
+    Sobre la cinta simulada: µs por cuadro de la compuerta, cuadros que pasan
+    a la inferencia, aciertos contra la posición real del objeto y el costo
+    de un cuadro sin compuerta (preprocesado + modelo, medido en un recorte
+    de 224x224 para no depender de cv2.resize).
+    """
+    from separadorPreproceso import IMAGE_SHAPE, PreprocesadorLote
+    if modelo is None:
+        from separadorInferencia import ModeloSimulado
+        modelo = ModeloSimulado()
+    compuerta = CompuertaMovimiento(roi, escala)
+    x0, _, ancho_roi, _ = roi
+    lado = 120
+    tiempos, vacios, con_objeto, abiertos_vacios, abiertos_objeto = [], 0, 0, 0, 0
+    for cuadro, x in escena_cinta(n, lado=lado):
+        t0 = time.perf_counter()
+        recorte = compuerta(cuadro)
+        tiempos.append(time.perf_counter() - t0)
+        en_roi = x is not None and x < x0 + ancho_roi and x + lado > x0
+        con_objeto += en_roi
+        vacios += not en_roi
+        abiertos_objeto += en_roi and recorte is not None
+        abiertos_vacios += not en_roi and recorte is not None
+
+    prep = PreprocesadorLote()
+    muestra = [cuadro[:IMAGE_SHAPE[1], :IMAGE_SHAPE[0]].copy()]
+    np.asarray(modelo(prep(muestra)))
+    t0 = time.perf_counter()
+    for _ in range(20):
+        np.asarray(modelo(prep(muestra)))
+    inferencia = (time.perf_counter() - t0) / 20
+
+    tiempos.sort()
+    compuerta_us = tiempos[len(tiempos) // 2] * 1e6
+    print(f"compuerta         {compuerta_us:9.1f} µs/cuadro (mediana, ROI {roi[2]}x{roi[3]}, escala {escala})")
+    print(f"sin compuerta     {inferencia * 1e6:9.1f} µs/cuadro (preprocesado + modelo)  "
+          f"-> {inferencia * 1e6 / compuerta_us:.0f} veces la compuerta")
+    print(f"a la inferencia   {compuerta.abiertos}/{n} cuadros; con objeto en la ROI {abiertos_objeto}/{con_objeto}, "
+          f"cinta vacía {abiertos_vacios}/{vacios} (incluye los {compuerta.espera} de espera tras cada objeto)")
+    return {"compuerta_us": compuerta_us, "inferencia_us": inferencia * 1e6, "abiertos": compuerta.abiertos,
+            "con_objeto": (abiertos_objeto, con_objeto), "vacios": (abiertos_vacios, vacios)}
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Compuerta de movimiento del separador sobre una cinta simulada.")
+    p.add_argument("--benchmark", type=int, metavar="N", default=300, help="cuadros de la cinta simulada")
+    p.add_argument("--roi", type=leer_roi, default=(160, 120, 320, 240), help="x,y,ancho,alto")
+    p.add_argument("--escala", type=int, default=8)
+    a = p.parse_args()
+    benchmark_compuerta(a.benchmark, a.roi, a.escala)
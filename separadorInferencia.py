@@ -0,0 +1,195 @@
+# ======================================================
+# INFERENCIA POR LOTES DEL SEPARADOR
+# ======================================================
+# model(input_frame) con un lote de un solo cuadro deja ociosa la mayor parte
+# de la CPU: cada llamada recorre todos los pesos de MobileNetV2 para una
+# imagen. ClasificadorPorLotes arma un único tensor (n, 224, 224, 3) con los
+# cuadros que esperan en la cola del pipeline (separadorPipeline.py, lote_max
+# y espera_lote_ms), hace una sola llamada y reparte la fila de predicciones
+# de cada cuadro a su decisión.
+#
+#   python separadorInferencia.py --cuadros grabacion/ --lotes 1 2 4 8
+#   python separadorInferencia.py --sinteticos 240 --modelo simulado
+#
+# El benchmark reproduce cuadros guardados en disco (imágenes o .npy), así no
+# hace falta la cámara; con --modelo simulado tampoco TensorFlow.
+import os
+import time
+
+import numpy as np
+
+from separadorPreproceso import IMAGE_SHAPE, PreprocesadorLote
+
+URL_MODELO = "https://tfhub.dev/google/tf2-preview/mobilenet_v2/classification/4"
+
+# ======================================================
+# PREPROCESADO Y CLASIFICACIÓN
+# ======================================================
+
+def preprocesar(frame, forma=IMAGE_SHAPE):
+    """
+    (1, 224, 224, 3) float32 en [0, 1], en un array nuevo. Un cuadro que ya
+    tiene el tamaño no se redimensiona. El pipeline usa PreprocesadorLote,
+    que da lo mismo sin asignar memoria por cuadro.
+    """
+    if frame.shape[1::-1] != tuple(forma):
+        import cv2
+        frame = cv2.resize(frame, forma)
+    normalized_frame = np.array(frame) / 255.0
+    return np.expand_dims(normalized_frame.astype(np.float32), axis=0)  # Añadir batch dimension
+
+class ClasificadorPorLotes:
+    """
+    clasificador(imagenes) -> [material, ...]: una llamada a `modelo` por lote.
+    decidir(predicciones_de_un_cuadro) -> material, p. ej. map_prediction_to_material;
+    si tiene un método lote(matriz) (DecisorMaterial) se decide todo el lote de una vez.
+    El lote se arma en el buffer reservado de PreprocesadorLote (separadorPreproceso.py).
+    """
+    def __init__(self, modelo, decidir, preprocesador=None):
+        self.modelo = modelo
+        self.decidir = decidir
+        self.preprocesador = preprocesador or PreprocesadorLote()
+        self._decidir_lote = getattr(decidir, "lote", None)
+
+    def __call__(self, imagenes):
+        entrada = self.preprocesador(imagenes)
+        predicciones = np.asarray(self.modelo(entrada))
+        if self._decidir_lote is not None:
+            return self._decidir_lote(predicciones)
+        return [self.decidir(fila) for fila in predicciones]
+
+    def uno(self, imagen):
+        """Un solo cuadro (pipeline con lote_max=1)."""
+        return self([imagen])[0]
+
+# ======================================================
+# CUADROS GRABADOS Y MODELOS PARA MEDIR
+# ======================================================
+
+EXTENSIONES_IMAGEN = (".png", ".jpg", ".jpeg", ".bmp")
+
+def cargar_cuadros(carpeta, limite=None):
+    """Cuadros BGR uint8 de una carpeta (imágenes vía cv2.imread o arrays .npy), en orden de nombre."""
+    cuadros = []
+    for nombre in sorted(os.listdir(carpeta)):
+        ruta = os.path.join(carpeta, nombre)
+        if nombre.lower().endswith(".npy"):
+            cuadros.append(np.load(ruta))
+        elif nombre.lower().endswith(EXTENSIONES_IMAGEN):
+            import cv2
+            img = cv2.imread(ruta)
+            if img is not None:
+                cuadros.append(img)
+        if limite and len(cuadros) >= limite:
+            break
+    return cuadros
+
+def cargar_cuadros_etiquetados(carpeta, limite=None):
+    """
+    (cuadros, materiales): si `carpeta` tiene subcarpetas (una por material,
+    p. ej. Metal/, Plastico/) cada cuadro lleva el nombre de la suya; si no,
+    materiales es None.
+    """
+    subcarpetas = sorted(d for d in os.listdir(carpeta) if os.path.isdir(os.path.join(carpeta, d)))
+    if not subcarpetas:
+        return cargar_cuadros(carpeta, limite), None
+    cuadros, materiales = [], []
+    for nombre in subcarpetas:
+        nuevos = cargar_cuadros(os.path.join(carpeta, nombre), limite)
+        cuadros.extend(nuevos)
+        materiales.extend([nombre] * len(nuevos))
+    return cuadros, materiales
+
+def cuadros_sinteticos(n, forma=IMAGE_SHAPE, semilla=0):
+    """n cuadros aleatorios ya del tamaño del modelo (no necesitan cv2)."""
+    rnd = np.random.default_rng(semilla)
+    return [rnd.integers(0, 256, (forma[1], forma[0], 3), dtype=np.uint8) for _ in range(n)]
+
+class ModeloSimulado:
+    """
+    Sustituto de MobileNetV2 para medir sin TensorFlow: promedio 4x4 y una capa
+    densa a 1001 clases (37 MB de pesos float32). Como en la red real, una
+    llamada con n cuadros lee los pesos una sola vez. `pesos` permite usar
+    los de un almacén de modelos (separadorModelo.py, mapeados en memoria).
+    """
+    def __init__(self, clases=1001, forma=IMAGE_SHAPE, semilla=0, pesos=None):
+        if pesos is None:
+            pesos = self.pesos_simulados(clases, forma, semilla)
+        self.pesos = pesos
+
+    @staticmethod
+    def pesos_simulados(clases=1001, forma=IMAGE_SHAPE, semilla=0):
+        rnd = np.random.default_rng(semilla)
+        entradas = (forma[0] // 4) * (forma[1] // 4) * 3
+        return rnd.standard_normal((entradas, clases), dtype=np.float32) / np.sqrt(entradas)
+
+    def __call__(self, x):
+        n, alto, ancho, c = x.shape
+        x = x.reshape(n, alto // 4, 4, ancho // 4, 4, c).mean(axis=(2, 4))
+        logits = x.reshape(n, -1) @ self.pesos
+        logits -= logits.max(axis=1, keepdims=True)
+        e = np.exp(logits)
+        return e / e.sum(axis=1, keepdims=True)
+
+def cargar_modelo_hub():
+    import tensorflow_hub as hub
+    return hub.load(URL_MODELO)
+
+# ======================================================
+# BENCHMARK
+# ======================================================
+
+def benchmark_lotes(cuadros, modelo, lotes=(1, 2, 4, 8), espera_ms=10.0, fps_camara=30.0):
+    """
+    Para cada tamaño de lote:
+    - cuadros/s sin cámara (todos los cuadros en lotes seguidos: techo de throughput);
+    - el pipeline completo reproduciendo los cuadros a fps_camara: p50/p99 de
+      extremo a extremo, cuadros descartados y lote medio.
+    """
+    from separadorPipeline import PipelineSeparador
+
+    decidir = lambda fila: int(np.argmax(fila))
+    clasificador = ClasificadorPorLotes(modelo, decidir)
+    clasificador(cuadros[:1])   # calentar
+    filas = []
+    for lote in lotes:
+        t0 = time.perf_counter()
+        for i in range(0, len(cuadros), lote):
+            clasificador(cuadros[i:i + lote])
+        techo = len(cuadros) / (time.perf_counter() - t0)
+
+        fuente = iter(cuadros)
+        def leer():
+            c = next(fuente, None)
+            return c is not None, c
+        pipeline = PipelineSeparador(leer, clasificador if lote > 1 else clasificador.uno,
+                                     lambda m: None, fps_objetivo=fps_camara,
+                                     lote_max=lote, espera_lote_ms=espera_ms if lote > 1 else 0.0,
+                                     fuente_finita=True)
+        pipeline.iniciar().esperar()
+        est = pipeline.estadisticas()
+        e2e = est["extremo_a_extremo"]
+        fila = {"lote": lote, "cuadros_por_s": techo, "p50_ms": e2e["p50_ms"], "p99_ms": e2e["p99_ms"],
+                "clasificados": pipeline.cuadros_clasificados, "descartados": est["descartados"]["cuadros"],
+                "lote_medio": est["lote_medio"]}
+        filas.append(fila)
+        print(f"lote {lote:<3} {techo:7.1f} cuadros/s sin cámara | a {fps_camara:g} fps: "
+              f"p50 {fila['p50_ms']:7.1f} ms  p99 {fila['p99_ms']:7.1f} ms  "
+              f"clasificados {fila['clasificados']:<5} descartados {fila['descartados']:<5} "
+              f"lote medio {fila['lote_medio']:.2f}")
+    return filas
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Inferencia por lotes: throughput y latencia según el tamaño de lote.")
+    p.add_argument("--cuadros", metavar="CARPETA", help="cuadros grabados (imágenes o .npy)")
+    p.add_argument("--sinteticos", type=int, default=240, help="cuadros aleatorios si no hay --cuadros")
+    p.add_argument("--modelo", choices=("hub", "simulado"), default="hub")
+    p.add_argument("--lotes", type=int, nargs="+", default=[1, 2, 4, 8])
+    p.add_argument("--espera-ms", type=float, default=10.0, help="espera máxima para completar un lote")
+    p.add_argument("--fps", type=float, default=30.0, help="ritmo de la cámara simulada")
+    a = p.parse_args()
+
+    cuadros = cargar_cuadros(a.cuadros) if a.cuadros else cuadros_sinteticos(a.sinteticos)
+    modelo = cargar_modelo_hub() if a.modelo == "hub" else ModeloSimulado()
+    benchmark_lotes(cuadros, modelo, a.lotes, a.espera_ms, a.fps)
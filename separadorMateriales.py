@@ -0,0 +1,113 @@
+# ======================================================
+# ETIQUETA DE IMAGENET -> MATERIAL (tabla precalculada)
+# ======================================================
+# map_prediction_to_material buscaba, en cada cuadro, la etiqueta del argmax
+# como subcadena entre las ~32 entradas de object_to_material. El resultado
+# solo depende de la clase, así que se resuelve una vez al arrancar para las
+# 1001 etiquetas: `codigos[clase]` es el índice del material en MATERIALES y
+# la decisión por cuadro queda en un argmax y una indexación.
+#
+# Con top_k > 1 la decisión suma la probabilidad de las k clases más
+# probables por material (una reducción vectorizada para todo el lote) en
+# lugar de mirar solo la primera.
+import numpy as np
+
+# Código de material = posición en esta tupla (0 = no reconocido)
+MATERIALES = ("Desconocido", "Plastico", "Metal", "Organico")
+
+# Mapeo manual de productos a materiales (metal, plástico, orgánico).
+# El orden importa: gana el primer nombre contenido en la etiqueta.
+object_to_material = {
+    "bottle": "Plastico",
+    "water bottle": "Plastico",
+    "plastic bag": "Plastico",
+    "knife": "Metal",
+    "fork": "Metal",
+    "spoon": "Metal",
+    "apple": "Organico",
+    "banana": "Organico",
+    "orange": "Organico",
+    "carrot": "Organico",
+    "can": "Metal",
+    "scissors": "Metal",
+    "straw": "Plastico",
+    "cup": "Plastico",
+    "paper cup": "Plastico",
+    "glass bottle": "Metal",
+    "aluminum foil": "Metal",
+    "toothbrush": "Plastico",
+    "pen": "Plastico",
+    "chair": "Plastico",
+    "table": "Plastico",
+    "pizza": "Organico",
+    "sandwich": "Organico",
+    "broccoli": "Organico",
+    "lettuce": "Organico",
+    "cucumber": "Organico",
+    "zucchini": "Organico",
+    "soda can": "Metal",
+    "nail": "Metal",
+    "screw": "Metal",
+    "hammer": "Metal",
+    "tire": "Plastico",
+}
+
+def material_de_etiqueta(etiqueta, mapa=object_to_material):
+    """La regla original: primer objeto del mapa contenido en la etiqueta."""
+    etiqueta = etiqueta.lower()
+    for object_name, material in mapa.items():
+        if object_name in etiqueta:
+            return material
+    return MATERIALES[0]
+
+def tabla_materiales(etiquetas, mapa=object_to_material, materiales=MATERIALES):
+    """int8[len(etiquetas)]: código de material de cada clase."""
+    indice = {m: i for i, m in enumerate(materiales)}
+    return np.array([indice[material_de_etiqueta(e, mapa)] for e in etiquetas], dtype=np.int8)
+
+def _softmax(x):
+    x = x - x.max(axis=1, keepdims=True)
+    e = np.exp(x)
+    return e / e.sum(axis=1, keepdims=True)
+
+class DecisorMaterial:
+    """
+    decisor(predicciones) -> material de un cuadro; decisor.lote(P) -> lista
+    para una matriz (n, clases).
+
+    top_k=1 reproduce map_prediction_to_material. Con top_k > 1 gana el
+    material con más probabilidad sumada entre las k clases más probables
+    (las clases sin material suman para "Desconocido"); si el ganador no
+    supera `umbral` el resultado también es "Desconocido". logits=True aplica
+    softmax antes de sumar (el clasificador de TF Hub devuelve logits).
+    """
+    def __init__(self, etiquetas, mapa=object_to_material, top_k=1, logits=True, umbral=0.0):
+        self.materiales = MATERIALES
+        self.codigos = tabla_materiales(etiquetas, mapa, self.materiales)
+        self.top_k = top_k
+        self.logits = logits
+        self.umbral = umbral
+
+    def codigos_lote(self, predicciones):
+        """int[n]: código de material por fila de `predicciones` (n, clases)."""
+        p = np.asarray(predicciones).reshape(-1, len(self.codigos))
+        if self.top_k <= 1:
+            return self.codigos[p.argmax(axis=1)]
+        if self.logits:
+            p = _softmax(p)
+        n = len(p)
+        top = np.argpartition(p, -self.top_k, axis=1)[:, -self.top_k:]
+        prob = np.take_along_axis(p, top, axis=1)
+        # suma por (fila, material) en una sola pasada
+        celdas = (np.arange(n)[:, None] * len(self.materiales) + self.codigos[top]).ravel()
+        suma = np.bincount(celdas, weights=prob.ravel(), minlength=n * len(self.materiales))
+        suma = suma.reshape(n, len(self.materiales))
+        mejor = suma.argmax(axis=1)
+        mejor[suma[np.arange(n), mejor] <= self.umbral] = 0
+        return mejor
+
+    def lote(self, predicciones):
+        return [self.materiales[c] for c in self.codigos_lote(predicciones)]
+
+    def __call__(self, predicciones):
+        return self.materiales[self.codigos_lote(predicciones)[0]]
@@ -0,0 +1,421 @@
+# ======================================================
+# ALMACÉN LOCAL DEL MODELO Y LAS ETIQUETAS (sin red)
+# ======================================================
+# Al arrancar, separadorAutomatico.py hacía hub.load(URL) por HTTP y bajaba
+# ImageNetLabels.txt con tf.keras.utils.get_file: decenas de segundos, y sin
+# red (así están instalados los controladores de la línea) no arrancaba.
+#
+# Ahora el modelo se exporta una sola vez, en una máquina con red, a una
+# carpeta que se copia al controlador:
+#
+#   python separadorModelo.py --exportar            (a DIR_MODELOS)
+#   python separadorModelo.py --exportar --directorio /opt/separador/modelos
+#
+#   modelos/
+#     manifiesto.json         formatos, forma de entrada, sha256 de cada archivo
+#     ImageNetLabels.txt      las 1001 etiquetas
+#     mobilenet_v2/           SavedModel (tf.saved_model.load)
+#     mobilenet_v2.tflite     TFLite float32 (el intérprete mapea el archivo en memoria)
+#     mobilenet_v2_int8.tflite  TFLite cuantizado a int8 (con --calibracion CARPETA)
+#
+# y cargar() lo abre sin tocar la red ni TensorFlow Hub, después de comprobar
+# el sha256 de cada archivo contra el manifiesto (una copia truncada o un
+# modelo reemplazado no carga en silencio). El formato "simulado"
+# (pesos .npy de separadorInferencia.ModeloSimulado, abiertos con mmap) sirve
+# para medir el arranque y probar el pipeline sin TensorFlow:
+#
+#   python separadorModelo.py --benchmark-arranque 5
+#
+# Cada formato se abre con un BackendInferencia (TF, TFLite float o int8,
+# simulado), todos con la misma firma que model(...). --benchmark-backends
+# compara precisión y latencia de los exportados sobre cuadros guardados:
+#
+#   python separadorModelo.py --benchmark-backends cuadros/ --referencia savedmodel
+import os
+import abc
+import sys
+import json
+import time
+import hashlib
+import datetime
+
+import numpy as np
+
+from separadorInferencia import IMAGE_SHAPE, URL_MODELO, ModeloSimulado
+
+DIR_MODELOS = os.environ.get(
+    "SEPARADOR_MODELOS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "modelos"))
+URL_ETIQUETAS = "https://storage.googleapis.com/download.tensorflow.org/data/ImageNetLabels.txt"
+
+MANIFIESTO = "manifiesto.json"
+ETIQUETAS = "ImageNetLabels.txt"
+ARCHIVOS = {
+    "savedmodel": "mobilenet_v2",
+    "tflite": "mobilenet_v2.tflite",
+    "tflite_int8": "mobilenet_v2_int8.tflite",
+    "simulado": "simulado.npy",
+}
+# Orden en que cargar() elige si no se pide un formato. tflite_int8 se usa
+# solo pidiéndolo (FORMATO_MODELO en separadorAutomatico.py), después de
+# comprobar con --benchmark-backends que no pierde precisión.
+PREFERENCIA = ("tflite", "savedmodel", "simulado")
+
+# ======================================================
+# EXPORTAR (una vez, con red)
+# ======================================================
+
+def _sha256(ruta):
+    h = hashlib.sha256()
+    if os.path.isdir(ruta):
+        for raiz, _, nombres in sorted(os.walk(ruta)):
+            for nombre in sorted(nombres):
+                with open(os.path.join(raiz, nombre), "rb") as f:
+                    h.update(f.read())
+    else:
+        with open(ruta, "rb") as f:
+            for bloque in iter(lambda: f.read(1 << 20), b""):
+                h.update(bloque)
+    return h.hexdigest()
+
+def _escribir_manifiesto(directorio, formatos, origen):
+    manifiesto = {
+        "origen": origen,
+        "exportado": datetime.datetime.now().isoformat(timespec="seconds"),
+        "forma_entrada": [IMAGE_SHAPE[1], IMAGE_SHAPE[0], 3],
+        "formatos": {f: {"archivo": ARCHIVOS[f], "sha256": _sha256(os.path.join(directorio, ARCHIVOS[f]))}
+                     for f in formatos},
+        "etiquetas": {"archivo": ETIQUETAS, "sha256": _sha256(os.path.join(directorio, ETIQUETAS))},
+    }
+    with open(os.path.join(directorio, MANIFIESTO), "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, indent=2)
+    return manifiesto
+
+def exportar(directorio=DIR_MODELOS, url=URL_MODELO, tflite=True, calibracion=None, max_calibracion=200):
+    """
+    Baja MobileNetV2 y las etiquetas y los guarda como SavedModel (+ TFLite) en
+    `directorio`. Con `calibracion` (carpeta de cuadros de la cinta) también
+    exporta el TFLite int8: la cuantización completa necesita cuadros reales
+    para fijar los rangos de cada capa.
+    """
+    import shutil
+    import tensorflow as tf
+    import tensorflow_hub as hub
+
+    os.makedirs(directorio, exist_ok=True)
+    origen = hub.load(url)
+
+    @tf.function(input_signature=[tf.TensorSpec([None, IMAGE_SHAPE[1], IMAGE_SHAPE[0], 3], tf.float32)])
+    def servir(x):
+        return origen(x)
+
+    modulo = tf.Module()
+    modulo.modelo = origen
+    modulo.servir = servir
+    ruta_sm = os.path.join(directorio, ARCHIVOS["savedmodel"])
+    tf.saved_model.save(modulo, ruta_sm, signatures={"serving_default": servir})
+    formatos = ["savedmodel"]
+
+    if tflite:
+        convertidor = tf.lite.TFLiteConverter.from_saved_model(ruta_sm)
+        with open(os.path.join(directorio, ARCHIVOS["tflite"]), "wb") as f:
+            f.write(convertidor.convert())
+        formatos.append("tflite")
+
+    if tflite and calibracion:
+        from separadorInferencia import cargar_cuadros, preprocesar
+        cuadros = cargar_cuadros(calibracion, limite=max_calibracion)
+        convertidor = tf.lite.TFLiteConverter.from_saved_model(ruta_sm)
+        convertidor.optimizations = [tf.lite.Optimize.DEFAULT]
+        convertidor.representative_dataset = lambda: ([preprocesar(c)] for c in cuadros)
+        convertidor.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        convertidor.inference_input_type = tf.uint8    # [0, 1] -> 0..255
+        with open(os.path.join(directorio, ARCHIVOS["tflite_int8"]), "wb") as f:
+            f.write(convertidor.convert())
+        formatos.append("tflite_int8")
+
+    ruta_etiquetas = tf.keras.utils.get_file(ETIQUETAS, URL_ETIQUETAS)
+    shutil.copyfile(ruta_etiquetas, os.path.join(directorio, ETIQUETAS))
+    return _escribir_manifiesto(directorio, formatos, url)
+
+def exportar_simulado(directorio, etiquetas=None):
+    """Almacén con el modelo simulado (sin TensorFlow), para pruebas y para medir el arranque."""
+    os.makedirs(directorio, exist_ok=True)
+    np.save(os.path.join(directorio, ARCHIVOS["simulado"]), ModeloSimulado.pesos_simulados())
+    etiquetas = etiquetas or ["background"] + [f"clase {i}" for i in range(1, 1001)]
+    with open(os.path.join(directorio, ETIQUETAS), "w", encoding="utf-8") as f:
+        f.write("\n".join(etiquetas) + "\n")
+    return _escribir_manifiesto(directorio, ["simulado"], "simulado")
+
+# ======================================================
+# CARGAR (sin red)
+# ======================================================
+
+class BackendInferencia(abc.ABC):
+    """
+    Lo que hay detrás de model(...) en separadorAutomatico.py: recibe un lote
+    float32 (n, 224, 224, 3) en [0, 1] y devuelve un ndarray (n, 1001) con una
+    fila de predicciones por cuadro. `nombre` es el formato del almacén.
+    """
+    nombre = ""
+
+    @abc.abstractmethod
+    def __call__(self, x):
+        """Predicciones (n, 1001) del lote x."""
+
+class BackendTF(BackendInferencia):
+    """SavedModel con TensorFlow completo (el camino original de hub.load)."""
+    def __init__(self, ruta):
+        import tensorflow as tf
+        self._tf = tf
+        self._servir = tf.saved_model.load(ruta).servir
+
+    def __call__(self, x):
+        return self._servir(self._tf.constant(x)).numpy()
+
+class BackendTFLite(BackendInferencia):
+    """
+    Intérprete TFLite (mapea el .tflite en memoria); reajusta la entrada al
+    tamaño del lote. Si el modelo está cuantizado (int8/uint8) cuantiza la
+    entrada y decuantiza la salida con la escala y el cero del modelo.
+    """
+    def __init__(self, ruta, hilos=None):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+        self.interprete = Interpreter(model_path=ruta, num_threads=hilos or os.cpu_count())
+        self._entrada = self.interprete.get_input_details()[0]
+        self._salida = self.interprete.get_output_details()[0]
+        self._lote = None
+
+    def __call__(self, x):
+        tipo = self._entrada["dtype"]
+        if tipo != np.float32:
+            escala, cero = self._entrada["quantization"]
+            rango = np.iinfo(tipo)
+            x = np.clip(np.round(x / escala + cero), rango.min, rango.max).astype(tipo)
+        if self._lote != len(x):
+            self.interprete.resize_tensor_input(self._entrada["index"], x.shape)
+            self.interprete.allocate_tensors()
+            self._lote = len(x)
+        self.interprete.set_tensor(self._entrada["index"], x)
+        self.interprete.invoke()
+        y = self.interprete.get_tensor(self._salida["index"])
+        if self._salida["dtype"] != np.float32:
+            escala, cero = self._salida["quantization"]
+            y = (y.astype(np.float32) - cero) * escala
+        return y
+
+class BackendSimulado(BackendInferencia):
+    """ModeloSimulado con los pesos del almacén abiertos con mmap (sin TensorFlow)."""
+    def __init__(self, ruta):
+        self._modelo = ModeloSimulado(pesos=np.load(ruta, mmap_mode="r"))
+
+    def __call__(self, x):
+        return self._modelo(x)
+
+BACKENDS = {
+    "savedmodel": BackendTF,
+    "tflite": BackendTFLite,
+    "tflite_int8": BackendTFLite,
+    "simulado": BackendSimulado,
+}
+
+def leer_manifiesto(directorio=DIR_MODELOS):
+    ruta = os.path.join(directorio, MANIFIESTO)
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(
+            f"No hay modelo exportado en {directorio}. "
+            "Ejecute una vez, con red: python separadorModelo.py --exportar")
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+def verificar_archivo(directorio, entrada):
+    """Compara el sha256 del archivo de `entrada` (del manifiesto) con el registrado."""
+    ruta = os.path.join(directorio, entrada["archivo"])
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"Falta {ruta}, que figura en el manifiesto de {directorio}")
+    sha = _sha256(ruta)
+    if sha != entrada["sha256"]:
+        raise ValueError(
+            f"{ruta} no coincide con el manifiesto (sha256 {sha[:12]}…, esperado "
+            f"{entrada['sha256'][:12]}…): el archivo está truncado o fue reemplazado. "
+            "Vuelva a copiar o a exportar el almacén.")
+    return ruta
+
+def cargar_etiquetas(directorio=DIR_MODELOS, verificar=True):
+    ruta = os.path.join(directorio, ETIQUETAS)
+    if verificar:
+        ruta = verificar_archivo(directorio, leer_manifiesto(directorio)["etiquetas"])
+    with open(ruta, encoding="utf-8") as f:
+        return np.array(f.read().splitlines())
+
+def cargar_modelo(directorio=DIR_MODELOS, formato=None, verificar=True):
+    """
+    (BackendInferencia, formato usado) desde el almacén local, sin acceso a
+    la red. verificar=True comprueba antes el sha256 del manifiesto.
+    """
+    disponibles = leer_manifiesto(directorio)["formatos"]
+    if formato is None:
+        formato = next((f for f in PREFERENCIA if f in disponibles), None)
+    if formato not in disponibles:
+        raise ValueError(f"Formato {formato!r} no exportado en {directorio} (hay: {', '.join(disponibles)})")
+    ruta = os.path.join(directorio, disponibles[formato]["archivo"])
+    if verificar:
+        verificar_archivo(directorio, disponibles[formato])
+
+    backend = BACKENDS[formato](ruta)
+    backend.nombre = formato
+    return backend, formato
+
+def cargar(directorio=DIR_MODELOS, formato=None, verificar=True):
+    """(modelo, etiquetas, formato): todo lo que separadorAutomatico.py necesita para arrancar."""
+    modelo, formato = cargar_modelo(directorio, formato, verificar)
+    return modelo, cargar_etiquetas(directorio, verificar), formato
+
+# ======================================================
+# BENCHMARK DE ARRANQUE
+# ======================================================
+
+_ARRANQUE = r"""
+import sys, time
+t0 = time.perf_counter()
+import numpy as np
+from separadorModelo import cargar
+modelo, etiquetas, formato = cargar(sys.argv[1], sys.argv[2])
+t1 = time.perf_counter()
+np.asarray(modelo(np.zeros((1, 224, 224, 3), np.float32)))
+t2 = time.perf_counter()
+print(t1 - t0, t2 - t1)
+"""
+
+def benchmark_arranque(n=5, directorio=None, formatos=None):
+    """
+    Mediana de n procesos nuevos: importar + cargar del almacén, primera
+    inferencia y proceso completo. Sin `directorio` se arma un almacén
+    temporal con el modelo simulado.
+    """
+    import tempfile
+    import subprocess
+    aqui = os.path.dirname(os.path.abspath(__file__))
+    tmp = None
+    if directorio is None:
+        tmp = tempfile.TemporaryDirectory()
+        directorio = tmp.name
+        exportar_simulado(directorio)
+    formatos = formatos or list(leer_manifiesto(directorio)["formatos"])
+    filas = []
+    try:
+        for formato in formatos:
+            medidas = []
+            for _ in range(n):
+                t0 = time.perf_counter()
+                p = subprocess.run([sys.executable, "-c", _ARRANQUE, directorio, formato],
+                                   cwd=aqui, capture_output=True, text=True, check=True)
+                total = time.perf_counter() - t0
+                carga, primera = map(float, p.stdout.split())
+                medidas.append((total, carga, primera))
+            medidas.sort()
+            total, carga, primera = medidas[len(medidas) // 2]
+            filas.append((formato, total, carga, primera))
+            print(f"{formato:<11} proceso {total * 1000:8.1f} ms  carga {carga * 1000:8.1f} ms  "
+                  f"primera inferencia {primera * 1000:8.1f} ms")
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+    return filas
+
+# ======================================================
+# BENCHMARK DE BACKENDS: PRECISIÓN Y LATENCIA
+# ======================================================
+
+def benchmark_backends(carpeta, directorio=DIR_MODELOS, formatos=None, referencia=None, lote=1, top_k=1):
+    """
+    Corre los cuadros de `carpeta` por cada backend exportado, en lotes de
+    `lote`. Informa ms por cuadro (media, p50, p99) y, contra el backend de
+    `referencia` (por defecto el primero), coincidencia de clase top-1 y de
+    material. Si la carpeta tiene subcarpetas con nombre de material
+    (Plastico/, Metal/, ...) informa también la exactitud contra ellas.
+    """
+    from separadorInferencia import cargar_cuadros_etiquetados, preprocesar
+    from separadorMateriales import DecisorMaterial
+    from separadorPipeline import percentil
+
+    cuadros, verdad = cargar_cuadros_etiquetados(carpeta)
+    if not cuadros:
+        raise ValueError(f"No hay cuadros en {carpeta}")
+    entradas = [preprocesar(c) for c in cuadros]
+    decisor = DecisorMaterial(cargar_etiquetas(directorio), top_k=top_k)
+    formatos = formatos or list(leer_manifiesto(directorio)["formatos"])
+    referencia = referencia or formatos[0]
+    if referencia in formatos:
+        formatos = [referencia] + [f for f in formatos if f != referencia]
+
+    resultados = {}
+    for formato in formatos:
+        backend, _ = cargar_modelo(directorio, formato)
+        backend(entradas[0])   # calentar
+        tiempos, clases, materiales = [], [], []
+        for i in range(0, len(entradas), lote):
+            x = np.concatenate(entradas[i:i + lote], axis=0)
+            t0 = time.perf_counter()
+            pred = np.asarray(backend(x))
+            tiempos.append((time.perf_counter() - t0) / len(x))
+            clases.extend(pred.argmax(axis=1))
+            materiales.extend(decisor.codigos_lote(pred))
+        tiempos.sort()
+        resultados[formato] = {
+            "ms_media": sum(tiempos) / len(tiempos) * 1000,
+            "ms_p50": percentil(tiempos, 50) * 1000,
+            "ms_p99": percentil(tiempos, 99) * 1000,
+            "clases": np.array(clases),
+            "materiales": np.array(materiales),
+        }
+
+    ref = resultados[formatos[0]]
+    filas = []
+    for formato in formatos:
+        r = resultados[formato]
+        fila = {"formato": formato, "ms_media": r["ms_media"], "ms_p50": r["ms_p50"], "ms_p99": r["ms_p99"],
+                "top1_igual": float((r["clases"] == ref["clases"]).mean()),
+                "material_igual": float((r["materiales"] == ref["materiales"]).mean())}
+        if verdad is not None:
+            esperado = np.array([decisor.materiales.index(m) for m in verdad])
+            fila["exactitud"] = float((r["materiales"] == esperado).mean())
+        filas.append(fila)
+        extra = f"  exactitud {fila['exactitud'] * 100:5.1f}%" if "exactitud" in fila else ""
+        print(f"{formato:<12} {fila['ms_media']:7.2f} ms/cuadro (p50 {fila['ms_p50']:.2f}, p99 {fila['ms_p99']:.2f})  "
+              f"top-1 = {formatos[0]} {fila['top1_igual'] * 100:5.1f}%  "
+              f"material = {formatos[0]} {fila['material_igual'] * 100:5.1f}%{extra}")
+    return filas
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Almacén local del modelo del separador.")
+    p.add_argument("--directorio", default=DIR_MODELOS)
+    p.add_argument("--exportar", action="store_true", help="bajar y exportar MobileNetV2 (necesita red)")
+    p.add_argument("--sin-tflite", action="store_true", help="exportar solo el SavedModel")
+    p.add_argument("--calibracion", metavar="CARPETA", help="cuadros para exportar también el TFLite int8")
+    p.add_argument("--simulado", action="store_true", help="exportar el modelo simulado (sin TensorFlow)")
+    p.add_argument("--benchmark-arranque", type=int, metavar="N",
+                   help="medir el arranque en frío (N procesos; sin --directorio usa un almacén simulado)")
+    p.add_argument("--benchmark-backends", metavar="CARPETA",
+                   help="precisión y latencia de cada formato exportado sobre estos cuadros")
+    p.add_argument("--formatos", nargs="+", help="formatos a comparar (por defecto: todos los exportados)")
+    p.add_argument("--referencia", help="formato contra el que se compara (por defecto: el primero)")
+    p.add_argument("--lote", type=int, default=1)
+    a = p.parse_args()
+
+    if a.exportar:
+        print(json.dumps(exportar(a.directorio, tflite=not a.sin_tflite, calibracion=a.calibracion), indent=2))
+    elif a.simulado:
+        print(json.dumps(exportar_simulado(a.directorio), indent=2))
+    elif a.benchmark_arranque:
+        usar = a.directorio if os.path.exists(os.path.join(a.directorio, MANIFIESTO)) else None
+        benchmark_arranque(a.benchmark_arranque, usar)
+    elif a.benchmark_backends:
+        benchmark_backends(a.benchmark_backends, a.directorio, a.formatos, a.referencia, a.lote)
+    else:
+        p.print_help()
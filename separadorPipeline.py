@@ -0,0 +1,316 @@
+# ======================================================
+# PIPELINE EN TIEMPO REAL DEL SEPARADOR DE MATERIALES
+# ======================================================
+# Antes el bucle de separadorAutomatico.py hacía todo en serie en un hilo:
+# cap.read(), preprocesado, model(...), arduino.write y time.sleep(0.2); el
+# más lento de los pasos (o el sleep) marcaba el ritmo de todos.
+#
+# Aquí son tres etapas en hilos propios unidas por colas acotadas:
+#
+#   captura --(cola de cuadros)--> inferencia --(cola de decisiones)--> actuador
+#
+# Las colas descartan lo más viejo cuando están llenas: un cuadro que espera
+# detrás de otro más nuevo ya no sirve para decidir qué hay en la cinta, y es
+# mejor perderlo que acumular retraso. Cada etapa guarda sus latencias
+# (media, p50, p99) y las colas cuentan los cuadros descartados.
+#
+# El módulo solo usa la biblioteca estándar: la cámara, el modelo y el puerto
+# serie entran como funciones (leer, clasificar, enviar).
+import sys
+import math
+import time
+import threading
+from collections import deque
+
+# ======================================================
+# COLA ACOTADA QUE DESCARTA LO VIEJO
+# ======================================================
+
+class ColaReciente:
+    """
+    Cola FIFO de a lo sumo `maximo` elementos. poner() nunca bloquea: si está
+    llena saca el más viejo y lo cuenta en `descartados`.
+    """
+    def __init__(self, maximo=1):
+        self.maximo = maximo
+        self.descartados = 0
+        self.cerrada = False
+        self._items = deque()
+        self._cond = threading.Condition()
+
+    def poner(self, item):
+        with self._cond:
+            if len(self._items) >= self.maximo:
+                self._items.popleft()
+                self.descartados += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def sacar(self, timeout=None):
+        """El elemento más viejo, o None si se cumple el timeout o la cola se cerró vacía."""
+        with self._cond:
+            if not self._items and not self.cerrada:
+                self._cond.wait(timeout)
+            return self._items.popleft() if self._items else None
+
+    def sacar_lote(self, maximo, espera=0.0, timeout=None):
+        """
+        Hasta `maximo` elementos, los más viejos primero. Espera al primero
+        (hasta `timeout`) y después a lo sumo `espera` segundos más para
+        completar el lote. Lista vacía si no llegó nada.
+        """
+        with self._cond:
+            if not self._items and not self.cerrada:
+                self._cond.wait(timeout)
+            if not self._items:
+                return []
+            limite = time.perf_counter() + espera
+            while len(self._items) < maximo and not self.cerrada:
+                resto = limite - time.perf_counter()
+                if resto <= 0:
+                    break
+                self._cond.wait(resto)
+            return [self._items.popleft() for _ in range(min(maximo, len(self._items)))]
+
+    def cerrar(self):
+        with self._cond:
+            self.cerrada = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        return len(self._items)
+
+# ======================================================
+# ESTADÍSTICAS DE LATENCIA
+# ======================================================
+
+def percentil(ordenados, q):
+    """Percentil q (0–100) de una lista ya ordenada, por el rango más cercano."""
+    if not ordenados:
+        return float("nan")
+    rango = math.ceil(q / 100 * len(ordenados))
+    return ordenados[min(len(ordenados), max(rango, 1)) - 1]
+
+class EstadisticasLatencia:
+    """Últimas `ventana` latencias de una etapa (segundos; None = todas) y cuántas veces pasó."""
+    def __init__(self, ventana=2000):
+        self.n = 0
+        self._t = deque(maxlen=ventana)
+        self._inicio = None
+        self._lock = threading.Lock()
+
+    def registrar(self, segundos):
+        with self._lock:
+            if self._inicio is None:
+                self._inicio = time.perf_counter() - segundos
+            self.n += 1
+            self._t.append(segundos)
+
+    def resumen(self):
+        with self._lock:
+            ordenados = sorted(self._t)
+            n, inicio = self.n, self._inicio
+        transcurrido = time.perf_counter() - inicio if inicio is not None else 0.0
+        return {
+            "n": n,
+            "por_segundo": n / transcurrido if transcurrido > 0 else 0.0,
+            "media_ms": sum(ordenados) / len(ordenados) * 1000 if ordenados else float("nan"),
+            "p50_ms": percentil(ordenados, 50) * 1000,
+            "p99_ms": percentil(ordenados, 99) * 1000,
+        }
+
+# ======================================================
+# PIPELINE
+# ======================================================
+
+class Cuadro:
+    """Un cuadro de la cámara y lo que se decidió sobre él."""
+    __slots__ = ("indice", "imagen", "entrada", "t_captura", "material", "omitido")
+
+    def __init__(self, indice, imagen, t_captura, entrada=None):
+        self.indice = indice
+        self.imagen = imagen
+        self.entrada = imagen if entrada is None else entrada   # lo que se clasifica (p. ej. un recorte)
+        self.t_captura = t_captura
+        self.material = None
+        self.omitido = False    # la compuerta lo omitió: no pasó por la inferencia
+
+class PipelineSeparador:
+    """
+    leer() -> (ok, imagen)     como cap.read(); ok=False termina el pipeline
+                               (con un aviso por stderr, salvo fuente_finita=True:
+                               un video o una reproducción que se terminó).
+    clasificar(imagen) -> str  preprocesado + modelo + material.
+    enviar(material)           comando al actuador (arduino.write).
+
+    fps_objetivo limita la captura a ese ritmo (0 = tan rápido como entregue
+    la cámara); reemplaza al time.sleep(0.2) fijo del bucle original.
+
+    Con lote_max > 1 la inferencia trabaja por lotes: toma hasta lote_max
+    cuadros, esperando a lo sumo espera_lote_ms a que se completen, y
+    clasificar recibe la lista de imágenes y devuelve la lista de materiales.
+    Más lote o más espera dan más cuadros por segundo a costa de latencia.
+
+    filtrar(imagen) -> imagen a clasificar o None, si se da, corre en el hilo
+    de captura antes de encolar (separadorCompuerta.py): con None el cuadro
+    se omite sin pasar por la inferencia, y si no se clasifica lo devuelto
+    (p. ej. un recorte). `ultima_captura` es el último cuadro leído, se haya
+    clasificado o no. Un cuadro omitido igual llega al actuador, con
+    `material_omitido` ("Desconocido": la cinta está vacía) y sin pasar por
+    la inferencia; si no, al vaciarse la cinta el actuador seguiría con el
+    comando del último objeto. material_omitido=None no envía nada.
+
+    Las estadísticas guardan las últimas `ventana_estadisticas` latencias de
+    cada etapa (None = todas, para reproducciones de largo conocido).
+    """
+    def __init__(self, leer, clasificar, enviar, fps_objetivo=0.0, tam_cola_cuadros=1,
+                 tam_cola_decisiones=4, lote_max=1, espera_lote_ms=0.0, ventana_estadisticas=2000,
+                 filtrar=None, material_omitido="Desconocido", fuente_finita=False):
+        self.leer = leer
+        self.fuente_finita = fuente_finita
+        self.clasificar = clasificar
+        self.enviar = enviar
+        self.filtrar = filtrar
+        self.material_omitido = material_omitido
+        self.periodo = 1.0 / fps_objetivo if fps_objetivo > 0 else 0.0
+        self.lote_max = max(1, lote_max)
+        self.espera_lote = espera_lote_ms / 1000.0
+        self.cola_cuadros = ColaReciente(max(tam_cola_cuadros, self.lote_max))
+        self.cola_decisiones = ColaReciente(max(tam_cola_decisiones, self.lote_max))
+        self.cuadros_clasificados = 0
+        self.cuadros_omitidos = 0
+        self.llamadas_modelo = 0
+        etapas = ("captura",) + (("compuerta",) if filtrar is not None else ()) + (
+            "inferencia", "actuador", "extremo_a_extremo")
+        self.stats = {nombre: EstadisticasLatencia(ventana_estadisticas) for nombre in etapas}
+        self.ultimo = None          # último Cuadro clasificado (para mostrarlo)
+        self.ultima_captura = None  # último Cuadro leído
+        self.error = None           # primera excepción de una etapa, si la hubo
+        self._parar = threading.Event()
+        self._hilos = []
+
+    # --- etapas ---------------------------------------------------------
+
+    def _captura(self):
+        i = 0
+        proximo = time.perf_counter()
+        while not self._parar.is_set():
+            t0 = time.perf_counter()
+            ok, imagen = self.leer()
+            if not ok:
+                if not self.fuente_finita:
+                    print("Error al capturar la imagen.", file=sys.stderr)
+                break
+            t1 = time.perf_counter()
+            self.stats["captura"].registrar(t1 - t0)
+            entrada = imagen
+            if self.filtrar is not None:
+                entrada = self.filtrar(imagen)
+                self.stats["compuerta"].registrar(time.perf_counter() - t1)
+            cuadro = Cuadro(i, imagen, t0, entrada)
+            self.ultima_captura = cuadro
+            if entrada is None:
+                self.cuadros_omitidos += 1
+                if self.material_omitido is not None:
+                    cuadro.material = self.material_omitido
+                    cuadro.omitido = True
+                    self.cola_decisiones.poner(cuadro)
+            else:
+                self.cola_cuadros.poner(cuadro)
+            i += 1
+            if self.periodo:
+                proximo += self.periodo
+                espera = proximo - time.perf_counter()
+                if espera > 0:
+                    self._parar.wait(espera)
+                else:
+                    proximo = time.perf_counter()   # atrasado: no intentar recuperar
+        self.cola_cuadros.cerrar()
+
+    def _inferencia(self):
+        while True:
+            cuadros = self.cola_cuadros.sacar_lote(self.lote_max, self.espera_lote, timeout=0.1)
+            if not cuadros:
+                if self.cola_cuadros.cerrada or self._parar.is_set():
+                    break
+                continue
+            t0 = time.perf_counter()
+            if self.lote_max > 1:
+                materiales = self.clasificar([c.entrada for c in cuadros])
+            else:
+                materiales = [self.clasificar(cuadros[0].entrada)]
+            self.stats["inferencia"].registrar(time.perf_counter() - t0)
+            self.llamadas_modelo += 1
+            self.cuadros_clasificados += len(cuadros)
+            for cuadro, material in zip(cuadros, materiales):
+                cuadro.material = material
+                self.cola_decisiones.poner(cuadro)
+            self.ultimo = cuadros[-1]
+        self.cola_decisiones.cerrar()
+
+    def _actuador(self):
+        while True:
+            cuadro = self.cola_decisiones.sacar(timeout=0.1)
+            if cuadro is None:
+                if self.cola_decisiones.cerrada or self._parar.is_set():
+                    break
+                continue
+            t0 = time.perf_counter()
+            self.enviar(cuadro.material)
+            t1 = time.perf_counter()
+            self.stats["actuador"].registrar(t1 - t0)
+            if not cuadro.omitido:
+                self.stats["extremo_a_extremo"].registrar(t1 - cuadro.t_captura)
+
+    def _correr(self, etapa):
+        try:
+            etapa()
+        except Exception as e:
+            if self.error is None:
+                self.error = e
+            self._parar.set()
+            self.cola_cuadros.cerrar()
+            self.cola_decisiones.cerrar()
+
+    # --- control --------------------------------------------------------
+
+    def iniciar(self):
+        for nombre, etapa in (("captura", self._captura), ("inferencia", self._inferencia),
+                              ("actuador", self._actuador)):
+            h = threading.Thread(target=self._correr, args=(etapa,), name=f"separador-{nombre}", daemon=True)
+            h.start()
+            self._hilos.append(h)
+        return self
+
+    @property
+    def activo(self):
+        return any(h.is_alive() for h in self._hilos)
+
+    def detener(self, timeout=2.0):
+        self._parar.set()
+        self.cola_cuadros.cerrar()
+        for h in self._hilos:
+            h.join(timeout)
+
+    def esperar(self, timeout=None):
+        """Espera a que las etapas terminen solas (fin del video o de la cámara)."""
+        for h in self._hilos:
+            h.join(timeout)
+
+    def estadisticas(self):
+        est = {nombre: s.resumen() for nombre, s in self.stats.items()}
+        est["descartados"] = {"cuadros": self.cola_cuadros.descartados,
+                              "decisiones": self.cola_decisiones.descartados}
+        est["lote_medio"] = self.cuadros_clasificados / self.llamadas_modelo if self.llamadas_modelo else 0.0
+        est["omitidos"] = self.cuadros_omitidos
+        return est
+
+def imprimir_estadisticas(est):
+    for nombre, s in est.items():
+        if not isinstance(s, dict) or nombre == "descartados":
+            continue
+        print(f"{nombre:<18} n={s['n']:<6} {s['por_segundo']:6.1f}/s  media {s['media_ms']:7.2f} ms  "
+              f"p50 {s['p50_ms']:7.2f} ms  p99 {s['p99_ms']:7.2f} ms")
+    d = est["descartados"]
+    print(f"descartados: {d['cuadros']} cuadros, {d['decisiones']} decisiones; "
+          f"omitidos por la compuerta: {est['omitidos']}; lote medio {est['lote_medio']:.2f}")
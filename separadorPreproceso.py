@@ -0,0 +1,106 @@
+# ======================================================
+# PREPROCESADO SIN ASIGNACIONES POR CUADRO
+# ======================================================
+# El preprocesado original, por cuadro:
+#
+#   resized = cv2.resize(frame, (224, 224))        uint8 nuevo
+#   x = np.array(resized) / 255.0                  copia + float64 nuevo (1.2 MB)
+#   x = np.expand_dims(x.astype(np.float32), 0)    float32 nuevo (600 KB)
+#
+# y luego np.concatenate para armar el lote (otra copia). PreprocesadorLote
+# reserva una vez el lote float32 (n, 224, 224, 3) y un uint8 (224, 224, 3)
+# de trabajo: cv2.resize escribe en el uint8 (dst=) y la división por 255 en
+# float32 escribe directo en la fila del lote (out=). El resultado es
+# idéntico bit a bit al original: para los 256 valores posibles de un píxel,
+# x / float32(255) en float32 da lo mismo que en float64 redondeado a float32.
+#
+#   python separadorPreproceso.py --benchmark 500
+import numpy as np
+
+# Imágenes de entrenamiento de ImageNet tienen resolución 224x224
+IMAGE_SHAPE = (224, 224)
+_255 = np.float32(255.0)
+
+class PreprocesadorLote:
+    """
+    preprocesador(imagenes) -> vista float32 (n, 224, 224, 3) de un buffer
+    propio, válida hasta la siguiente llamada. El buffer crece si llega un
+    lote más grande que `capacidad` y después se reutiliza.
+    """
+    def __init__(self, capacidad=1, forma=IMAGE_SHAPE):
+        self.forma = tuple(forma)                        # (ancho, alto) como cv2.resize
+        self._lote = np.empty((0, forma[1], forma[0], 3), np.float32)
+        self._redim = np.empty((forma[1], forma[0], 3), np.uint8)
+        self._reservar(capacidad)
+
+    def _reservar(self, n):
+        if n > len(self._lote):
+            self._lote = np.empty((n,) + self._lote.shape[1:], np.float32)
+
+    def __call__(self, imagenes):
+        n = len(imagenes)
+        self._reservar(n)
+        for i, img in enumerate(imagenes):
+            self.escribir(img, self._lote[i])
+        return self._lote[:n]
+
+    def escribir(self, img, destino):
+        """Redimensiona (si hace falta) y escala `img` dentro de `destino` (224, 224, 3) float32."""
+        if img.shape[1::-1] != self.forma:
+            import cv2
+            img = cv2.resize(img, self.forma, dst=self._redim)
+        np.divide(img, _255, out=destino)
+
+# ======================================================
+# MICROBENCHMARK
+# ======================================================
+
+def _original(frame, forma=IMAGE_SHAPE):
+    # Copia literal del preprocesado de separadorAutomatico.py antes de este módulo
+    if frame.shape[1::-1] != tuple(forma):
+        import cv2
+        frame = cv2.resize(frame, forma)
+    normalized_frame = np.array(frame) / 255.0
+    return np.expand_dims(normalized_frame.astype(np.float32), axis=0)
+
+def benchmark_preproceso(n=500, lote=4, alto=480, ancho=640):
+    """
+    µs por cuadro y memoria asignada por lote (tracemalloc) del preprocesado
+    original + np.concatenate contra PreprocesadorLote. Sin cv2 instalado los
+    cuadros se generan ya en 224x224 (sin redimensionar).
+    """
+    import time
+    import tracemalloc
+    from importlib.util import find_spec
+    if find_spec("cv2") is None:
+        alto, ancho = IMAGE_SHAPE[1], IMAGE_SHAPE[0]
+    rnd = np.random.default_rng(0)
+    cuadros = [rnd.integers(0, 256, (alto, ancho, 3), dtype=np.uint8) for _ in range(lote)]
+    prep = PreprocesadorLote(lote)
+
+    original = lambda: np.concatenate([_original(c) for c in cuadros], axis=0)
+    assert np.array_equal(original(), prep(cuadros)), "el resultado difiere del original"
+
+    filas = []
+    for nombre, f in (("original", original), ("PreprocesadorLote", lambda: prep(cuadros))):
+        f()
+        tracemalloc.start()
+        f()
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        t0 = time.perf_counter()
+        for _ in range(n // lote):
+            f()
+        us = (time.perf_counter() - t0) / (n // lote * lote) * 1e6
+        filas.append((nombre, us, pico))
+        print(f"{nombre:<18} {us:8.1f} µs/cuadro   pico asignado por lote {pico / 1024:9.1f} KB"
+              f"   ({ancho}x{alto}, lote {lote})")
+    return filas
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Preprocesado del separador: original vs buffer reservado.")
+    p.add_argument("--benchmark", type=int, metavar="N", default=500, help="cuadros a preprocesar")
+    p.add_argument("--lote", type=int, default=4)
+    a = p.parse_args()
+    benchmark_preproceso(a.benchmark, a.lote)
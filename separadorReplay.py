@@ -0,0 +1,237 @@
+# ======================================================
+# REPRODUCCIÓN DEL SEPARADOR SIN CÁMARA NI ARDUINO
+# ======================================================
+# separadorAutomatico.py solo corre con la cámara (cv2.VideoCapture(0)) y el
+# puerto COM4, así que fps y latencias cambian de una corrida a otra. Este
+# módulo arma el mismo pipeline (PipelineSeparador + ClasificadorPorLotes +
+# DecisorMaterial + ActuadorSerial) pero lee los cuadros de un video o de una
+# carpeta y escribe los comandos en un puerto simulado (SumideroSerie). El
+# resultado es un informe JSON con throughput, p50/p99 por etapa, cuadros
+# descartados y comandos enviados, para comparar cada optimización con la
+# misma entrada:
+#
+#   python separadorReplay.py grabacion.mp4 --modelo modelos/ -o antes.json
+#   python separadorReplay.py cuadros/ --simulado --fps 0 --etiqueta "lote 8" --lote 8
+#
+# Los cuadros de una carpeta (imágenes o .npy) se cargan a memoria antes de
+# empezar, para que el disco no entre en la medida; un video se decodifica
+# durante la reproducción, como entregaría los cuadros una cámara.
+import os
+import sys
+import json
+import math
+import time
+import threading
+from collections import Counter
+
+from separadorActuador import COMANDOS, COMANDO_DESCONOCIDO, ActuadorSerial
+from separadorCompuerta import CompuertaMovimiento, leer_roi
+from separadorInferencia import ClasificadorPorLotes, cargar_cuadros, cuadros_sinteticos
+from separadorMateriales import DecisorMaterial
+from separadorPipeline import PipelineSeparador
+
+# ======================================================
+# FUENTE DE CUADROS Y PUERTO SIMULADO
+# ======================================================
+
+def abrir_fuente(ruta=None, sinteticos=0, limite=None):
+    """
+    (leer, descripcion): leer() -> (ok, cuadro) como cap.read(), sobre un
+    video, una carpeta de cuadros o `sinteticos` cuadros aleatorios.
+    """
+    if ruta is None:
+        cuadros = cuadros_sinteticos(sinteticos)
+        descripcion = f"{sinteticos} cuadros sintéticos"
+    elif os.path.isdir(ruta):
+        cuadros = cargar_cuadros(ruta, limite)
+        descripcion = ruta
+    else:
+        import cv2
+        cap = cv2.VideoCapture(ruta)
+        if not cap.isOpened():
+            raise FileNotFoundError(f"No se pudo abrir el video {ruta}")
+        leidos = 0
+        def leer():
+            nonlocal leidos
+            if limite and leidos >= limite:
+                return False, None
+            ok, cuadro = cap.read()
+            leidos += ok
+            return ok, cuadro
+        return leer, ruta
+    if not cuadros:
+        raise ValueError(f"No hay cuadros en {ruta}")
+    fuente = iter(cuadros[:limite] if limite else cuadros)
+    def leer():
+        cuadro = next(fuente, None)
+        return cuadro is not None, cuadro
+    return leer, descripcion
+
+class SumideroSerie:
+    """
+    Puerto serie simulado: write() tarda lo que la línea real (10 bits por
+    byte a `baudios`; 0 = sin demora) y guarda lo escrito.
+    """
+    def __init__(self, baudios=9600):
+        self.baudios = baudios
+        self.escrito = bytearray()
+        self.escrituras = 0
+        self._lock = threading.Lock()
+
+    def write(self, datos):
+        if self.baudios:
+            time.sleep(len(datos) * 10 / self.baudios)
+        with self._lock:
+            self.escrito += datos
+            self.escrituras += 1
+        return len(datos)
+
+# ======================================================
+# REPRODUCCIÓN E INFORME
+# ======================================================
+
+def _json_valido(x):
+    if isinstance(x, dict):
+        return {k: _json_valido(v) for k, v in x.items()}
+    if isinstance(x, float) and not math.isfinite(x):
+        return None
+    return x
+
+def reproducir(leer, modelo, etiquetas, fps=30.0, lote_max=4, espera_lote_ms=10.0, top_k=1,
+               suavizar=True, ventana=5, intervalo_ms=50.0, baudios=9600, compuerta=None):
+    """
+    Corre el pipeline hasta agotar la fuente y devuelve el informe (dict).
+    fps es el ritmo al que se entregan los cuadros, con los descartes que
+    tendría una cámara a ese ritmo. Con fps=0 la captura espera a que la
+    inferencia deje lugar en la cola: ningún cuadro se descarta y
+    cuadros_por_s es el techo de throughput. suavizar=False escribe un byte
+    por cuadro, como antes de ActuadorSerial. `compuerta` (CompuertaMovimiento)
+    omite los cuadros sin movimiento antes de la inferencia.
+    """
+    decisor = DecisorMaterial(etiquetas, top_k=top_k)
+    clasificar = ClasificadorPorLotes(modelo, decisor)
+    puerto = SumideroSerie(baudios)
+    decisiones = Counter()
+    if suavizar:
+        actuador = ActuadorSerial(puerto, ventana=ventana, intervalo_min=intervalo_ms / 1000.0)
+        escribir = actuador.enviar
+    else:
+        actuador = None
+        escribir = lambda m: puerto.write(COMANDOS.get(m, COMANDO_DESCONOCIDO))
+
+    def enviar(material):
+        decisiones[material] += 1
+        escribir(material)
+
+    primero = _primero(leer)
+    # calentar el modelo fuera de la medida
+    clasificar.uno(compuerta.recorte(primero) if compuerta is not None else primero)
+    leer = _reponer(primero, leer)
+    if not fps:
+        leer = _con_contrapresion(leer, lambda: pipeline)
+    pipeline = PipelineSeparador(leer, clasificar if lote_max > 1 else clasificar.uno,
+                                 enviar, fps_objetivo=fps, lote_max=lote_max,
+                                 espera_lote_ms=espera_lote_ms, ventana_estadisticas=None,
+                                 filtrar=compuerta, fuente_finita=True)
+    t0 = time.perf_counter()
+    pipeline.iniciar().esperar()
+    duracion = time.perf_counter() - t0
+    if actuador is not None:
+        actuador.cerrar()
+    if pipeline.error is not None:
+        raise pipeline.error
+
+    est = pipeline.estadisticas()
+    leidos = est["captura"]["n"]
+    informe = {
+        "cuadros_leidos": leidos,
+        "cuadros_clasificados": pipeline.cuadros_clasificados,
+        "cuadros_omitidos": est["omitidos"],
+        "duracion_s": duracion,
+        "cuadros_por_s": pipeline.cuadros_clasificados / duracion if duracion > 0 else 0.0,
+        "etapas": {nombre: est[nombre] for nombre in pipeline.stats},
+        "descartados": est["descartados"],
+        "lote_medio": est["lote_medio"],
+        "decisiones": dict(decisiones),
+        "comandos": {"escrituras": puerto.escrituras, "bytes": puerto.escrito.decode("ascii")},
+    }
+    if actuador is not None:
+        informe["comandos"]["reemplazados"] = actuador.reemplazados
+        informe["comandos"]["escritura"] = actuador.escritura.resumen()
+    return _json_valido(informe)
+
+def _primero(leer):
+    ok, cuadro = leer()
+    if not ok:
+        raise ValueError("La fuente no tiene cuadros")
+    return cuadro
+
+def _reponer(primero, leer):
+    """leer() que vuelve a entregar primero el cuadro usado para calentar."""
+    pendiente = [primero]
+    def leer_con_primero():
+        if pendiente:
+            return True, pendiente.pop()
+        return leer()
+    return leer_con_primero
+
+def _con_contrapresion(leer, pipeline):
+    """leer() que no entrega otro cuadro mientras la cola de cuadros esté llena."""
+    def leer_sin_descartes():
+        p = pipeline()
+        cola = p.cola_cuadros
+        while len(cola) >= cola.maximo and p.error is None and not cola.cerrada:
+            time.sleep(0.0005)
+        return leer()
+    return leer_sin_descartes
+
+if __name__ == "__main__":
+    import argparse
+    p = argparse.ArgumentParser(description="Reproduce cuadros grabados por el pipeline del separador "
+                                            "e informa throughput y latencias en JSON.")
+    p.add_argument("entrada", nargs="?", help="video o carpeta de cuadros (imágenes o .npy)")
+    p.add_argument("--sinteticos", type=int, default=300, help="cuadros aleatorios si no hay entrada")
+    p.add_argument("--limite", type=int, help="reproducir a lo sumo N cuadros")
+    p.add_argument("--modelo", metavar="DIR", help="almacén de modelos (por defecto DIR_MODELOS)")
+    p.add_argument("--formato", help="formato del almacén (por defecto el mejor exportado)")
+    p.add_argument("--simulado", action="store_true", help="modelo simulado, sin TensorFlow ni almacén")
+    p.add_argument("--fps", type=float, default=30.0, help="ritmo de la fuente (0 = sin límite ni descartes)")
+    p.add_argument("--lote", type=int, default=4)
+    p.add_argument("--espera-ms", type=float, default=10.0)
+    p.add_argument("--top-k", type=int, default=1)
+    p.add_argument("--sin-suavizado", action="store_true", help="un byte por cuadro, sin ActuadorSerial")
+    p.add_argument("--ventana", type=int, default=5)
+    p.add_argument("--intervalo-ms", type=float, default=50.0)
+    p.add_argument("--baudios", type=int, default=9600)
+    p.add_argument("--compuerta", action="store_true", help="omitir los cuadros sin movimiento")
+    p.add_argument("--roi", type=leer_roi, help="x,y,ancho,alto de la cinta para la compuerta")
+    p.add_argument("--etiqueta", help="texto libre para identificar la corrida en el informe")
+    p.add_argument("-o", "--salida", help="archivo JSON (por defecto la salida estándar)")
+    a = p.parse_args()
+
+    from separadorModelo import DIR_MODELOS, cargar, exportar_simulado
+    tmp = None
+    if a.simulado:
+        import tempfile
+        tmp = tempfile.TemporaryDirectory()
+        exportar_simulado(tmp.name)
+        modelo, etiquetas, formato = cargar(tmp.name, "simulado")
+    else:
+        modelo, etiquetas, formato = cargar(a.modelo or DIR_MODELOS, a.formato)
+    leer, descripcion = abrir_fuente(a.entrada, a.sinteticos, a.limite)
+    config = {"fps": a.fps, "lote_max": a.lote, "espera_lote_ms": a.espera_ms, "top_k": a.top_k,
+              "suavizado": not a.sin_suavizado, "ventana": a.ventana, "intervalo_ms": a.intervalo_ms,
+              "baudios": a.baudios, "compuerta": a.compuerta, "roi": a.roi}
+    informe = reproducir(leer, modelo, etiquetas, a.fps, a.lote, a.espera_ms, a.top_k,
+                         not a.sin_suavizado, a.ventana, a.intervalo_ms, a.baudios,
+                         CompuertaMovimiento(a.roi) if a.compuerta else None)
+    if tmp is not None:
+        del modelo
+        tmp.cleanup()
+    informe = {"etiqueta": a.etiqueta, "fuente": descripcion, "formato": formato, "config": config, **informe}
+    texto = json.dumps(informe, indent=2, ensure_ascii=False)
+    if a.salida:
+        with open(a.salida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    else:
+        sys.stdout.write(texto + "\n")